@@ -4,7 +4,7 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2' # Menyembunyikan pesan INFO dan WARNING
 """
 Aplikasi Flask untuk sistem rekomendasi tempat wisata dan chatbot
 """
-from flask import json, Flask, request, jsonify, render_template, redirect, url_for,send_from_directory
+from flask import json, Flask, Response, request, jsonify, render_template, redirect, url_for,send_from_directory, stream_with_context
 from flask_cors import CORS
 import ast
 from dotenv import load_dotenv
@@ -24,17 +24,26 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.recommender import (
     TourismRecommender, 
+    AttractionFragments,
+    parse_fields,
+    compact_json,
+    paginate,
+    listing_order,
+    ResponseCache,
+    make_cache_key,
     load_csv_data, 
     get_available_categories, 
     get_available_provinces,
     format_recommendation_results,
+    iter_recommendation_results,
+    is_error_result,
     get_attraction_details,
     filter_attractions,
     calculate_popularity_score
 )
 
 # Import chatbot api blueprint
-from src.chatbot.api.chatbot_api import chatbot_bp
+from src.chatbot.api.chatbot_api import chatbot_bp, chatbot_loader
 # Import popularitas api blueprint
 from src.prediksi_popularitas.api.popularitas_api import popularitas_bp
 
@@ -88,7 +97,8 @@ app.register_blueprint(popularitas_bp, url_prefix='/api/popularitas')
 CORS(app)
 
 # Inisialisasi model rekomendasi
-MODEL_PATH = os.getenv('MODEL_PATH', 'models/recommendation_model.joblib')
+# Direktori artefak kolumnar (memory-mapped); path berakhiran .joblib memakai format lama
+MODEL_PATH = os.getenv('MODEL_PATH', 'models/recommendation_model')
 DATA_PATH = os.getenv('DATA_PATH', 'data/tempat_wisata_indonesia.csv')
 
 # Global variables untuk menyimpan model dan data rekomendasi
@@ -96,6 +106,84 @@ recommender = None
 df = None
 categories = None
 provinces = None
+# Fragmen JSON per tempat wisata untuk /api/attractions dan /api/attraction/<name>
+attraction_fragments = None
+
+# Cache respons rekomendasi (LRU + TTL); kunci menyertakan versi model
+recommendation_cache = ResponseCache(
+    max_size=int(os.getenv('RECOMMENDATION_CACHE_SIZE', 1024)),
+    ttl=float(os.getenv('RECOMMENDATION_CACHE_TTL', 300))
+)
+
+class ModelNotLoadedError(RuntimeError):
+    """Model rekomendasi belum dimuat; endpoint menjawab 503, bukan kesalahan klien"""
+
+def model_not_loaded_response():
+    return jsonify({"message": "Model rekomendasi belum dimuat."}), 503
+
+def cached_recommendations(method, compute, **params):
+    """
+    Mengembalikan hasil rekomendasi terformat dari cache, atau menghitungnya
+    dengan compute(model) jika belum ada
+    """
+    model = recommender
+    if model is None:
+        raise ModelNotLoadedError("Model rekomendasi belum dimuat.")
+    key = make_cache_key(model.model_version, method, **params)
+    return recommendation_cache.get_or_compute(
+        key, lambda: format_recommendation_results(compute(model)),
+        should_cache=lambda results: not is_error_result(results)
+    )
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_stream():
+    """
+    Mode streaming NDJSON diminta lewat ?stream=1 atau header Accept: application/x-ndjson
+    """
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def ndjson_response(lines):
+    """
+    Respons chunked dari generator baris NDJSON; byte pertama terkirim sebelum
+    seluruh hasil diserialisasi
+    """
+    return Response(stream_with_context(lines), mimetype=NDJSON_MIMETYPE)
+
+def recommendation_response(method, compute, **params):
+    """
+    Respons rekomendasi: JSON lewat cache, atau NDJSON jika diminta (hasil di cache
+    dipakai bila ada, selain itu baris diformat dan diserialisasi satu per satu
+    tanpa disimpan ke cache)
+    """
+    if not wants_stream():
+        return jsonify(cached_recommendations(method, compute, **params))
+
+    model = recommender
+    if model is None:
+        raise ModelNotLoadedError("Model rekomendasi belum dimuat.")
+    found, results = recommendation_cache.get(make_cache_key(model.model_version, method, **params))
+    if not found:
+        results = iter_recommendation_results(compute(model))
+    elif isinstance(results, dict):
+        results = [results]
+    return ndjson_response(compact_json(item) + '\n' for item in results)
+
+def get_attraction_fragments():
+    """
+    Mengembalikan cache fragmen JSON, dibangun ulang jika versi model berubah
+    """
+    global attraction_fragments
+
+    fragments = attraction_fragments
+    model_version = recommender.model_version if recommender is not None else None
+    if fragments is None or fragments.model_version != model_version:
+        fragments = AttractionFragments(df, model_version=model_version)
+        attraction_fragments = fragments
+        logger.info(f"Fragmen JSON {len(fragments)} tempat wisata dibangun (model {model_version})")
+    return fragments
 
 def load_model_and_data():
     """
@@ -104,6 +192,8 @@ def load_model_and_data():
     global recommender, df, categories, provinces
 
     recommender = TourismRecommender()
+    # Hasil dari model sebelumnya tidak berlaku lagi
+    recommendation_cache.clear()
     
     # Log absolute paths untuk debugging
     abs_model_path = os.path.abspath(MODEL_PATH)
@@ -130,6 +220,7 @@ def load_model_and_data():
         categories = get_available_categories(df)
         provinces = get_available_provinces(df)
         logger.info(f"Data dari model dimuat. Jumlah data: {len(df)}")
+        get_attraction_fragments()
         return True # Berhasil memuat model dan data dari file
 
     except FileNotFoundError:
@@ -146,6 +237,7 @@ def load_model_and_data():
             provinces = get_available_provinces(df)
             logger.info(f"Model baru berhasil dilatih dan disimpan ke {MODEL_PATH}")
             logger.info(f"Data dari pelatihan digunakan. Jumlah data: {len(df)}")
+            get_attraction_fragments()
             return True # Berhasil melatih model baru
 
         except Exception as e_train:
@@ -170,6 +262,7 @@ def load_model_and_data():
             categories = get_available_categories(df)
             provinces = get_available_provinces(df)
             logger.info(f"Data diproses ulang dari mentah sebagai fallback. Jumlah data: {len(df)}")
+            get_attraction_fragments()
             return True # Berhasil memproses data mentah sebagai fallback
             
         except Exception as e_fallback:
@@ -184,6 +277,26 @@ def load_model_and_data():
     logger.error("load_model_and_data mencapai akhir tanpa hasil yang jelas.")
     return False
 
+def create_app():
+    """
+    App factory / startup hook untuk gunicorn ("app:create_app()"): memuat model
+    rekomendasi dan data sebelum permintaan pertama. Dengan preload_app (lihat
+    gunicorn.conf.py) ini dijalankan sekali di proses master, sehingga worker
+    hasil fork berbagi halaman memori model (copy-on-write) alih-alih memuat
+    salinannya sendiri. CHATBOT_PRELOAD=true ikut menunggu model chatbot dimuat
+    di master.
+    """
+    if recommender is None or df is None:
+        if load_model_and_data():
+            logger.info("Model dan data berhasil dimuat saat startup.")
+        else:
+            logger.error("Gagal memuat model atau data saat startup; akan dicoba lagi saat permintaan pertama.")
+
+    if os.getenv('CHATBOT_PRELOAD', 'false').lower() == 'true':
+        if chatbot_loader.wait():
+            logger.info("Model chatbot dimuat saat startup.")
+    return app
+
 @app.route('/')
 def index():
     """
@@ -280,103 +393,84 @@ def get_attractions():
             return jsonify({"message": "Nilai min_rating harus berupa angka."}), 400
 
     search_query = request.args.get('q')
+    # 'index' (default): inverted index, hasil terurut relevansi; 'substring': pencarian lama
+    search_mode = request.args.get('search_mode', 'index')
+    if search_mode not in ('index', 'substring'):
+        return jsonify({"message": "Nilai search_mode harus 'index' atau 'substring'."}), 400
+
+    # Terapkan filter pada df yang sudah diproses (lewat indeks facet dan pencarian milik model)
+    facet_index = recommender.facet_index if recommender is not None else None
+    search_index = recommender.search_index if recommender is not None else None
+    filtered_df = filter_attractions(
+        df, category, province, min_rating, search_query=search_query,
+        facet_index=facet_index, search_index=search_index, search_mode=search_mode
+    )
+    ranked_by_relevance = bool(search_query) and search_index is not None and search_mode == 'index'
+
+    # Urutkan berdasarkan rating (kecuali hasil pencarian yang sudah terurut relevansi);
+    # id dipakai sebagai pemecah nilai sama agar urutan stabil untuk cursor
+    if ranked_by_relevance:
+        sort = 'relevance'
+    elif 'rating' in filtered_df.columns:
+        sort = 'rating'
+    else:
+        print("Peringatan: Kolom 'rating' tidak ditemukan untuk sorting di /api/attractions.")
+        sort = 'relevance'
+    ids, keys = listing_order(filtered_df, sort)
+
+    # Tanpa limit dan cursor seluruh hasil dikembalikan (perilaku lama);
+    # dengan limit, halaman berikutnya diambil lewat header X-Next-Cursor
+    limit = request.args.get('limit', type=int) or None
+    cursor = request.args.get('cursor')
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        page_ids, next_cursor = paginate(ids, keys, limit=limit, cursor=cursor, sort=sort)
+    except ValueError as ve:
+        return jsonify({"message": str(ve)}), 400
 
-    # Terapkan filter pada df yang sudah diproses
-    filtered_df = filter_attractions(df, category, province, min_rating, search_query=search_query)
-
-    # Urutkan berdasarkan rating
-    if 'rating' in filtered_df.columns:
-        filtered_df = filtered_df.sort_values('rating', ascending=False)
+    # Susun respons dari fragmen JSON yang sudah dinormalisasi saat model dimuat;
+    # dengan fields hanya kolom yang diminta pada halaman ini yang diserialisasi
+    if wants_stream():
+        response = ndjson_response(get_attraction_fragments().iter_ndjson(page_ids, fields=fields))
     else:
-         print("Peringatan: Kolom 'rating' tidak ditemukan untuk sorting di /api/attractions.")
+        body = get_attraction_fragments().list_json(page_ids, fields=fields)
+        response = app.response_class(body, mimetype='application/json')
+    if next_cursor:
+        next_args = request.args.to_dict()
+        next_args['cursor'] = next_cursor
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{url_for("get_attractions", **next_args)}>; rel="next"'
+    return response
+
+@app.route('/api/attractions/bbox')
+def get_attractions_bbox():
+    """
+    Mendapatkan marker peta untuk viewport: bbox=minLon,minLat,maxLon,maxLat dan zoom.
+    Pada zoom rendah marker dikelompokkan (jumlah, centroid, anggota terpopuler).
+    """
+    if recommender is None or df is None:
+        if not load_model_and_data():
+            return jsonify({"message": "Gagal memuat data tempat wisata."}), 500
 
-    # Hapus batasan limit default 50
-    limit = request.args.get('limit', type=int)
-    if limit:
-        filtered_df = filtered_df.head(limit)
+    bbox = request.args.get('bbox')
+    if not bbox:
+        return jsonify({"message": "Parameter 'bbox' harus diberikan dengan format minLon,minLat,maxLon,maxLat"}), 400
+    try:
+        lon_min, lat_min, lon_max, lat_max = (float(value) for value in bbox.split(','))
+    except ValueError:
+        return jsonify({"message": "Format bbox harus minLon,minLat,maxLon,maxLat"}), 400
 
-    # Format hasil
-    results = []
-    for _, row in filtered_df.iterrows():
-        try:
-            # Pastikan deskripsi selalu ada
-            deskripsi = row.get("deskripsi", "")
-            if not deskripsi or deskripsi == "N/A":
-                deskripsi = f"{row['nama']} adalah sebuah tempat wisata yang terletak di {row['alamat']}. Tempat ini menawarkan berbagai pengalaman menarik bagi pengunjung."
-            
-            # Pastikan koordinat dalam format yang benar
-            koordinat = row.get('koordinat', {})
-            if isinstance(koordinat, str):
-                try:
-                    koordinat = ast.literal_eval(koordinat)
-                except:
-                    koordinat = {"latitude": None, "longitude": None}
-            
-            # Proses foto - ambil langsung dari kolom foto
-            foto = row.get('foto')
-            if isinstance(foto, str):
-                processed_foto = foto
-            elif isinstance(foto, list) and len(foto) > 0:
-                processed_foto = foto[0]
-            else:
-                processed_foto = None
-            
-            # Pastikan kategori dalam format yang benar
-            kategori = row.get('kategori_list', [])
-            if isinstance(kategori, str):
-                try:
-                    kategori = ast.literal_eval(kategori)
-                except:
-                    kategori = []
-
-            # Handle jumlah_review dengan lebih baik
-            jumlah_review = row.get('jumlah_review')
-            if jumlah_review is not None and jumlah_review != "N/A":
-                try:
-                    if isinstance(jumlah_review, str):
-                        # Jika string, hapus titik dan konversi ke int
-                        jumlah_review = int(jumlah_review.replace(".", ""))
-                    elif isinstance(jumlah_review, (int, float)):
-                        # Jika sudah angka, langsung konversi ke int
-                        jumlah_review = int(jumlah_review)
-                    else:
-                        jumlah_review = None
-                except (ValueError, TypeError):
-                    jumlah_review = None
-            else:
-                jumlah_review = None
-
-            # Handle rating dengan lebih baik
-            rating = row.get('rating')
-            if rating is not None and rating != "N/A":
-                try:
-                    if isinstance(rating, str):
-                        rating = round(float(rating.replace(",", ".")), 1)
-                    elif isinstance(rating, (int, float)):
-                        rating = round(float(rating), 1)
-                    else:
-                        rating = None
-                except (ValueError, TypeError):
-                    rating = None
-            else:
-                rating = None
-
-            results.append({
-                "id": int(row["id"]) if "id" in row and row["id"] is not None else None,
-                "nama": row["nama"],
-                "deskripsi": deskripsi,
-                "provinsi": row["provinsi"],
-                "rating": rating,
-                "jumlah_review": jumlah_review,
-                "foto": processed_foto,
-                "koordinat": koordinat,
-                "kategori": kategori
-            })
-        except Exception as e:
-            print(f"Error processing row for {row.get('nama', 'Unknown')}: {str(e)}")
-            continue
-
-    return jsonify(results)
+    zoom = request.args.get('zoom', type=int)
+    limit = request.args.get('limit', 500, type=int)
+
+    try:
+        return jsonify(recommender.viewport_markers(lat_min, lat_max, lon_min, lon_max, zoom=zoom, limit=limit))
+    except ValueError as ve:
+        logger.warning(f"Parameter tidak valid pada endpoint get_attractions_bbox: {str(ve)}")
+        return jsonify({"message": str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Error pada endpoint get_attractions_bbox: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({"message": f"Terjadi kesalahan: {str(e)}"}), 500
 
 @app.route('/data/images/<filename>')
 def tampilkan_gambar(filename):
@@ -395,136 +489,18 @@ def get_attraction(name):
              return jsonify({"message": "Gagal memuat data tempat wisata."}), 500
 
     try:
-        # Cari tempat wisata berdasarkan nama (case insensitive)
-        mask = df['nama'].str.lower() == name.lower()
-        if not mask.any():
+        # Cari tempat wisata lewat indeks nama ternormalisasi (dengan fallback fuzzy)
+        row = recommender.name_index.resolve(name)
+        if row is None:
             return jsonify({"message": f"Tempat wisata '{name}' tidak ditemukan"}), 404
 
-        # Ambil data tempat wisata
-        details = df[mask].iloc[0].to_dict()
-
-        # Format koordinat
-        koordinat = details.get('koordinat', {})
-        if isinstance(koordinat, str):
-            try:
-                koordinat = json_lib.loads(koordinat)
-            except:
-                # Coba ekstrak koordinat dari URL jika ada
-                url = details.get('url', '')
-                if url:
-                    try:
-                        # Cari pola koordinat di URL (format: !3d{lat}!4d{lon})
-                        import re
-                        coords = re.findall(r'!3d([\d.-]+)!4d([\d.-]+)', url)
-                        if coords:
-                            lat, lon = coords[0]
-                            koordinat = {
-                                "latitude": float(lat),
-                                "longitude": float(lon)
-                            }
-                    except:
-                        koordinat = {"latitude": None, "longitude": None}
-                else:
-                    koordinat = {"latitude": None, "longitude": None}
-        elif isinstance(koordinat, dict):
-            # Pastikan koordinat dalam format yang benar
-            try:
-                koordinat = {
-                    "latitude": float(koordinat.get('latitude', 0)) if koordinat.get('latitude') is not None else None,
-                    "longitude": float(koordinat.get('longitude', 0)) if koordinat.get('longitude') is not None else None
-                }
-            except:
-                # Coba ekstrak dari URL jika konversi gagal
-                url = details.get('url', '')
-                if url:
-                    try:
-                        import re
-                        coords = re.findall(r'!3d([\d.-]+)!4d([\d.-]+)', url)
-                        if coords:
-                            lat, lon = coords[0]
-                            koordinat = {
-                                "latitude": float(lat),
-                                "longitude": float(lon)
-                            }
-                    except:
-                        koordinat = {"latitude": None, "longitude": None}
-                else:
-                    koordinat = {"latitude": None, "longitude": None}
-
-        # Format foto
-        foto = details.get('foto')
-        if isinstance(foto, str):
-            processed_foto = foto
-        elif isinstance(foto, list) and len(foto) > 0:
-            processed_foto = foto[0]
-        else:
-            processed_foto = None
+        # Ambil fragmen JSON yang sudah dinormalisasi
+        attraction_id = df['id'].iloc[row]
+        body = get_attraction_fragments().get(attraction_id)
+        if body is None:
+            return jsonify({"message": f"Tempat wisata '{name}' tidak ditemukan"}), 404
 
-        # Format kategori
-        kategori = details.get('kategori', [])  # Coba ambil dari 'kategori' dulu
-        if not kategori:  # Jika kosong, coba dari 'kategori_list'
-            kategori = details.get('kategori_list', [])
-        
-        if isinstance(kategori, str):
-            try:
-                # Coba parse sebagai JSON dulu
-                kategori = json_lib.loads(kategori)
-            except:
-                # Jika gagal parse JSON, coba split string dan bersihkan tanda kutip
-                try:
-                    # Hapus tanda kutip dan kurung siku, lalu split
-                    kategori = [k.strip().strip("'").strip('"') for k in kategori.strip('[]').split(',')]
-                    # Hapus elemen kosong
-                    kategori = [k for k in kategori if k]
-                except:
-                    kategori = []
-        elif isinstance(kategori, list):
-            # Bersihkan tanda kutip dari setiap elemen jika ada
-            kategori = [k.strip("'").strip('"') if isinstance(k, str) else str(k) for k in kategori]
-        else:
-            kategori = []
-
-        # Pastikan tidak ada duplikat dan elemen kosong
-        kategori = list(dict.fromkeys([k for k in kategori if k]))
-
-        # Format rating
-        rating = details.get('rating')
-        if isinstance(rating, str):
-            try:
-                rating = round(float(rating.replace(",", ".")), 1)
-            except:
-                rating = None
-        elif isinstance(rating, (int, float)):
-            rating = round(float(rating), 1)
-        else:
-            rating = None
-
-        # Format jumlah_review
-        jumlah_review = details.get('jumlah_review')
-        if isinstance(jumlah_review, str):
-            try:
-                jumlah_review = int(jumlah_review.replace(".", ""))
-            except:
-                jumlah_review = None
-        elif isinstance(jumlah_review, (int, float)):
-            jumlah_review = int(jumlah_review)
-        else:
-            jumlah_review = None
-
-        # Format hasil
-        formatted_details = {
-            "id": int(details["id"]) if "id" in details and details["id"] is not None else None,
-            "nama": details["nama"],
-            "rating": rating,
-            "jumlah_review": jumlah_review,
-            "deskripsi": details.get("deskripsi", ""),
-            "koordinat": koordinat,
-            "provinsi": details.get("provinsi"),
-            "kategori": kategori,
-            "foto": processed_foto
-        }
-
-        return jsonify(formatted_details)
+        return app.response_class(body, mimetype='application/json')
 
     except Exception as e:
         logger.error(f"Error saat mendapatkan detail tempat wisata: {str(e)}\n{traceback.format_exc()}")
@@ -544,11 +520,17 @@ def content_recommendations():
         top_n = request.args.get('limit', 10, type=int)
         logger.info(f"Meminta rekomendasi content-based untuk '{name}' dengan limit {top_n}")
         
-        recommendations = recommender.content_based_recommendations(name, top_n=top_n)
-        results = format_recommendation_results(recommendations)
+        response = recommendation_response(
+            'content',
+            lambda model: model.content_based_recommendations(name, top_n=top_n),
+            name=name, top_n=top_n
+        )
         
-        logger.info(f"Berhasil memberikan {len(results)} rekomendasi content-based untuk '{name}'")
-        return jsonify(results)
+        logger.info(f"Berhasil memberikan rekomendasi content-based untuk '{name}'")
+        return response
+    except ModelNotLoadedError:
+        logger.error("Model rekomendasi belum dimuat pada endpoint content_recommendations")
+        return model_not_loaded_response()
     except Exception as e:
         logger.error(f"Error pada endpoint content_recommendations: {str(e)}\n{traceback.format_exc()}")
         return jsonify({"message": f"Terjadi kesalahan: {str(e)}"}), 500
@@ -565,11 +547,17 @@ def popularity_recommendations():
         
         logger.info(f"Meminta rekomendasi popularity-based (category={category}, province={province}, limit={top_n})")
         
-        recommendations = recommender.popularity_based_recommendations(category, province, top_n=top_n)
-        results = format_recommendation_results(recommendations)
+        response = recommendation_response(
+            'popularity',
+            lambda model: model.popularity_based_recommendations(category, province, top_n=top_n),
+            category=category, province=province, top_n=top_n
+        )
         
-        logger.info(f"Berhasil memberikan {len(results)} rekomendasi popularity-based")
-        return jsonify(results)
+        logger.info("Berhasil memberikan rekomendasi popularity-based")
+        return response
+    except ModelNotLoadedError:
+        logger.error("Model rekomendasi belum dimuat pada endpoint popularity_recommendations")
+        return model_not_loaded_response()
     except Exception as e:
         logger.error(f"Error pada endpoint popularity_recommendations: {str(e)}\n{traceback.format_exc()}")
         return jsonify({"message": f"Terjadi kesalahan: {str(e)}"}), 500
@@ -592,11 +580,17 @@ def location_recommendations():
         
         logger.info(f"Meminta rekomendasi location-based untuk koordinat ({lat}, {lon}) dengan max_distance={max_distance}, limit={top_n}")
         
-        recommendations = recommender.location_based_recommendations(lat, lon, max_distance, top_n=top_n)
-        results = format_recommendation_results(recommendations)
+        response = recommendation_response(
+            'location',
+            lambda model: model.location_based_recommendations(lat, lon, max_distance, top_n=top_n),
+            lat=lat, lon=lon, max_distance=max_distance, top_n=top_n
+        )
         
-        logger.info(f"Berhasil memberikan {len(results)} rekomendasi location-based")
-        return jsonify(results)
+        logger.info("Berhasil memberikan rekomendasi location-based")
+        return response
+    except ModelNotLoadedError:
+        logger.error("Model rekomendasi belum dimuat pada endpoint location_recommendations")
+        return model_not_loaded_response()
     except ValueError as ve:
         logger.warning(f"Parameter tidak valid pada endpoint location_recommendations: {str(ve)}")
         return jsonify({"message": str(ve)}), 400
@@ -623,20 +617,26 @@ def hybrid_recommendations():
             f"category={category}, province={province}, max_distance={max_distance}, limit={top_n})"
         )
         
-        recommendations = recommender.hybrid_recommendations(
-            name=name, 
-            lat=lat, 
-            lon=lon, 
-            category=category, 
-            province=province, 
-            max_distance=max_distance, 
-            top_n=top_n
+        response = recommendation_response(
+            'hybrid',
+            lambda model: model.hybrid_recommendations(
+                name=name, 
+                lat=lat, 
+                lon=lon, 
+                category=category, 
+                province=province, 
+                max_distance=max_distance, 
+                top_n=top_n
+            ),
+            name=name, lat=lat, lon=lon, category=category, province=province,
+            max_distance=max_distance, top_n=top_n
         )
         
-        results = format_recommendation_results(recommendations)
-        
-        logger.info(f"Berhasil memberikan {len(results)} rekomendasi hybrid")
-        return jsonify(results)
+        logger.info("Berhasil memberikan rekomendasi hybrid")
+        return response
+    except ModelNotLoadedError:
+        logger.error("Model rekomendasi belum dimuat pada endpoint hybrid_recommendations")
+        return model_not_loaded_response()
     except ValueError as ve:
         logger.warning(f"Parameter tidak valid pada endpoint hybrid_recommendations: {str(ve)}")
         return jsonify({"message": str(ve)}), 400
@@ -644,6 +644,63 @@ def hybrid_recommendations():
         logger.error(f"Error pada endpoint hybrid_recommendations: {str(e)}\n{traceback.format_exc()}")
         return jsonify({"message": f"Terjadi kesalahan: {str(e)}"}), 500
 
+# Batas jumlah query dalam satu permintaan batch
+MAX_BATCH_QUERIES = int(os.getenv('MAX_BATCH_QUERIES', 50))
+
+@app.route('/api/recommendations/batch', methods=['POST'])
+def batch_recommendations():
+    """
+    Menjalankan beberapa query rekomendasi dalam satu permintaan
+
+    Request body:
+    {
+        "queries": [
+            {"type": "content", "name": "Tanah Lot", "limit": 5},
+            {"type": "popularity", "category": "pantai", "province": "Bali"},
+            {"type": "location", "lat": -8.4, "lon": 115.1, "max_distance": 30},
+            {"type": "hybrid", "name": "Tanah Lot", "lat": -8.4, "lon": 115.1}
+        ]
+    }
+
+    Response: {"results": [...]} dengan satu list hasil (atau {"error": ...}) per query
+    """
+    try:
+        data = request.get_json(silent=True)
+        queries = data.get('queries') if isinstance(data, dict) else None
+        if not isinstance(queries, list) or not queries:
+            return jsonify({"message": "Body harus berisi 'queries' berupa list yang tidak kosong"}), 400
+        if len(queries) > MAX_BATCH_QUERIES:
+            return jsonify({"message": f"Maksimal {MAX_BATCH_QUERIES} query per permintaan"}), 400
+        
+        # Gunakan satu snapshot model untuk seluruh query dalam batch
+        model = recommender
+        if model is None:
+            return model_not_loaded_response()
+        
+        logger.info(f"Meminta {len(queries)} rekomendasi dalam satu batch")
+        
+        batch = model.batch_recommendations(queries)
+        logger.info(f"Berhasil memproses batch berisi {len(batch)} query")
+        
+        # Mode streaming: satu baris NDJSON berisi hasil per query, sesuai urutan query
+        if wants_stream():
+            return ndjson_response(compact_json(format_recommendation_results(recs)) + '\n' for recs in batch)
+        
+        results = [format_recommendation_results(recs) for recs in batch]
+        return jsonify({"results": results})
+    except Exception as e:
+        logger.error(f"Error pada endpoint batch_recommendations: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({"message": f"Terjadi kesalahan: {str(e)}"}), 500
+
+@app.route('/api/recommendations/cache')
+def recommendation_cache_stats():
+    """
+    Statistik cache rekomendasi (hit/miss/eviction) untuk menentukan ukurannya
+    """
+    stats = recommendation_cache.stats()
+    stats["model_version"] = recommender.model_version if recommender is not None else None
+    return jsonify(stats)
+
 if __name__ == '__main__':
     # Muat model dan data rekomendasi
     try:
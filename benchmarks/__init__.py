@@ -0,0 +1,4 @@
+"""
+Skrip benchmark untuk sistem rekomendasi NusantaraGo.
+Jalankan dari root repository, contoh: python -m benchmarks.bench_similarity
+"""
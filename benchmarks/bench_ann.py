@@ -0,0 +1,123 @@
+"""
+Laporan recall@K untuk backend tetangga aproksimasi (IVF) terhadap hasil cosine
+exact, untuk memilih n_clusters dan n_probe.
+
+Ground truth dihitung exact hanya untuk sampel baris (similarity sampel x
+seluruh katalog), sehingga laporan tetap bisa dibuat untuk katalog besar.
+Fitur TF-IDF dibentuk sama seperti TourismRecommender.fit dari katalog sintetis
+(benchmarks.synthetic) atau katalog asli (--real).
+
+Contoh:
+    python -m benchmarks.bench_ann --rows 20000 --probes 2 4 8 16
+    python -m benchmarks.bench_ann --rows 50000 --clusters 400 900 --probes 4 8 --output ann.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.recommender.neighbors import TopKNeighbors, _top_k_rows
+from src.recommender.preprocessing import preprocess_data
+
+DATA_PATH = 'data/tempat_wisata_indonesia.csv'
+
+
+def build_features(n_rows, seed, real=False):
+    """
+    Matriks TF-IDF seperti pada TourismRecommender.fit
+    """
+    if real:
+        df = pd.read_csv(DATA_PATH)
+    else:
+        from benchmarks.synthetic import generate_catalogue
+        df = generate_catalogue(n_rows, seed=seed)
+    processed = preprocess_data(df)
+    return TfidfVectorizer(stop_words='english').fit_transform(processed['combined_features'])
+
+
+def exact_neighbors(tfidf_matrix, rows, k, chunk_size=512):
+    """
+    Top-k exact (tanpa dirinya sendiri) untuk baris sampel
+    """
+    result = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        block = cosine_similarity(tfidf_matrix[chunk], tfidf_matrix).astype(np.float32)
+        block[np.arange(len(chunk)), chunk] = -np.inf
+        result.append(_top_k_rows(block, k)[0])
+    return np.vstack(result)
+
+
+def recall_at_k(index, rows, truth, k):
+    """
+    Rata-rata |top-k aproksimasi ∩ top-k exact| / k pada baris sampel
+    """
+    hits = [len(np.intersect1d(index.neighbors(row, k)[0], truth[i, :k])) for i, row in enumerate(rows)]
+    return float(np.mean(hits)) / k
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--real', action='store_true', help='Pakai katalog asli, bukan sintetis')
+    parser.add_argument('--k', type=int, default=100, help='n_neighbors yang disimpan')
+    parser.add_argument('--recall-k', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--clusters', type=int, nargs='+', default=[None],
+                        help='Nilai n_clusters (default 4 * sqrt(N))')
+    parser.add_argument('--probes', type=int, nargs='+', default=[2, 4, 8, 16])
+    parser.add_argument('--sample', type=int, default=1000, help='Jumlah baris untuk ground truth')
+    parser.add_argument('--skip-exact-build', action='store_true',
+                        help='Lewati pengukuran waktu build exact (kuadratik)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Tulis hasil JSON ke file ini')
+    args = parser.parse_args()
+
+    tfidf_matrix = build_features(args.rows, args.seed, real=args.real)
+    n_rows = tfidf_matrix.shape[0]
+    k = min(args.k, n_rows - 1)
+    recall_ks = [rk for rk in args.recall_k if rk <= k]
+
+    rng = np.random.default_rng(args.seed)
+    rows = np.sort(rng.choice(n_rows, size=min(args.sample, n_rows), replace=False))
+    truth = exact_neighbors(tfidf_matrix, rows, k)
+
+    results = []
+    if not args.skip_exact_build:
+        start = time.perf_counter()
+        TopKNeighbors.build(tfidf_matrix, k=k)
+        results.append({'backend': 'exact', 'build_s': time.perf_counter() - start,
+                        **{f'recall@{rk}': 1.0 for rk in recall_ks}})
+
+    for n_clusters in args.clusters:
+        for n_probe in args.probes:
+            start = time.perf_counter()
+            index = TopKNeighbors.build_ivf(tfidf_matrix, k=k, n_clusters=n_clusters, n_probe=n_probe)
+            build_s = time.perf_counter() - start
+            results.append({
+                'backend': 'ivf',
+                'n_clusters': n_clusters or int(4 * np.sqrt(n_rows)),
+                'n_probe': n_probe,
+                'build_s': build_s,
+                **{f'recall@{rk}': recall_at_k(index, rows, truth, rk) for rk in recall_ks},
+            })
+
+    print(f"{n_rows} baris, {len(rows)} baris sampel, K={k}")
+    header = f"{'backend':>8} | {'clusters':>8} | {'probe':>5} | {'build (s)':>9} | " + \
+        ' | '.join(f"{'recall@' + str(rk):>9}" for rk in recall_ks)
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['backend']:>8} | {r.get('n_clusters', '-'):>8} | {r.get('n_probe', '-'):>5} | "
+              f"{r['build_s']:>9.2f} | " + ' | '.join(f"{r[f'recall@{rk}']:>9.3f}" for rk in recall_ks))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'rows': n_rows, 'k': k, 'sample': len(rows), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
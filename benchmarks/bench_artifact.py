@@ -0,0 +1,133 @@
+"""
+Perbandingan waktu startup dan RSS antara file model joblib (format lama) dan
+direktori artefak kolumnar yang di-memory-map.
+
+Setiap format dimuat di proses Python baru agar pengukuran tidak saling memengaruhi.
+RssFile menunjukkan halaman yang berasal dari file (bisa dibagi antar worker lewat
+page cache), RssAnon adalah memori privat proses.
+
+Contoh:
+    python -m benchmarks.bench_artifact --rows 5000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = 'data/tempat_wisata_indonesia.csv'
+
+
+def replicate_catalogue(n_rows, seed=42):
+    """
+    Memperbesar katalog asli menjadi n_rows baris dengan id dan nama unik
+    """
+    df = pd.read_csv(DATA_PATH)
+    rng = np.random.default_rng(seed)
+    rows = df.iloc[np.arange(n_rows) % len(df)].reset_index(drop=True)
+    rows['id'] = np.arange(1, n_rows + 1)
+    rows['nama'] = rows['nama'] + ' #' + rows['id'].astype(str)
+    # Variasi kecil pada deskripsi agar similarity tidak identik
+    rows['deskripsi'] = [
+        ' '.join(rng.permutation(str(text).split())) if i >= len(df) else text
+        for i, text in enumerate(rows['deskripsi'])
+    ]
+    return rows
+
+
+def read_memory_status():
+    """
+    Membaca VmRSS, RssAnon, dan RssFile (KB) dari /proc/self/status (Linux)
+    """
+    status = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                    status[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return status
+
+
+def child(path):
+    """
+    Dijalankan di proses baru: ukur waktu import + load_model dan memori setelahnya
+    """
+    before = read_memory_status()
+    start = time.perf_counter()
+    from src.recommender import TourismRecommender
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    recommender = TourismRecommender().load_model(path)
+    load_s = time.perf_counter() - start
+
+    # Satu query agar halaman neighbour yang dibutuhkan benar-benar dibaca
+    start = time.perf_counter()
+    recommender.content_based_recommendations(recommender.df['nama'].iloc[0], top_n=10)
+    first_query_ms = (time.perf_counter() - start) * 1e3
+
+    after = read_memory_status()
+    print(json.dumps({
+        'import_s': import_s,
+        'load_s': load_s,
+        'first_query_ms': first_query_ms,
+        'rss_kb': after.get('VmRSS'),
+        'rss_anon_kb': after.get('RssAnon'),
+        'rss_file_kb': after.get('RssFile'),
+        'rss_delta_kb': (after.get('VmRSS', 0) - before.get('VmRSS', 0)) if before else None,
+    }))
+
+
+def disk_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--similarity-mode', default='topk', choices=['topk', 'dense'])
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    from src.recommender import TourismRecommender
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Melatih model dengan {args.rows} baris ({args.similarity_mode})...")
+        recommender = TourismRecommender(similarity_mode=args.similarity_mode).fit(replicate_catalogue(args.rows))
+        paths = {
+            'joblib': recommender.save_model(os.path.join(tmp, 'model.joblib')),
+            'artifact': recommender.save_model(os.path.join(tmp, 'model')),
+        }
+
+        header = (f"{'format':>9} | {'disk (MB)':>9} | {'load (s)':>8} | {'query (ms)':>10} | "
+                  f"{'RSS (MB)':>8} | {'anon (MB)':>9} | {'file (MB)':>9}")
+        print(header)
+        print('-' * len(header))
+        for name, path in paths.items():
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_artifact', '--child', path],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            stats = json.loads(output)
+            mb = lambda kb: f"{kb / 1024:.1f}" if kb is not None else '-'
+            print(f"{name:>9} | {disk_size(path) / 2**20:>9.1f} | {stats['load_s']:>8.3f} | "
+                  f"{stats['first_query_ms']:>10.2f} | {mb(stats['rss_kb']):>8} | "
+                  f"{mb(stats['rss_anon_kb']):>9} | {mb(stats['rss_file_kb']):>9}")
+
+
+if __name__ == '__main__':
+    main()
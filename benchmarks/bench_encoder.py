@@ -0,0 +1,87 @@
+"""
+Micro-benchmark encode bag-of-words chatbot: loop lama (setiap token
+dibandingkan dengan seluruh vocabulary) dibandingkan BagOfWordsEncoder
+(dict kata -> kolom), per pesan dan per batch, memakai pola di intents sebagai
+pesan. Stemming diukur terpisah dengan --stem; secara default stem hanya
+lowercase agar yang terukur adalah biaya encode.
+
+Contoh:
+    python -m benchmarks.bench_encoder
+    python -m benchmarks.bench_encoder --stem --repeat 3
+"""
+import argparse
+import json
+import pickle
+import time
+
+import numpy as np
+
+from src.chatbot.encoder import BagOfWordsEncoder, tokenize
+
+WORDS_FILE = 'models/chatbot_intent/words.pkl'
+INTENTS_FILE = 'data/intents_wisata.json'
+
+
+def legacy_bag_of_words(sentence, words, stem):
+    """Implementasi lama: O(token x vocabulary) per pesan"""
+    sentence_words = [stem(word) for word in tokenize(sentence)]
+    bag = np.zeros(len(words), dtype=np.float32)
+    for w in sentence_words:
+        for i, word in enumerate(words):
+            if word == w:
+                bag[i] = 1
+    return bag
+
+
+def per_message_us(fn, messages, repeat):
+    """Waktu terbaik per pesan (mikrodetik) dari beberapa ulangan"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stem', action='store_true', help='Sertakan stemmer chatbot (Sastrawi/Porter)')
+    args = parser.parse_args()
+
+    with open(WORDS_FILE, 'rb') as f:
+        words = pickle.load(f)
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        messages = [p for intent in json.load(f)['intents'] for p in intent['patterns']]
+
+    if args.stem:
+        from src.chatbot.stemming import stem
+    else:
+        stem = str.lower
+    encoder = BagOfWordsEncoder(words, stem=stem)
+
+    # Pastikan hasilnya sama sebelum diukur
+    sample = messages[:200]
+    assert all((legacy_bag_of_words(m, words, stem) == encoder.encode(m)).all() for m in sample)
+
+    legacy = per_message_us(lambda m: legacy_bag_of_words(m, words, stem), messages, 1)
+    single = per_message_us(encoder.encode, messages, args.repeat)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        encoder.encode_batch(messages)
+    batch_dense = (time.perf_counter() - start) / args.repeat / len(messages) * 1e6
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        encoder.encode_batch(messages, sparse_output=True)
+    batch_sparse = (time.perf_counter() - start) / args.repeat / len(messages) * 1e6
+
+    print(f"{len(messages)} pesan, vocabulary {len(words)} kata, stem={'chatbot' if args.stem else 'lowercase'}")
+    print(f"  loop lama            {legacy:>9.1f} us/pesan")
+    print(f"  encode (1 pesan)     {single:>9.1f} us/pesan  ({legacy / single:.0f}x)")
+    print(f"  encode_batch dense   {batch_dense:>9.1f} us/pesan")
+    print(f"  encode_batch sparse  {batch_sparse:>9.1f} us/pesan")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Perbandingan waktu perhitungan weighted rating: DataFrame.apply per baris
+(implementasi lama) dan mesin skor NumPy yang tervektorisasi.
+
+Contoh:
+    python -m benchmarks.bench_popularity --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.recommender.scoring import popularity_parameters, weighted_rating
+
+
+def make_frame(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'rating': np.round(rng.uniform(1, 5, n_rows), 1),
+        'jumlah_review': rng.lognormal(4, 1.5, n_rows).astype(int),
+    })
+
+
+def apply_scores(df, C, m):
+    def weighted_rating_row(x, m=m, C=C):
+        v = x['jumlah_review']
+        R = x['rating']
+        return (v/(v+m) * R) + (m/(v+m) * C)
+    return df.apply(weighted_rating_row, axis=1)
+
+
+def vectorized_scores(df, C, m):
+    return weighted_rating(df['rating'].to_numpy(), df['jumlah_review'].to_numpy(), C, m)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    header = f"{'N':>9} | {'apply (ms)':>11} | {'numpy (ms)':>11} | {'speed-up':>9}"
+    print(header)
+    print('-' * len(header))
+
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+        C, m = popularity_parameters(df['rating'], df['jumlah_review'])
+
+        old, apply_s = best_of(lambda: apply_scores(df, C, m), repeat=1)
+        new, numpy_s = best_of(lambda: vectorized_scores(df, C, m), repeat=args.repeat)
+        assert np.allclose(old.to_numpy(), new)
+
+        print(f"{n_rows:>9} | {apply_s * 1e3:>11.1f} | {numpy_s * 1e3:>11.2f} | {apply_s / numpy_s:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
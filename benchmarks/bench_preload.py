@@ -0,0 +1,187 @@
+"""
+Mengukur memori per worker dengan dan tanpa preload (lihat gunicorn.conf.py).
+
+Meniru model proses gunicorn dengan os.fork: pada mode 'preload' aplikasi
+diimpor dan create_app() dijalankan sekali di master sebelum fork; pada mode
+'per-worker' setiap worker mengimpor aplikasi dan memuat modelnya sendiri
+setelah fork (seperti `gunicorn app:app` tanpa preload). Setiap worker melayani
+sejumlah permintaan lewat test client Flask, lalu RSS, PSS, dan Private_Dirty
+semua proses dibaca dari /proc/<pid>/smaps_rollup selagi semua worker hidup.
+PSS membagi halaman bersama secara proporsional, jadi jumlah PSS adalah total
+memori fisik yang benar-benar dipakai.
+
+Hanya untuk Linux. Contoh:
+    python -m benchmarks.bench_preload --workers 4
+    python -m benchmarks.bench_preload --workers 4 --rows 20000 --output preload.json
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+MODES = ('per-worker', 'preload')
+
+
+def smaps_rollup(pid):
+    """
+    Rss/Pss/Private_Dirty/Shared_Clean (MB) dari /proc/<pid>/smaps_rollup
+    """
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {key: round(values.get(key, 0.0), 1)
+            for key in ('Rss', 'Pss', 'Private_Dirty', 'Shared_Clean', 'Shared_Dirty')}
+
+
+def prepare_model(path, rows, seed):
+    """
+    Membuat artefak model (katalog sintetis jika rows diberikan, selain itu CSV asli)
+    """
+    from src.recommender import TourismRecommender, load_csv_data
+    if rows:
+        from benchmarks.synthetic import generate_catalogue
+        catalogue = generate_catalogue(rows, seed=seed)
+    else:
+        catalogue = load_csv_data(os.getenv('DATA_PATH', 'data/tempat_wisata_indonesia.csv'))
+    TourismRecommender().fit(catalogue).save_model(path)
+
+
+def serve_requests(flask_app, n_requests):
+    """
+    Permintaan campuran ke endpoint rekomendasi dan daftar tempat wisata
+    """
+    import app as web
+    client = flask_app.test_client()
+    names = web.df['nama'].tolist()
+    lats = web.df['latitude'].tolist()
+    lons = web.df['longitude'].tolist()
+    step = max(1, len(names) // max(1, n_requests))
+    for i in range(n_requests):
+        row = (i * step) % len(names)
+        client.get('/api/recommendations/content', query_string={'name': names[row], 'limit': 10})
+        client.get('/api/recommendations/location', query_string={'lat': lats[row], 'lon': lons[row], 'limit': 10})
+        client.get('/api/recommendations/hybrid',
+                   query_string={'name': names[row], 'lat': lats[row], 'lon': lons[row], 'limit': 10})
+        client.get('/api/recommendations/popularity', query_string={'limit': 10})
+        client.get('/api/attractions', query_string={'limit': 50})
+        client.get('/api/attractions/bbox', query_string={'bbox': '95,-11,141,6', 'zoom': 6})
+
+
+def load_app():
+    import app as web
+    return web.create_app()
+
+
+def run_mode(args):
+    """
+    Dijalankan di proses baru untuk satu mode; mencetak satu baris JSON
+    """
+    flask_app = None
+    if args.mode == 'preload':
+        flask_app = load_app()
+        gc.freeze()
+
+    workers = []
+    for _ in range(args.workers):
+        ready_r, ready_w = os.pipe()
+        release_r, release_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                os.close(ready_r)
+                os.close(release_w)
+                worker_app = flask_app if flask_app is not None else load_app()
+                serve_requests(worker_app, args.requests)
+                os.write(ready_w, b'1')
+                # Tunggu sampai master selesai mengukur
+                os.read(release_r, 1)
+                status = 0
+            finally:
+                os._exit(status)
+        os.close(ready_w)
+        os.close(release_r)
+        workers.append((pid, ready_r, release_w))
+
+    for pid, ready_r, _ in workers:
+        if not os.read(ready_r, 1):
+            raise RuntimeError(f"Worker {pid} berhenti sebelum selesai melayani permintaan")
+
+    result = {
+        'mode': args.mode,
+        'workers': args.workers,
+        'master': smaps_rollup(os.getpid()),
+        'per_worker': [smaps_rollup(pid) for pid, _, _ in workers],
+    }
+    for pid, ready_r, release_w in workers:
+        # Worker berikutnya ikut mewarisi ujung tulis pipe ini, jadi lepaskan dengan satu byte, bukan EOF
+        os.write(release_w, b'1')
+        os.close(release_w)
+        os.close(ready_r)
+        os.waitpid(pid, 0)
+
+    per_worker = result['per_worker']
+    result['total_pss_mb'] = round(result['master']['Pss'] + sum(w['Pss'] for w in per_worker), 1)
+    result['mean_worker_rss_mb'] = round(sum(w['Rss'] for w in per_worker) / len(per_worker), 1)
+    result['mean_worker_private_mb'] = round(sum(w['Private_Dirty'] for w in per_worker) / len(per_worker), 1)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=50, help='Putaran permintaan per worker')
+    parser.add_argument('--rows', type=int, help='Pakai katalog sintetis sebanyak ini (default: CSV asli)')
+    parser.add_argument('--model', help='Artefak model yang sudah ada (default: dibuat di direktori sementara)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Tulis hasil JSON ke file ini')
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--prepare', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.prepare:
+        prepare_model(args.prepare, args.rows, args.seed)
+        return
+    if args.mode:
+        run_mode(args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(tmp, 'model')
+            command = [sys.executable, '-m', 'benchmarks.bench_preload', '--prepare', model_path,
+                       '--seed', str(args.seed)]
+            if args.rows:
+                command += ['--rows', str(args.rows)]
+            print("Menyiapkan artefak model...", file=sys.stderr)
+            subprocess.run(command, check=True, capture_output=True)
+
+        # Chatbot tidak ikut diukur: model TensorFlow dimuat per worker (lihat gunicorn.conf.py)
+        env = dict(os.environ, MODEL_PATH=model_path, CHATBOT_LOAD_MODE='lazy')
+        results = []
+        for mode in MODES:
+            print(f"Mode {mode}, {args.workers} worker...", file=sys.stderr)
+            command = [sys.executable, '-m', 'benchmarks.bench_preload', '--mode', mode,
+                       '--workers', str(args.workers), '--requests', str(args.requests)]
+            output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'mode':>10} | {'RSS/worker':>10} | {'private/worker':>14} | {'total PSS':>9}")
+    for r in results:
+        print(f"{r['mode']:>10} | {r['mean_worker_rss_mb']:>8.1f}MB | {r['mean_worker_private_mb']:>12.1f}MB | "
+              f"{r['total_pss_mb']:>7.1f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'workers': args.workers, 'rows': args.rows, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Benchmark TourismRecommender pada katalog sintetis (lihat benchmarks.synthetic).
+
+Untuk setiap ukuran katalog, satu proses Python baru menjalankan fit,
+save_model/load_model (direktori artefak), lalu keempat metode rekomendasi
+(content, popularity, location, hybrid) dengan query acak. Dicatat: waktu fit,
+save, load, latensi p50/p95/p99 per metode, puncak RSS proses, dan ukuran
+artefak. Hasil ditulis sebagai JSON agar bisa dibandingkan antar run.
+
+Contoh:
+    python -m benchmarks.bench_recommender --sizes 1000 10000 --output bench.json
+    python -m benchmarks.bench_recommender --sizes 1000 10000 --compare bench.json
+
+Catatan: fit menghitung top-K tetangga untuk seluruh pasangan baris, sehingga
+waktunya tumbuh kuadratik; ukuran 100k/1M membutuhkan waktu lama.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DEFAULT_SIZES = [1000, 10000]
+METHODS = ('content', 'popularity', 'location', 'hybrid')
+
+
+def percentiles(samples_s):
+    """
+    p50/p95/p99 dan rata-rata dalam milidetik
+    """
+    samples_ms = np.asarray(samples_s) * 1e3
+    return {
+        'p50_ms': float(np.percentile(samples_ms, 50)),
+        'p95_ms': float(np.percentile(samples_ms, 95)),
+        'p99_ms': float(np.percentile(samples_ms, 99)),
+        'mean_ms': float(samples_ms.mean()),
+    }
+
+
+def peak_rss_mb():
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == 'darwin' else 1024)
+
+
+def disk_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+
+def build_queries(df, n_queries, seed):
+    """
+    Query acak per metode, diambil dari nilai yang ada di katalog
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(df), size=n_queries)
+    names = df['nama'].to_numpy()[rows]
+    lats = df['latitude'].to_numpy()[rows] + rng.normal(0, 0.05, n_queries)
+    lons = df['longitude'].to_numpy()[rows] + rng.normal(0, 0.05, n_queries)
+    provinces = df['provinsi'].to_numpy()[rng.integers(0, len(df), size=n_queries)]
+    categories = [cats[0] if len(cats) else None
+                  for cats in df['kategori_list'].to_numpy()[rng.integers(0, len(df), size=n_queries)]]
+    # Sebagian query popularitas tanpa filter provinsi
+    provinces = [p if i % 2 == 0 else None for i, p in enumerate(provinces)]
+
+    return {
+        'content': [dict(name=n) for n in names],
+        'popularity': [dict(category=c, province=p) for c, p in zip(categories, provinces)],
+        'location': [dict(lat=float(a), lon=float(o)) for a, o in zip(lats, lons)],
+        'hybrid': [dict(name=n, lat=float(a), lon=float(o), category=c)
+                   for n, a, o, c in zip(names, lats, lons, categories)],
+    }
+
+
+def run_method(recommender, method, query, top_n):
+    if method == 'content':
+        return recommender.content_based_recommendations(query['name'], top_n=top_n)
+    if method == 'popularity':
+        return recommender.popularity_based_recommendations(query['category'], query['province'], top_n=top_n)
+    if method == 'location':
+        return recommender.location_based_recommendations(query['lat'], query['lon'], 50, top_n=top_n)
+    return recommender.hybrid_recommendations(top_n=top_n, max_distance=50, **query)
+
+
+def child(args):
+    """
+    Dijalankan di proses baru untuk satu ukuran katalog; mencetak satu baris JSON
+    """
+    from benchmarks.synthetic import generate_catalogue
+    from src.recommender import TourismRecommender
+
+    result = {'rows': args.rows, 'similarity_mode': args.similarity_mode}
+
+    start = time.perf_counter()
+    catalogue = generate_catalogue(args.rows, seed=args.seed)
+    result['generate_s'] = time.perf_counter() - start
+
+    recommender = TourismRecommender(similarity_mode=args.similarity_mode, n_jobs=args.n_jobs)
+    start = time.perf_counter()
+    recommender.fit(catalogue)
+    result['fit_s'] = time.perf_counter() - start
+    result['preprocessing'] = recommender.preprocessor.stats()['timings']
+    del catalogue
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model')
+        start = time.perf_counter()
+        recommender.save_model(path)
+        result['save_s'] = time.perf_counter() - start
+        result['artifact_mb'] = disk_size(path) / 2**20
+
+        start = time.perf_counter()
+        loaded = TourismRecommender().load_model(path)
+        result['load_s'] = time.perf_counter() - start
+
+        queries = build_queries(loaded.df, args.queries, args.seed)
+        latency = {}
+        for method in METHODS:
+            # Pemanasan agar halaman mmap dan cache Python tidak ikut terukur
+            for query in queries[method][:5]:
+                run_method(loaded, method, query, args.top_n)
+            samples = []
+            for query in queries[method]:
+                start = time.perf_counter()
+                run_method(loaded, method, query, args.top_n)
+                samples.append(time.perf_counter() - start)
+            latency[method] = percentiles(samples)
+        result['latency'] = latency
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    print(json.dumps(result))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, baseline=None):
+    """
+    Ringkasan hasil; jika baseline diberikan, tampilkan rasio terhadap baseline
+    (nilai < 1 berarti lebih cepat/kecil)
+    """
+    base = {r['rows']: r for r in (baseline or {}).get('results', [])}
+
+    def fmt(value, old):
+        text = f"{value:.3f}" if value < 100 else f"{value:.0f}"
+        return f"{text} ({value / old:.2f}x)" if old else text
+
+    for r in results:
+        b = base.get(r['rows'], {})
+        print(f"\n== {r['rows']} baris ({r['similarity_mode']}) ==")
+        for key in ('fit_s', 'save_s', 'load_s', 'artifact_mb', 'peak_rss_mb'):
+            print(f"  {key:<12} {fmt(r[key], b.get(key))}")
+        for method in METHODS:
+            stats = r['latency'][method]
+            old = b.get('latency', {}).get(method, {})
+            print(f"  {method:<12} " + '  '.join(
+                f"{p} {fmt(stats[p + '_ms'], old.get(p + '_ms'))}" for p in ('p50', 'p95', 'p99')) + ' ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--queries', type=int, default=200, help='Jumlah query per metode')
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--similarity-mode', default='topk', choices=['topk', 'dense'])
+    parser.add_argument('--n-jobs', type=int, default=1, help='Proses untuk preprocessing teks saat fit')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Tulis hasil JSON ke file ini')
+    parser.add_argument('--compare', help='File JSON hasil run sebelumnya sebagai pembanding')
+    parser.add_argument('--rows', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    results = []
+    for size in args.sizes:
+        print(f"Benchmark {size} baris...", file=sys.stderr)
+        command = [sys.executable, '-m', 'benchmarks.bench_recommender', '--child', '--rows', str(size),
+                   '--queries', str(args.queries), '--top-n', str(args.top_n),
+                   '--similarity-mode', args.similarity_mode, '--n-jobs', str(args.n_jobs),
+                   '--seed', str(args.seed)]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    report = {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': {k: v for k, v in vars(args).items() if k not in ('rows', 'child', 'output', 'compare')},
+        },
+        'results': results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nHasil ditulis ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
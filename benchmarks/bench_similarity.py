@@ -0,0 +1,123 @@
+"""
+Perbandingan memori dan latensi antara matriks cosine similarity padat (N x N)
+dan indeks top-K tetangga (TopKNeighbors).
+
+Contoh:
+    python -m benchmarks.bench_similarity --sizes 1241 5000 10000 --k 100
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.recommender.neighbors import TopKNeighbors
+
+DATA_PATH = 'data/tempat_wisata_indonesia.csv'
+
+
+def load_corpus(n_rows, seed=42):
+    """
+    Membuat korpus berukuran n_rows dari deskripsi asli. Baris yang diulang
+    diberi sedikit variasi (kata diacak dan sebagian dibuang) agar tidak identik.
+    """
+    df = pd.read_csv(DATA_PATH)
+    texts = (df['deskripsi'].fillna('') + ' ' + df['provinsi'].fillna('')).str.lower().tolist()
+    rng = np.random.default_rng(seed)
+
+    corpus = []
+    for i in range(n_rows):
+        words = texts[i % len(texts)].split()
+        if i >= len(texts) and words:
+            keep = rng.random(len(words)) > 0.3
+            words = [w for w, k in zip(words, keep) if k]
+            rng.shuffle(words)
+        corpus.append(' '.join(words))
+    return corpus
+
+
+def measure(func):
+    """
+    Menjalankan func dan mengembalikan (hasil, detik, puncak alokasi dalam byte)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def query_latency(query, n_rows, n_queries=200, top_n=10, seed=0):
+    """
+    Mengukur latensi rata-rata satu query rekomendasi (mikrodetik)
+    """
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, n_rows, size=n_queries)
+    start = time.perf_counter()
+    for idx in ids:
+        query(int(idx), top_n)
+    return (time.perf_counter() - start) / n_queries * 1e6
+
+
+def dense_query(cosine_sim):
+    def query(idx, top_n):
+        # Sama seperti jalur lama content_based_recommendations
+        sim_scores = sorted(enumerate(cosine_sim[idx]), key=lambda x: x[1], reverse=True)
+        return sim_scores[1:top_n + 1]
+    return query
+
+
+def topk_query(neighbors):
+    def query(idx, top_n):
+        return neighbors.neighbors(idx, top_n)
+    return query
+
+
+def format_bytes(n_bytes):
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if n_bytes < 1024:
+            return f"{n_bytes:.1f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} PB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1241, 5000, 10000])
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--chunk-size', type=int, default=512)
+    parser.add_argument('--dense-limit', type=int, default=20000,
+                        help='Ukuran maksimum yang masih diukur dengan matriks padat')
+    args = parser.parse_args()
+
+    header = f"{'N':>8} | {'mode':>6} | {'fit (s)':>8} | {'peak fit':>10} | {'disimpan':>10} | {'query (us)':>10}"
+    print(header)
+    print('-' * len(header))
+
+    for n_rows in args.sizes:
+        tfidf_matrix = TfidfVectorizer().fit_transform(load_corpus(n_rows))
+
+        if n_rows <= args.dense_limit:
+            cosine_sim, fit_s, peak = measure(lambda: cosine_similarity(tfidf_matrix, tfidf_matrix))
+            latency = query_latency(dense_query(cosine_sim), n_rows)
+            print(f"{n_rows:>8} | {'dense':>6} | {fit_s:>8.2f} | {format_bytes(peak):>10} | "
+                  f"{format_bytes(cosine_sim.nbytes):>10} | {latency:>10.1f}")
+            del cosine_sim
+        else:
+            print(f"{n_rows:>8} | {'dense':>6} | {'-':>8} | {'-':>10} | "
+                  f"{format_bytes(n_rows * n_rows * 8):>10} | {'-':>10}")
+
+        neighbors, fit_s, peak = measure(
+            lambda: TopKNeighbors.build(tfidf_matrix, k=args.k, chunk_size=args.chunk_size))
+        latency = query_latency(topk_query(neighbors), n_rows)
+        print(f"{n_rows:>8} | {'topk':>6} | {fit_s:>8.2f} | {format_bytes(peak):>10} | "
+              f"{format_bytes(neighbors.nbytes):>10} | {latency:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Generator katalog tempat wisata sintetis dengan skema CSV asli
+(id, nama, alamat, rating, jumlah_review, deskripsi, koordinat, url, provinsi,
+foto, kategori), untuk benchmark pada 1k sampai 1M baris.
+
+Contoh:
+    python -m benchmarks.synthetic --rows 100000 --output data/synthetic_100k.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Provinsi beserta perkiraan pusat koordinatnya (lat, lon)
+PROVINCES = {
+    'Aceh': (4.7, 96.7), 'Sumatera Utara': (2.1, 99.5), 'Sumatera Barat': (-0.7, 100.8),
+    'Riau': (0.3, 101.7), 'Jambi': (-1.6, 103.6), 'Sumatera Selatan': (-3.3, 104.0),
+    'Bengkulu': (-3.8, 102.3), 'Lampung': (-4.6, 105.4), 'Kepulauan Bangka Belitung': (-2.7, 106.4),
+    'Kepulauan Riau': (3.9, 108.1), 'DKI Jakarta': (-6.2, 106.8), 'Jawa Barat': (-6.9, 107.6),
+    'Jawa Tengah': (-7.2, 110.1), 'DI Yogyakarta': (-7.8, 110.4), 'Jawa Timur': (-7.5, 112.2),
+    'Banten': (-6.4, 106.1), 'Bali': (-8.4, 115.2), 'Nusa Tenggara Barat': (-8.6, 117.4),
+    'Nusa Tenggara Timur': (-8.7, 121.1), 'Kalimantan Barat': (0.0, 109.3), 'Kalimantan Tengah': (-1.7, 113.4),
+    'Kalimantan Selatan': (-3.1, 115.3), 'Kalimantan Timur': (0.5, 116.4), 'Kalimantan Utara': (3.1, 116.0),
+    'Sulawesi Utara': (0.6, 124.0), 'Sulawesi Tengah': (-1.4, 121.4), 'Sulawesi Selatan': (-3.7, 120.0),
+    'Sulawesi Tenggara': (-4.1, 122.2), 'Gorontalo': (0.7, 122.4), 'Sulawesi Barat': (-2.8, 119.2),
+    'Maluku': (-3.2, 130.1), 'Maluku Utara': (1.6, 127.8), 'Papua': (-4.3, 138.1), 'Papua Barat': (-1.3, 133.2),
+}
+
+# Kategori dan awalan nama yang umum dipakai untuk kategori tersebut
+CATEGORIES = {
+    'pantai': ['Pantai', 'Teluk', 'Tanjung'],
+    'gunung': ['Gunung', 'Bukit', 'Puncak'],
+    'air terjun': ['Air Terjun', 'Curug', 'Coban'],
+    'danau': ['Danau', 'Telaga', 'Ranu'],
+    'taman': ['Taman', 'Kebun Raya', 'Hutan Kota'],
+    'museum': ['Museum', 'Galeri', 'Monumen'],
+    'candi': ['Candi', 'Situs', 'Pura'],
+    'religi': ['Masjid', 'Gereja', 'Vihara'],
+    'pulau': ['Pulau', 'Gili', 'Nusa'],
+    'goa': ['Goa', 'Gua', 'Lembah'],
+}
+
+SYLLABLES = ['ba', 'lo', 'ma', 'ri', 'sa', 'ta', 'ng', 'ku', 'ra', 'wa', 'ja', 'ti', 'pa', 'du',
+             'se', 'ge', 'lam', 'pu', 'uk', 'ban', 'dar', 'sin', 'kam', 'pung', 'ne', 'so', 'ha']
+
+# Kosakata deskripsi; frekuensi kata mengikuti distribusi Zipf seperti teks asli
+WORDS = (
+    'wisata tempat indah pemandangan alam pengunjung terletak menawarkan keindahan terkenal '
+    'pasir putih air jernih laut ombak sunset matahari terbenam terbit hijau sejuk udara segar '
+    'keluarga liburan foto spot populer lokal budaya sejarah tradisional peninggalan kerajaan '
+    'hutan pohon bunga kebun sawah sungai tebing batu karang ikan snorkeling diving berenang '
+    'mendaki trekking jalur puncak kabut dingin kawah vulkanik danau perahu dermaga pulau kecil '
+    'religi ibadah arsitektur megah unik bersejarah museum koleksi benda edukasi anak anak '
+    'kuliner makanan khas oleh warung fasilitas parkir toilet penginapan akses jalan mudah '
+    'ramai tenang damai eksotis tersembunyi asri alami luas bersih terawat suasana nyaman '
+    'akhir pekan musim kemarau hujan pagi sore malam cahaya lampu festival upacara adat tari'
+).split()
+
+
+def _place_names(rng, n_rows, categories):
+    """
+    Nama tempat: awalan sesuai kategori + 1-2 kata dari suku kata acak
+    """
+    syllables = np.asarray(SYLLABLES)
+    lengths = rng.integers(2, 4, size=(n_rows, 2))
+    picks = rng.integers(0, len(syllables), size=(n_rows, 6))
+    two_words = rng.random(n_rows) < 0.4
+    names = []
+    for i in range(n_rows):
+        prefixes = CATEGORIES[categories[i]]
+        prefix = prefixes[picks[i, 0] % len(prefixes)]
+        first = ''.join(syllables[picks[i, :lengths[i, 0]]]).capitalize()
+        if two_words[i]:
+            second = ''.join(syllables[picks[i, 3:3 + lengths[i, 1]]]).capitalize()
+            names.append(f"{prefix} {first} {second}")
+        else:
+            names.append(f"{prefix} {first}")
+    return names
+
+
+def generate_catalogue(n_rows, seed=42, words_per_description=(25, 60)):
+    """
+    Menghasilkan DataFrame n_rows tempat wisata sintetis dengan skema CSV asli
+    """
+    rng = np.random.default_rng(seed)
+    province_names = list(PROVINCES)
+    category_names = list(CATEGORIES)
+
+    province_idx = rng.integers(0, len(province_names), size=n_rows)
+    provinces = [province_names[i] for i in province_idx]
+    categories = [category_names[i] for i in rng.integers(0, len(category_names), size=n_rows)]
+    names = _place_names(rng, n_rows, categories)
+    # Nama dibuat unik seperti data asli (nama kembar diberi nomor id)
+    duplicated = pd.Series(names).duplicated().to_numpy()
+    names = [f"{name} {i + 1}" if duplicated[i] else name for i, name in enumerate(names)]
+
+    # Koordinat tersebar di sekitar pusat provinsi
+    centers = np.asarray([PROVINCES[p] for p in province_names])[province_idx]
+    latitudes = np.round(centers[:, 0] + rng.normal(0, 0.6, n_rows), 7)
+    longitudes = np.round(centers[:, 1] + rng.normal(0, 0.8, n_rows), 7)
+
+    ratings = np.round(np.clip(rng.normal(4.4, 0.3, n_rows), 1.0, 5.0), 1)
+    reviews = np.maximum(1, rng.lognormal(5.5, 1.6, n_rows)).astype(np.int64)
+
+    # Deskripsi: nama + kata dari kosakata dengan peluang Zipf
+    vocab = np.asarray(WORDS)
+    weights = 1.0 / np.arange(1, len(vocab) + 1)
+    weights /= weights.sum()
+    lengths = rng.integers(words_per_description[0], words_per_description[1] + 1, size=n_rows)
+    tokens = rng.choice(len(vocab), size=int(lengths.sum()), p=weights)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    descriptions = [
+        f"{names[i]} di {provinces[i]} " + ' '.join(vocab[tokens[offsets[i]:offsets[i + 1]]]) + '.'
+        for i in range(n_rows)
+    ]
+
+    ids = np.arange(1, n_rows + 1)
+    return pd.DataFrame({
+        'id': ids,
+        'nama': names,
+        'alamat': [f"Kec. {p}" for p in provinces],
+        'rating': ratings,
+        'jumlah_review': reviews,
+        'deskripsi': descriptions,
+        'koordinat': [f"{{'latitude': {lat}, 'longitude': {lon}}}" for lat, lon in zip(latitudes, longitudes)],
+        'url': [f"https://www.google.com/maps/place/data=!3d{lat}!4d{lon}" for lat, lon in zip(latitudes, longitudes)],
+        'provinsi': provinces,
+        'foto': [f"data/images/wisata_{i}.jpg" for i in ids],
+        'kategori': [f"['{c}']" for c in categories],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', required=True, help='Path file CSV keluaran')
+    args = parser.parse_args()
+
+    generate_catalogue(args.rows, seed=args.seed).to_csv(args.output, index=False)
+    print(f"{args.rows} baris ditulis ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Konfigurasi gunicorn, dipakai oleh Procfile:
+
+    gunicorn --config gunicorn.conf.py "app:create_app()"
+
+Dengan preload_app (default), create_app() memuat model rekomendasi, data, dan
+model prediksi popularitas sekali di proses master; worker hasil fork berbagi
+halaman memori tersebut (copy-on-write) alih-alih memuat salinannya sendiri.
+Lihat benchmarks/bench_preload.py untuk pengukuran memori per worker.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Runtime TensorFlow tidak aman dipakai setelah fork, jadi secara default model
+# chatbot dimuat di setiap worker setelah fork. Dengan runtime NumPy
+# (chatbot_model.npz, tanpa TensorFlow) CHATBOT_PRELOAD=true aman dipakai.
+start_chatbot_in_worker = (
+    preload_app
+    and os.getenv('CHATBOT_PRELOAD', 'false').lower() != 'true'
+    and 'CHATBOT_LOAD_MODE' not in os.environ
+)
+if start_chatbot_in_worker:
+    os.environ['CHATBOT_LOAD_MODE'] = 'lazy'
+
+# Worker sync satu thread hanya melayani satu permintaan sekaligus, jadi batch
+# chatbot tidak pernah berisi lebih dari satu pesan dan jendela tunggunya hanya
+# menambah latensi. Micro-batching dinyalakan jika worker bisa melayani beberapa
+# permintaan sekaligus (CHATBOT_BATCH_WINDOW_MS tetap bisa diatur manual).
+concurrent_workers = threads > 1 or worker_class in ('gevent', 'eventlet', 'tornado')
+if concurrent_workers:
+    os.environ.setdefault('CHATBOT_BATCH_WINDOW_MS', '3')
+
+
+def pre_fork(server, worker):
+    # Objek milik master (DataFrame, indeks, fragmen JSON) dipindah ke generasi
+    # permanen GC agar pengumpulan sampah di worker tidak menyalin halamannya
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if start_chatbot_in_worker:
+        from src.chatbot.api.chatbot_api import chatbot_loader
+        chatbot_loader.start()
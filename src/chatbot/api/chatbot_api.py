@@ -4,7 +4,12 @@ API endpoint untuk chatbot wisata
 
 from flask import Blueprint, request, jsonify
 from ..inference.intent_chatbot import IntentChatbot
+from ..inference.loader import ChatbotLoader, FAILED, READY
+from ..inference.batching import MicroBatcher
+from ..stemming import shared_stemmer
 import logging
+import os
+from functools import partial
 from typing import Dict, Any
 
 # Setup logging
@@ -14,17 +19,78 @@ logger = logging.getLogger(__name__)
 # Inisialisasi blueprint
 chatbot_bp = Blueprint('chatbot', __name__)
 
-# Inisialisasi chatbot berbasis intent
-# Pastikan model dan file pendukung ada di 'models/chatbot_intent'
-try:
-    chatbot = IntentChatbot()
-    logger.info("IntentChatbot berhasil diinisialisasi.")
-except FileNotFoundError as e:
-    logger.error(f"Gagal menginisialisasi IntentChatbot: {e}")
-    logger.error("Pastikan model sudah dilatih dan file-file pendukung (.h5, .pkl) ada di direktori models/chatbot_intent")
-    # Handle error - mungkin set chatbot ke None atau gunakan dummy response
-    chatbot = None # Set None jika gagal inisialisasi
-    
+# Chatbot berbasis intent dimuat di latar belakang (import TensorFlow dan model .h5),
+# sehingga endpoint lain sudah bisa melayani permintaan selama chatbot dimuat.
+# Pastikan model dan file pendukung ada di 'models/chatbot_intent'.
+# CHATBOT_LOAD_MODE: 'background' (mulai saat blueprint didaftarkan) atau
+# 'lazy' (mulai saat permintaan chatbot pertama)
+CHATBOT_LOAD_MODE = os.getenv('CHATBOT_LOAD_MODE', 'background')
+# CHATBOT_BACKEND: 'auto' (NumPy jika chatbot_model.npz ada), 'numpy', atau 'keras'
+CHATBOT_BACKEND = os.getenv('CHATBOT_BACKEND', 'auto')
+chatbot_loader = ChatbotLoader(
+    partial(IntentChatbot, backend=CHATBOT_BACKEND),
+    retry_after=int(os.getenv('CHATBOT_RETRY_AFTER', 5))
+)
+
+# Micro-batching /chat: pesan yang datang dalam jendela CHATBOT_BATCH_WINDOW_MS
+# (atau sampai CHATBOT_BATCH_MAX_SIZE pesan) diklasifikasi dalam satu panggilan
+# model. Batching hanya berguna jika satu proses melayani beberapa permintaan
+# sekaligus (thread atau worker async), sehingga default-nya 0 (mati: setiap
+# pesan diproses langsung di thread permintaannya); gunicorn.conf.py menyalakannya
+# (3 ms) jika GUNICORN_THREADS > 1 atau worker class async.
+CHATBOT_BATCH_WINDOW_MS = float(os.getenv('CHATBOT_BATCH_WINDOW_MS', 0))
+chat_batcher = None
+if CHATBOT_BATCH_WINDOW_MS > 0:
+    chat_batcher = MicroBatcher(
+        lambda messages: chatbot_loader.get().get_responses(messages),
+        max_batch_size=int(os.getenv('CHATBOT_BATCH_MAX_SIZE', 32)),
+        max_wait_ms=CHATBOT_BATCH_WINDOW_MS,
+        timeout=float(os.getenv('CHATBOT_BATCH_TIMEOUT', 10))
+    )
+
+@chatbot_bp.record_once
+def _start_chatbot_loader(state):
+    if CHATBOT_LOAD_MODE == 'background':
+        chatbot_loader.start()
+
+def chatbot_unavailable():
+    """
+    Respons 503 selama chatbot belum siap (dengan Retry-After) atau gagal dimuat
+    """
+    status = chatbot_loader.status()
+    if status["state"] == FAILED:
+        return jsonify({
+            "error": "Chatbot model not loaded",
+            "message": "Model chatbot gagal dimuat.",
+            "status": status
+        }), 503 # Service Unavailable
+
+    response = jsonify({
+        "error": "Chatbot model not ready",
+        "message": "Model chatbot sedang dimuat, silakan coba lagi sebentar lagi.",
+        "status": status
+    })
+    response.headers['Retry-After'] = str(chatbot_loader.retry_after)
+    return response, 503 # Service Unavailable
+
+@chatbot_bp.route('/status', methods=['GET'])
+def chatbot_status():
+    """Status pemuatan model chatbot (idle/loading/ready/failed)"""
+    return jsonify(chatbot_loader.status())
+
+@chatbot_bp.route('/metrics', methods=['GET'])
+def chatbot_metrics():
+    """
+    Metrik chatbot: micro-batching /chat (kedalaman antrean dan ukuran batch),
+    cache stemming, dan rasio pesan yang dijawab lewat pencocokan pola tanpa model
+    """
+    # Tidak memakai chatbot_loader.get() agar endpoint metrik tidak memicu pemuatan model
+    chatbot = chatbot_loader.chatbot if chatbot_loader.state == READY else None
+    return jsonify({
+        "batching": {"enabled": True, **chat_batcher.stats()} if chat_batcher is not None else {"enabled": False},
+        "stemming": shared_stemmer.stats(),
+        "fast_path": chatbot.fast_path_stats() if chatbot is not None else None
+    })
 
 @chatbot_bp.route('/chat', methods=['POST'])
 def chat():
@@ -46,11 +112,9 @@ def chat():
         ]
     }
     """
+    chatbot = chatbot_loader.get()
     if chatbot is None:
-         return jsonify({
-            "error": "Chatbot model not loaded",
-            "message": "Model chatbot belum siap atau gagal dimuat."
-        }), 503 # Service Unavailable
+        return chatbot_unavailable()
         
     try:
         data = request.get_json()
@@ -72,7 +136,10 @@ def chat():
         
         # Generate respons menggunakan IntentChatbot
         user_message = data["message"]
-        response = chatbot.get_response(user_message) # Gunakan metode get_response
+        if chat_batcher is not None:
+            response = chat_batcher.submit(user_message) # Diklasifikasi bersama pesan lain dalam satu batch
+        else:
+            response = chatbot.get_response(user_message) # Gunakan metode get_response
         
         # Return respons
         # IntentChatbot sederhana tidak mengembalikan history percakapan dalam response
@@ -91,11 +158,9 @@ def chat():
 @chatbot_bp.route('/reset', methods=['POST'])
 def reset_conversation():
     """Reset conversation history"""
+    chatbot = chatbot_loader.get()
     if chatbot is None:
-         return jsonify({
-            "error": "Chatbot model not loaded",
-            "message": "Model chatbot belum siap atau gagal dimuat."
-        }), 503 # Service Unavailable
+        return chatbot_unavailable()
         
     try:
         chatbot.reset_conversation() # Panggil metode reset di IntentChatbot
@@ -114,11 +179,9 @@ def reset_conversation():
 @chatbot_bp.route('/history', methods=['GET'])
 def get_history():
     """Get conversation history"""
+    chatbot = chatbot_loader.get()
     if chatbot is None:
-         return jsonify({
-            "error": "Chatbot model not loaded",
-            "message": "Model chatbot belum siap atau gagal dimuat."
-        }), 503 # Service Unavailable
+        return chatbot_unavailable()
         
     try:
         # IntentChatbot sederhana tidak menyimpan history internal
@@ -0,0 +1,86 @@
+"""
+Encoder bag-of-words untuk chatbot intent, dipakai bersama oleh training
+(train_intent_model.py) dan inference (IntentChatbot) agar fitur keduanya identik.
+"""
+import pickle
+import re
+
+import numpy as np
+from scipy import sparse
+
+# Token: rangkaian huruf/angka, termasuk kata berimbuhan tanda hubung atau
+# apostrof di tengah (lumba-lumba, jum'at); tanda baca lain diabaikan
+TOKEN_PATTERN = r"\w+(?:[-'’]\w+)*"
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+
+def tokenize(sentence):
+    """Memecah kalimat menjadi token kata"""
+    return _TOKEN_RE.findall(sentence) if isinstance(sentence, str) else []
+
+
+def build_vocabulary(sentences, stem):
+    """Daftar kata unik (hasil stem) yang terurut dari kumpulan kalimat"""
+    vocabulary = {stem(token) for sentence in sentences for token in tokenize(sentence)}
+    vocabulary.discard('')
+    return sorted(vocabulary)
+
+
+class BagOfWordsEncoder:
+    """
+    Mengubah kalimat menjadi vektor bag-of-words biner atas vocabulary words.
+
+    Dict kata -> kolom dibangun sekali, sehingga encode satu kalimat cukup satu
+    lookup per token (bukan membandingkan setiap token dengan seluruh vocabulary).
+    stem adalah fungsi stemming yang sama dengan saat vocabulary dibuat.
+    """
+
+    def __init__(self, words, stem=None):
+        self.words = list(words)
+        self.stem = stem if stem is not None else str.lower
+        self.index = {}
+        for column, word in enumerate(self.words):
+            self.index.setdefault(word, column)
+
+    @classmethod
+    def from_file(cls, words_file, stem=None):
+        """Membuat encoder dari words.pkl hasil training"""
+        with open(words_file, 'rb') as f:
+            return cls(pickle.load(f), stem=stem)
+
+    def __len__(self):
+        return len(self.words)
+
+    def columns(self, sentence):
+        """Indeks kolom (terurut, unik) yang bernilai 1 untuk kalimat"""
+        index = self.index
+        stem = self.stem
+        return sorted({index[s] for s in map(stem, tokenize(sentence)) if s in index})
+
+    def encode(self, sentence):
+        """Vektor bag-of-words (float32) untuk satu kalimat"""
+        bag = np.zeros(len(self.words), dtype=np.float32)
+        bag[self.columns(sentence)] = 1
+        return bag
+
+    def encode_batch(self, sentences, sparse_output=False):
+        """
+        Matriks bag-of-words (satu baris per kalimat) dalam satu kali lewat;
+        sparse_output=True mengembalikan scipy.sparse CSR
+        """
+        indptr = [0]
+        indices = []
+        for sentence in sentences:
+            indices.extend(self.columns(sentence))
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        if sparse_output:
+            data = np.ones(len(indices), dtype=np.float32)
+            return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.words)))
+
+        matrix = np.zeros((len(indptr) - 1, len(self.words)), dtype=np.float32)
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        matrix[rows, indices] = 1
+        return matrix
@@ -0,0 +1,125 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Menggabungkan permintaan yang datang hampir bersamaan menjadi satu batch.
+
+    submit() memasukkan satu item ke antrean lalu menunggu hasilnya. Thread
+    dispatcher mengambil item pertama, menunggu item lain paling lama
+    max_wait_ms atau sampai max_batch_size item, lalu memanggil
+    handler(list item) sekali dan membagikan hasilnya (satu per item, urutan
+    sama) ke setiap pemanggil. Thread dimulai saat submit pertama di setiap
+    proses, jadi aman dipakai bersama worker gunicorn hasil fork.
+    """
+
+    def __init__(self, handler, max_batch_size=32, max_wait_ms=3.0, timeout=10.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size harus lebih besar dari 0")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.timeout = timeout
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.max_queue_depth = 0
+        self.errors = 0
+        self.total_wait_seconds = 0.0
+        self.total_handler_seconds = 0.0
+        self.batch_sizes = {}
+
+    def _ensure_dispatcher(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Antrean milik proses induk tidak berlaku di proses hasil fork
+                self._queue = queue.Queue()
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='chatbot-batcher', daemon=True)
+                self._thread.start()
+
+    def submit(self, item):
+        """Memproses item lewat batch berikutnya dan mengembalikan hasilnya"""
+        self._ensure_dispatcher()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return future.result(timeout=self.timeout)
+
+    def _collect(self):
+        """Satu batch: item pertama (menunggu), lalu item lain sampai batas waktu/ukuran"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _, _ in batch]
+            start = time.perf_counter()
+            try:
+                results = self.handler(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"Handler mengembalikan {len(results)} hasil untuk {len(items)} item")
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Gagal memproses batch berisi {len(items)} item: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                self._record(batch, start)
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def _record(self, batch, start):
+        now = time.perf_counter()
+        size = len(batch)
+        self.batches += 1
+        self.items += size
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
+        self.total_wait_seconds += sum(start - queued_at for _, _, queued_at in batch)
+        self.total_handler_seconds += now - start
+
+    def stats(self):
+        """Metrik untuk menyetel max_wait_ms dan max_batch_size"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+            "batch_sizes": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            "mean_queue_wait_ms": self.total_wait_seconds / self.items * 1000 if self.items else 0.0,
+            "mean_batch_ms": self.total_handler_seconds / self.batches * 1000 if self.batches else 0.0,
+            "errors": self.errors,
+        }
@@ -1,39 +1,21 @@
 import json
 import numpy as np
-import tensorflow as tf
-import nltk
-from nltk.stem.porter import PorterStemmer # Atau gunakan Sastrawi
 import pickle
 import random
 import os
 import logging
+import threading
+
+from ..encoder import BagOfWordsEncoder, tokenize
+from ..stemming import shared_stemmer, stem
+from .numpy_model import NumpyIntentModel
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Gunakan stemmer yang sesuai (harus sama dengan saat training)
-try:
-    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-    factory = StemmerFactory()
-    stemmer = factory.create_stemmer()
-    # print("Menggunakan Sastrawi Stemmer")
-except ImportError:
-    # print("Sastrawi tidak terinstal, menggunakan PorterStemmer")
-    stemmer = PorterStemmer()
-
-def stem(word):
-    """Melakukan stemming pada kata"""
-    return stemmer.stem(word.lower())
-
 def bag_of_words(sentence, words):
-    """Membuat bag of words dari kalimat"""
-    sentence_words = [stem(word) for word in nltk.word_tokenize(sentence)]
-    bag = np.zeros(len(words), dtype=np.float32)
-    for w in sentence_words:
-        for i, word in enumerate(words):
-            if word == w:
-                bag[i] = 1
-    return bag
+    """Membuat bag of words dari kalimat (untuk pemakaian sekali; IntentChatbot memakai encoder yang disimpan)"""
+    return BagOfWordsEncoder(words, stem=stem).encode(sentence)
 
 class IntentChatbot:
     def __init__(
@@ -41,7 +23,9 @@ class IntentChatbot:
         model_dir: str = 'models/chatbot_intent', # Direktori model intent
         intents_file: str = 'data/intents_wisata.json',
         error_response: str = "Maaf, saya tidak mengerti. Bisa ulangi atau tanyakan hal lain?",
-        prediction_threshold: float = 0.7 # Threshold untuk confidence prediksi
+        prediction_threshold: float = 0.7, # Threshold untuk confidence prediksi
+        backend: str = 'auto', # Runtime model: 'auto', 'numpy', atau 'keras'
+        fast_path: bool = True # Jawab pesan yang sama dengan pola training tanpa model
     ):
         """
         Inisialisasi IntentChatbot
@@ -51,27 +35,60 @@ class IntentChatbot:
             intents_file (str): Path ke file JSON intents.
             error_response (str): Respons jika tidak ada intent yang cocok.
             prediction_threshold (float): Confidence score minimum untuk memilih intent.
+            backend (str): 'numpy' memakai bobot chatbot_model.npz tanpa TensorFlow,
+                'keras' memuat chatbot_model.h5 dengan TensorFlow, 'auto' memilih
+                'numpy' jika file .npz tersedia.
+            fast_path (bool): Pesan yang setelah normalisasi sama persis (atau sama
+                setelah stemming) dengan satu pola training langsung dijawab dengan
+                intent pola tersebut; model hanya dipakai untuk kalimat baru.
         """
+        if backend not in ('auto', 'numpy', 'keras'):
+            raise ValueError("backend harus 'auto', 'numpy', atau 'keras'")
+        
         self.model_dir = model_dir
         self.intents_file = intents_file
         self.error_response = error_response
         self.prediction_threshold = prediction_threshold
+        self.backend = backend
+        self.fast_path = fast_path
         
         self._load_model_and_data()
         self._load_intents()
         
+        # Cache stemming diisi dengan vocabulary dan pola intents, sehingga kata
+        # yang umum tidak perlu di-stem ulang pada permintaan pertama
+        warmed = shared_stemmer.warm_from_vocabulary(self.words, self.intents)
+        logger.info(f"Cache stemming ({shared_stemmer.name}) dipanaskan dengan {warmed} kata.")
+        
+        self._build_indexes()
+        
     def _load_model_and_data(self):
         """Memuat model, words, dan classes dari file"""
         model_file = os.path.join(self.model_dir, 'chatbot_model.h5')
+        numpy_file = os.path.join(self.model_dir, 'chatbot_model.npz')
         words_file = os.path.join(self.model_dir, 'words.pkl')
         classes_file = os.path.join(self.model_dir, 'classes.pkl')
         
-        logger.info(f"Memuat model dari {model_file}...")
-        try:
-            self.model = tf.keras.models.load_model(model_file)
-        except Exception as e:
-            logger.error(f"Gagal memuat model: {e}")
-            raise FileNotFoundError(f"Model file tidak ditemukan atau error: {model_file}")
+        if self.backend == 'auto':
+            self.backend = 'numpy' if os.path.exists(numpy_file) else 'keras'
+        
+        if self.backend == 'numpy':
+            logger.info(f"Memuat bobot model (runtime NumPy) dari {numpy_file}...")
+            try:
+                self.model = NumpyIntentModel.load(numpy_file)
+            except Exception as e:
+                logger.error(f"Gagal memuat model: {e}")
+                raise FileNotFoundError(f"Model file tidak ditemukan atau error: {numpy_file}")
+        else:
+            logger.info(f"Memuat model dari {model_file}...")
+            # TensorFlow diimpor di sini (bukan saat import modul) agar proses yang
+            # tidak memakai chatbot tidak membayar waktu import TensorFlow
+            import tensorflow as tf
+            try:
+                self.model = tf.keras.models.load_model(model_file)
+            except Exception as e:
+                logger.error(f"Gagal memuat model: {e}")
+                raise FileNotFoundError(f"Model file tidak ditemukan atau error: {model_file}")
 
         logger.info(f"Memuat words dari {words_file}...")
         try:
@@ -89,6 +106,9 @@ class IntentChatbot:
             logger.error(f"Gagal memuat classes: {e}")
             raise FileNotFoundError(f"Classes file tidak ditemukan atau error: {classes_file}")
         
+        # Dict kata -> kolom dibangun sekali untuk semua pesan
+        self.encoder = BagOfWordsEncoder(self.words, stem=stem)
+        
         logger.info("Model dan data pendukung berhasil dimuat.")
 
     def _load_intents(self):
@@ -102,48 +122,135 @@ class IntentChatbot:
              raise FileNotFoundError(f"Intents file tidak ditemukan atau error: {self.intents_file}")
         logger.info("Intents berhasil dimuat.")
 
+    @staticmethod
+    def normalize(sentence):
+        """Kalimat lowercase tanpa tanda baca dan spasi berlebih (kunci pencocokan pola)"""
+        return " ".join(tokenize(sentence.lower())) if isinstance(sentence, str) else ""
+
+    def _stem_key(self, sentence):
+        """Kunci pencocokan setelah stemming (urutan kata tetap)"""
+        return " ".join(map(stem, tokenize(sentence)))
+
+    def _build_indexes(self):
+        """
+        Dict tag -> respons, serta tabel pola ternormalisasi -> tag (persis dan
+        setelah stemming). Pola yang muncul di lebih dari satu intent tidak
+        dimasukkan, sehingga tetap diputuskan oleh model.
+        """
+        self.responses = {}
+        exact = {}
+        stemmed = {}
+        for intent in self.intents['intents']:
+            tag = intent['tag']
+            self.responses.setdefault(tag, intent['responses'])
+            for pattern in intent['patterns']:
+                for table, key in ((exact, self.normalize(pattern)), (stemmed, self._stem_key(pattern))):
+                    if key:
+                        table[key] = tag if table.get(key, tag) == tag else None
+        self.pattern_index = {key: tag for key, tag in exact.items() if tag is not None}
+        self.stem_pattern_index = {key: tag for key, tag in stemmed.items() if tag is not None}
+        # Penghitung jalur cepat: cocok persis, cocok setelah stemming, dan diprediksi model
+        # (dilindungi lock karena predict_intents dipanggil dari banyak thread Flask)
+        self.match_counts = {'exact': 0, 'stemmed': 0, 'model': 0}
+        self._counts_lock = threading.Lock()
+        logger.info(f"Indeks pola: {len(self.pattern_index)} pola persis, "
+                    f"{len(self.stem_pattern_index)} pola setelah stemming.")
+
+    def match_pattern(self, sentence):
+        """
+        (tag, jenis kecocokan) jika kalimat sama dengan pola training setelah
+        normalisasi ('exact') atau setelah stemming ('stemmed'), selain itu (None, None)
+        """
+        tag = self.pattern_index.get(self.normalize(sentence))
+        if tag is not None:
+            return tag, 'exact'
+        if isinstance(sentence, str):
+            tag = self.stem_pattern_index.get(self._stem_key(sentence))
+            if tag is not None:
+                return tag, 'stemmed'
+        return None, None
+
+    def fast_path_stats(self):
+        """Jumlah pesan per jalur dan rasio pesan yang dijawab tanpa model"""
+        with self._counts_lock:
+            counts = dict(self.match_counts)
+        total = sum(counts.values())
+        return {
+            'enabled': self.fast_path,
+            'patterns': len(self.pattern_index),
+            'stemmed_patterns': len(self.stem_pattern_index),
+            **counts,
+            'hit_ratio': round((counts['exact'] + counts['stemmed']) / total, 4) if total else 0.0
+        }
+
     def predict_intent(self, sentence: str):
         """Memprediksi intent dari kalimat input"""
-        # Preprocessing input
-        p = bag_of_words(sentence, self.words)
-        # Reshape untuk input model (batch size 1)
-        p = p.reshape(1, -1)
+        return self.predict_intents([sentence])[0]
+
+    def predict_intents(self, sentences):
+        """
+        Memprediksi intent untuk banyak kalimat sekaligus: encode dan prediksi
+        model dalam satu batch, hasilnya satu list intent per kalimat.
+        Kalimat yang cocok dengan pola training (fast_path) tidak melewati model.
+        """
+        predictions = [None] * len(sentences)
+        novel = []
+        counts = {'exact': 0, 'stemmed': 0}
+        for i, sentence in enumerate(sentences):
+            tag, match = self.match_pattern(sentence) if self.fast_path else (None, None)
+            if tag is None:
+                novel.append(i)
+            else:
+                counts[match] += 1
+                predictions[i] = [{'intent': tag, 'probability': 1.0, 'match': match}]
+        counts['model'] = len(novel)
+        # Penghitung per panggilan digabung sekali di bawah lock
+        with self._counts_lock:
+            for match, count in counts.items():
+                self.match_counts[match] += count
+        if not novel:
+            return predictions
         
-        # Prediksi dengan model
-        results = self.model.predict(p, verbose=0)[0] # verbose=0 untuk tidak menampilkan progress bar
+        # Preprocessing input (satu baris per kalimat)
+        p = self.encoder.encode_batch([sentences[i] for i in novel])
         
-        # Filter prediksi di bawah threshold dan urutkan berdasarkan probabilitas
-        results_filtered = [[i, r] for i, r in enumerate(results) if r > self.prediction_threshold]
-        results_filtered.sort(key=lambda x: x[1], reverse=True)
+        # Prediksi dengan model
+        results = self.model.predict(p, verbose=0) # verbose=0 untuk tidak menampilkan progress bar
         
-        # Kembalikan list intent dan probabilitasnya
-        return_list = []
-        for r in results_filtered:
-            # Convert numpy float32 ke float Python biasa agar kompatibel dengan JSON (opsional)
-            return_list.append({'intent': self.classes[r[0]], 'probability': float(r[1])})
+        for i, row in zip(novel, results):
+            # Filter prediksi di bawah threshold dan urutkan berdasarkan probabilitas
+            results_filtered = [[c, r] for c, r in enumerate(row) if r > self.prediction_threshold]
+            results_filtered.sort(key=lambda x: x[1], reverse=True)
             
-        return return_list
+            # Kembalikan list intent dan probabilitasnya
+            # (float32 numpy diubah ke float Python agar kompatibel dengan JSON)
+            predictions[i] = [{'intent': self.classes[c], 'probability': float(r)} for c, r in results_filtered]
+            
+        return predictions
 
-    def get_response(self, user_input: str) -> str:
-        """Mendapatkan respons chatbot untuk input user"""
-        # Prediksi intent
-        intents_list = self.predict_intent(user_input)
-        
+    def _response_for(self, intents_list) -> str:
+        """Memilih respons dari intent dengan probabilitas tertinggi"""
         # Jika ada intent dengan confidence tinggi
         if intents_list:
             # Ambil tag dari intent dengan probabilitas tertinggi
             tag = intents_list[0]['intent']
             
-            # Cari intent yang sesuai di data intents
-            for intent in self.intents['intents']:
-                if intent['tag'] == tag:
-                    # Pilih respons secara acak dari daftar respons intent tersebut
-                    response = random.choice(intent['responses'])
-                    return response
+            # Pilih respons secara acak dari daftar respons intent tersebut
+            responses = self.responses.get(tag)
+            if responses:
+                return random.choice(responses)
         
         # Jika tidak ada intent yang cocok atau confidence terlalu rendah
         return self.error_response
 
+    def get_response(self, user_input: str) -> str:
+        """Mendapatkan respons chatbot untuk input user"""
+        return self._response_for(self.predict_intent(user_input))
+
+    def get_responses(self, user_inputs) -> list:
+        """Respons untuk banyak input sekaligus (dipakai MicroBatcher di chatbot_api)"""
+        return [self._response_for(intents_list) for intents_list in self.predict_intents(user_inputs)]
+
 # Contoh penggunaan (opsional, bisa dihapus/dijadikan skrip terpisah)
 # if __name__ == "__main__":
 #     # Pastikan NLTK data sudah terunduh
@@ -0,0 +1,94 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Status pemuatan chatbot
+IDLE = 'idle'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class ChatbotLoader:
+    """
+    Memuat chatbot (IntentChatbot) di thread latar belakang sehingga import
+    aplikasi dan endpoint lain tidak menunggu import TensorFlow dan pemuatan
+    model. Selama status belum 'ready', get() mengembalikan None.
+
+    Thread tidak ikut tersalin saat proses di-fork (misalnya worker gunicorn
+    dengan preload), jadi pemuatan yang masih berjalan milik proses lain
+    diulang di proses ini.
+    """
+
+    def __init__(self, factory, retry_after=5):
+        self.factory = factory
+        # Saran jeda (detik) untuk header Retry-After selama model dimuat
+        self.retry_after = retry_after
+        self.chatbot = None
+        self.state = IDLE
+        self.error = None
+        self.load_seconds = None
+        self._pid = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Mulai memuat di thread latar belakang (tidak melakukan apa-apa jika
+        sedang dimuat di proses ini atau sudah selesai)
+        """
+        with self._lock:
+            if self.state == LOADING and self._pid != os.getpid():
+                # Status warisan dari proses induk tanpa thread-nya
+                self.state = IDLE
+            if self.state != IDLE:
+                return
+            self.state = LOADING
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._load, name='chatbot-loader', daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            chatbot = self.factory()
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            logger.error(f"Gagal menginisialisasi chatbot: {e}")
+            return
+        finally:
+            self.load_seconds = time.perf_counter() - start
+        self.chatbot = chatbot
+        self.state = READY
+        logger.info(f"Chatbot siap dalam {self.load_seconds:.2f} detik.")
+
+    def get(self):
+        """
+        Mengembalikan chatbot jika sudah siap, selain itu None (dan memulai
+        pemuatan bila belum dimulai)
+        """
+        if self.state != READY:
+            self.start()
+        return self.chatbot
+
+    def wait(self, timeout=None):
+        """
+        Menunggu pemuatan selesai; mengembalikan True jika chatbot siap
+        """
+        self.start()
+        thread = self._thread
+        if thread is not None and self.state == LOADING:
+            thread.join(timeout)
+        return self.state == READY
+
+    def status(self):
+        return {
+            "state": self.state,
+            "ready": self.state == READY,
+            "error": self.error,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+        }
@@ -0,0 +1,87 @@
+"""
+Runtime NumPy untuk classifier intent (MLP Dense -> Dense -> softmax), sehingga
+serving tidak perlu TensorFlow. Bobot diekspor dari model Keras ke file .npz
+dengan export_keras_model (lihat src/chatbot/training/export_numpy_model.py).
+"""
+import numpy as np
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _softmax(x):
+    # Sama dengan softmax Keras: dikurangi nilai maksimum per baris agar stabil
+    x = np.exp(x - x.max(axis=-1, keepdims=True))
+    return x / x.sum(axis=-1, keepdims=True)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'relu': _relu,
+    'softmax': _softmax,
+    'linear': _linear,
+}
+
+
+def export_keras_model(model, path):
+    """
+    Menyimpan kernel, bias, dan aktivasi setiap layer Dense dari model Keras ke
+    file .npz (layer tanpa bobot seperti Dropout tidak dipakai saat inference)
+    """
+    arrays = {}
+    activations = []
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        if len(weights) != 2:
+            raise ValueError(f"Layer {layer.name} tidak didukung: hanya Dense dengan kernel dan bias")
+        activation = getattr(layer.activation, '__name__', 'linear')
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Aktivasi {activation} pada layer {layer.name} tidak didukung")
+        i = len(activations)
+        arrays[f'kernel_{i}'] = np.asarray(weights[0], dtype=np.float32)
+        arrays[f'bias_{i}'] = np.asarray(weights[1], dtype=np.float32)
+        activations.append(activation)
+
+    np.savez(path, activations=np.asarray(activations), **arrays)
+    return path
+
+
+class NumpyIntentModel:
+    """
+    Forward pass MLP dengan NumPy (float32 seperti Keras). predict() memiliki
+    bentuk pemanggilan yang sama dengan model Keras sehingga bisa dipakai
+    bergantian di IntentChatbot.
+    """
+
+    def __init__(self, layers):
+        # layers: list (kernel, bias, nama aktivasi)
+        self.layers = [
+            (np.ascontiguousarray(kernel, dtype=np.float32), np.asarray(bias, dtype=np.float32), ACTIVATIONS[activation])
+            for kernel, bias, activation in layers
+        ]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data['activations']]
+            layers = [(data[f'kernel_{i}'], data[f'bias_{i}'], activation) for i, activation in enumerate(activations)]
+        return cls(layers)
+
+    @property
+    def input_size(self):
+        return self.layers[0][0].shape[0]
+
+    def predict(self, x, verbose=0, batch_size=None):
+        """Probabilitas kelas untuk matriks input (satu baris per kalimat)"""
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        for kernel, bias, activation in self.layers:
+            x = activation(x @ kernel + bias)
+        return x
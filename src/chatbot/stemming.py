@@ -0,0 +1,114 @@
+"""
+Layanan stemming chatbot bersama untuk training (train_intent_model.py) dan
+inference (IntentChatbot): Sastrawi jika terinstal, selain itu PorterStemmer,
+dengan hasil per kata dimemo dalam cache LRU berukuran terbatas.
+"""
+import json
+import os
+import pickle
+import threading
+from functools import lru_cache
+
+from .encoder import tokenize
+
+
+class CachedStemmer:
+    """
+    Stemmer dengan memo LRU (kata lowercase -> hasil stem). Stemmer dasar
+    dibuat saat pertama dipakai, karena membangun kamus Sastrawi cukup lama.
+    Cache dapat dipanaskan dari words.pkl dan pola intents agar kata yang
+    sering muncul sudah tersedia sebelum permintaan pertama.
+    """
+
+    def __init__(self, stemmer=None, cache_size=50000):
+        self._stemmer = stemmer
+        self._lock = threading.Lock()
+        self.cache_size = cache_size
+        self._stem = lru_cache(maxsize=cache_size)(self._stem_uncached)
+        self.warmed = 0
+        # Statistik cache saat pemanasan selesai; hit rate dihitung sesudahnya
+        self._baseline = (0, 0)
+
+    @property
+    def stemmer(self):
+        if self._stemmer is None:
+            with self._lock:
+                if self._stemmer is None:
+                    try:
+                        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+                        self._stemmer = StemmerFactory().create_stemmer()
+                    except ImportError:
+                        from nltk.stem.porter import PorterStemmer
+                        self._stemmer = PorterStemmer()
+        return self._stemmer
+
+    @property
+    def name(self):
+        return 'porter' if type(self.stemmer).__name__ == 'PorterStemmer' else 'sastrawi'
+
+    def _stem_uncached(self, word):
+        return self.stemmer.stem(word)
+
+    def stem(self, word):
+        """Melakukan stemming pada kata (lowercase)"""
+        return self._stem(word.lower())
+
+    __call__ = stem
+
+    def warm(self, words):
+        """Mengisi cache dengan hasil stem kumpulan kata; mengembalikan jumlah kata"""
+        count = 0
+        for word in words:
+            self.stem(word)
+            count += 1
+        info = self._stem.cache_info()
+        self._baseline = (info.hits, info.misses)
+        self.warmed += count
+        return count
+
+    def warm_from_vocabulary(self, words=(), intents=None):
+        """
+        Memanaskan cache dari vocabulary hasil training (words.pkl) dan token
+        pola di data intents
+        """
+        words = list(words)
+        if intents is not None:
+            words.extend(token for intent in intents['intents'] for pattern in intent['patterns']
+                         for token in tokenize(pattern))
+        return self.warm(words)
+
+    def warm_from_files(self, words_file=None, intents_file=None):
+        """Sama dengan warm_from_vocabulary, dari file (file yang tidak ada dilewati)"""
+        words = []
+        intents = None
+        if words_file and os.path.exists(words_file):
+            with open(words_file, 'rb') as f:
+                words = pickle.load(f)
+        if intents_file and os.path.exists(intents_file):
+            with open(intents_file, 'r', encoding='utf-8') as f:
+                intents = json.load(f)
+        return self.warm_from_vocabulary(words, intents)
+
+    def stats(self):
+        """Statistik cache stemming (hits/misses setelah pemanasan)"""
+        info = self._stem.cache_info()
+        hits = info.hits - self._baseline[0]
+        misses = info.misses - self._baseline[1]
+        return {
+            'stemmer': self.name if self._stemmer is not None else None,
+            'cache_size': info.currsize,
+            'cache_max_size': self.cache_size,
+            'warmed_words': self.warmed,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0
+        }
+
+
+# Instance bersama untuk proses ini (CHATBOT_STEM_CACHE_SIZE mengatur ukuran cache)
+shared_stemmer = CachedStemmer(cache_size=int(os.getenv('CHATBOT_STEM_CACHE_SIZE', 50000)))
+
+
+def stem(word):
+    """Melakukan stemming pada kata dengan stemmer bersama"""
+    return shared_stemmer.stem(word)
@@ -0,0 +1,53 @@
+"""
+Mengekspor bobot chatbot_model.h5 ke chatbot_model.npz untuk runtime NumPy
+(IntentChatbot backend='numpy'), lalu membandingkan probabilitas kedua runtime
+pada seluruh pola di file intents.
+
+    python src/chatbot/training/export_numpy_model.py
+    python src/chatbot/training/export_numpy_model.py --model-dir models/chatbot_intent
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# Tambahkan root repo ke path agar modul src bisa diimpor saat skrip dijalankan langsung
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from src.chatbot.encoder import BagOfWordsEncoder
+from src.chatbot.stemming import stem
+from src.chatbot.inference.numpy_model import NumpyIntentModel, export_keras_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', default='models/chatbot_intent')
+    parser.add_argument('--intents-file', default='data/intents_wisata.json')
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    model_file = os.path.join(args.model_dir, 'chatbot_model.h5')
+    numpy_file = os.path.join(args.model_dir, 'chatbot_model.npz')
+    keras_model = tf.keras.models.load_model(model_file)
+    export_keras_model(keras_model, numpy_file)
+    print(f"Bobot diekspor ke {numpy_file} ({os.path.getsize(numpy_file) / 1024:.0f} KB)")
+
+    # Verifikasi: probabilitas Keras vs NumPy pada semua pola training
+    with open(args.intents_file, 'r', encoding='utf-8') as f:
+        patterns = [p for intent in json.load(f)['intents'] for p in intent['patterns']]
+    encoder = BagOfWordsEncoder.from_file(os.path.join(args.model_dir, 'words.pkl'), stem=stem)
+    X = encoder.encode_batch(patterns)
+
+    expected = keras_model.predict(X, verbose=0)
+    actual = NumpyIntentModel.load(numpy_file).predict(X)
+    max_diff = float(np.abs(expected - actual).max())
+    same_top = float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean())
+    print(f"{len(patterns)} pola: selisih probabilitas maksimum {max_diff:.2e}, intent teratas sama {same_top:.2%}")
+    if not np.allclose(expected, actual, rtol=1e-5, atol=1e-6):
+        sys.exit("Probabilitas runtime NumPy berbeda dari Keras")
+
+
+if __name__ == '__main__':
+    main()
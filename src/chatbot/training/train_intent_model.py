@@ -4,49 +4,20 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Dropout
 from tensorflow.keras.optimizers import Adam
-import nltk
-from nltk.stem.porter import PorterStemmer # Atau gunakan Sastrawi untuk Bahasa Indonesia jika terinstal
 import pickle
-import random
 import os
+import sys
 
-# Pastikan NLTK data yang diperlukan sudah terunduh
-# Jalankan ini sekali jika belum: nltk.download('punkt'); nltk.download('wordnet')
-# Untuk Sastrawi: pip install Sastrawi
-# from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-
-# Gunakan stemmer yang sesuai (PorterStemmer untuk Bahasa Inggris, Sastrawi untuk Bahasa Indonesia)
-# stemmer = PorterStemmer() # Untuk Bahasa Inggris
-# factory = StemmerFactory()
-# stemmer = factory.create_stemmer() # Untuk Bahasa Indonesia (jika Sastrawi terinstal)
-
-# Karena dataset kita berbahasa Indonesia, kita akan coba gunakan stemmer Sastrawi
-# Jika Sastrawi belum terinstal, PorterStemmer akan digunakan sebagai fallback
-try:
-    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-    factory = StemmerFactory()
-    stemmer = factory.create_stemmer()
-    print("Menggunakan Sastrawi Stemmer")
-except ImportError:
-    print("Sastrawi tidak terinstal, menggunakan PorterStemmer (kurang optimal untuk Bahasa Indonesia)")
-    stemmer = PorterStemmer()
-
-def stem(word):
-    """Melakukan stemming pada kata"""
-    # Ubah ke lowercase dan lakukan stemming
-    return stemmer.stem(word.lower())
-
-def bag_of_words(sentence, words):
-    """Membuat bag of words dari kalimat"""
-    # Tokenisasi dan stemming kalimat
-    sentence_words = [stem(word) for word in nltk.word_tokenize(sentence)]
-    # Buat bag of words array dengan 0 atau 1
-    bag = np.zeros(len(words), dtype=np.float32)
-    for w in sentence_words:
-        for i, word in enumerate(words):
-            if word == w:
-                bag[i] = 1
-    return bag
+# Tambahkan root repo ke path agar encoder bersama bisa diimpor saat skrip dijalankan langsung
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from src.chatbot.encoder import BagOfWordsEncoder, build_vocabulary
+from src.chatbot.inference.numpy_model import export_keras_model
+from src.chatbot.stemming import shared_stemmer, stem
+
+# Stemmer bersama dengan inference: Sastrawi untuk Bahasa Indonesia jika terinstal
+# (pip install Sastrawi), selain itu PorterStemmer sebagai fallback. Hasil stem
+# per kata dimemo, sehingga kata yang berulang di banyak pola cukup di-stem sekali.
+print(f"Menggunakan stemmer {shared_stemmer.name}")
 
 # --- Pengaturan --- #
 DATA_FILE = 'data/intents_wisata.json'
@@ -54,6 +25,7 @@ MODEL_DIR = 'models/chatbot_intent' # Direktori baru untuk model intent
 MODEL_FILE = os.path.join(MODEL_DIR, 'chatbot_model.h5')
 WORDS_FILE = os.path.join(MODEL_DIR, 'words.pkl')
 CLASSES_FILE = os.path.join(MODEL_DIR, 'classes.pkl')
+NUMPY_MODEL_FILE = os.path.join(MODEL_DIR, 'chatbot_model.npz') # Bobot untuk runtime NumPy
 
 # Buat direktori model jika belum ada
 if not os.path.exists(MODEL_DIR):
@@ -64,7 +36,6 @@ print(f"Memuat data dari {DATA_FILE}...")
 with open(DATA_FILE, 'r', encoding='utf-8') as f:
     intents = json.load(f)
 
-all_words = []
 tags = []
 x_train = [] # Pola kalimat
 y_train = [] # Tag intent
@@ -73,17 +44,12 @@ for intent in intents['intents']:
     tag = intent['tag']
     tags.append(tag)
     for pattern in intent['patterns']:
-        # Tokenisasi setiap kata dalam pola
-        w = nltk.word_tokenize(pattern)
-        all_words.extend(w)
         # Tambahkan pola dan tag ke list training
         x_train.append(pattern)
         y_train.append(tag)
 
-# Stem dan hapus duplikat kata, urutkan
-ignore_words = ['?', '!', '.', ',']
-all_words = [stem(w) for w in all_words if w not in ignore_words]
-all_words = sorted(list(set(all_words)))
+# Kata unik hasil tokenisasi dan stemming (tokenizer yang sama dipakai saat inference), urutkan
+all_words = build_vocabulary(x_train, stem)
 tags = sorted(list(set(tags)))
 
 print(f"Jumlah pattern training: {len(x_train)}")
@@ -99,26 +65,21 @@ with open(CLASSES_FILE, 'wb') as f:
 print("Data preprocessing selesai.")
 
 # --- Membuat Data Training Final --- #
-training_data = []
-output_empty = [0] * len(tags)
-
-for i, pattern in enumerate(x_train):
-    # Buat bag of words untuk setiap pola
-    bag = bag_of_words(pattern, all_words)
-    
-    # Buat array output (one-hot encoding) untuk tag yang sesuai
-    output_row = list(output_empty)
-    output_row[tags.index(y_train[i])] = 1
-    
-    training_data.append([bag, output_row])
+# Bag of words seluruh pola dalam satu kali lewat
+encoder = BagOfWordsEncoder(all_words, stem=stem)
+X = encoder.encode_batch(x_train)
+stem_stats = shared_stemmer.stats()
+print(f"Cache stemming: {stem_stats['cache_size']} kata unik, hit rate {stem_stats['hit_rate']:.1%}")
 
-# Acak data training
-random.shuffle(training_data)
-training_data = np.array(training_data, dtype=object)
+# Array output (one-hot encoding) untuk tag yang sesuai
+tag_index = {tag: i for i, tag in enumerate(tags)}
+y = np.zeros((len(x_train), len(tags)), dtype=np.float32)
+y[np.arange(len(x_train)), [tag_index[tag] for tag in y_train]] = 1
 
-# Pisahkan fitur (X) dan label (y)
-X = np.array(list(training_data[:, 0]))
-y = np.array(list(training_data[:, 1]))
+# Acak data training
+order = np.random.permutation(len(x_train))
+X = X[order]
+y = y[order]
 
 print(f"Shape data training (X): {X.shape}")
 print(f"Shape label training (y): {y.shape}")
@@ -145,6 +106,8 @@ print("Pelatihan selesai.")
 # --- Menyimpan Model dan Data Pendukung --- #
 print(f"Menyimpan model ke {MODEL_FILE}")
 model.save(MODEL_FILE, save_format='h5')
+print(f"Mengekspor bobot untuk runtime NumPy ke {NUMPY_MODEL_FILE}")
+export_keras_model(model, NUMPY_MODEL_FILE)
 
 print("Model dan data pendukung berhasil disimpan.")
 print(f"Kata-kata unik disimpan di: {WORDS_FILE}")
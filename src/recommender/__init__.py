@@ -1,4 +1,7 @@
 from .model import TourismRecommender
+from .fragments import AttractionFragments, parse_fields, compact_json
+from .pagination import paginate, listing_order
+from .cache import ResponseCache, make_cache_key
 from .preprocessing import preprocess_data, calculate_popularity_score
 from .utils import (
     load_csv_data, 
@@ -6,12 +9,21 @@ from .utils import (
     get_available_categories, 
     get_available_provinces, 
     format_recommendation_results,
+    iter_recommendation_results,
+    is_error_result,
     get_attraction_details,
     filter_attractions
 )
 
 __all__ = [
     'TourismRecommender',
+    'AttractionFragments',
+    'parse_fields',
+    'compact_json',
+    'paginate',
+    'listing_order',
+    'ResponseCache',
+    'make_cache_key',
     'preprocess_data',
     'calculate_popularity_score',
     'load_csv_data',
@@ -19,6 +31,8 @@ __all__ = [
     'get_available_categories',
     'get_available_provinces',
     'format_recommendation_results',
+    'iter_recommendation_results',
+    'is_error_result',
     'get_attraction_details',
     'filter_attractions'
 ] 
\ No newline at end of file
@@ -0,0 +1,166 @@
+import json
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Versi format direktori artefak; naikkan jika struktur file berubah
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+
+def save_artifact(recommender, path):
+    """
+    Menyimpan model ke direktori artefak kolumnar:
+
+        manifest.json            versi format, versi model, parameter, daftar kolom
+        columns/<kolom>.npy      kolom numerik
+        columns/<kolom>.data.npy + .offsets.npy
+                                 kolom teks (UTF-8 disambung + offset), kolom list
+                                 disimpan sebagai teks JSON
+        neighbors_*.npy          indeks top-K (atau cosine_sim.npy untuk mode dense)
+        tfidf_vectorizer.joblib, tfidf_matrix.npz
+
+    Semua .npy dapat dibuka dengan mmap_mode sehingga worker berbagi halaman
+    lewat page cache OS. Direktori ditulis ke lokasi sementara lalu di-rename.
+    """
+    path = os.path.normpath(path)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_path, 'columns'))
+
+    columns = {}
+    for column in recommender.df.columns:
+        columns[column] = _save_column(recommender.df[column], os.path.join(tmp_path, 'columns', column))
+
+    arrays = {}
+    if recommender.neighbors is not None:
+        arrays['neighbors_indptr'] = recommender.neighbors.indptr
+        arrays['neighbors_indices'] = recommender.neighbors.indices
+        arrays['neighbors_scores'] = recommender.neighbors.scores
+    if recommender.cosine_sim is not None:
+        arrays['cosine_sim'] = recommender.cosine_sim
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f'{name}.npy'), np.ascontiguousarray(array))
+
+    joblib.dump(recommender.tfidf_vectorizer, os.path.join(tmp_path, 'tfidf_vectorizer.joblib'))
+    if recommender.tfidf_matrix is not None:
+        sparse.save_npz(os.path.join(tmp_path, 'tfidf_matrix.npz'), sparse.csr_matrix(recommender.tfidf_matrix))
+
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model_version': recommender.model_version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'n_rows': len(recommender.df),
+        'similarity_mode': recommender.similarity_mode,
+        'n_neighbors': recommender.neighbors.k if recommender.neighbors is not None else None,
+        'C': float(recommender.C),
+        'm': float(recommender.m),
+        'oov_tokens': recommender.oov_tokens,
+        'total_tokens': recommender.total_tokens,
+        'columns': columns,
+        'arrays': sorted(arrays),
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    # Ganti artefak lama dengan yang baru
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path
+
+
+def load_artifact(path, mmap=True):
+    """
+    Membaca direktori artefak. Mengembalikan (manifest, df, arrays) dengan arrays
+    berupa dict np.ndarray (memory-mapped jika mmap=True). Kolom numerik df
+    dibungkus tanpa salinan sehingga tetap memory-mapped; kolom teks didekode
+    menjadi string Python di setiap proses.
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Manifest artefak tidak ditemukan: {manifest_path}")
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"Versi format artefak {manifest.get('format_version')} tidak didukung "
+            f"(diharapkan {ARTIFACT_FORMAT_VERSION}), silakan latih ulang model"
+        )
+
+    mmap_mode = 'r' if mmap else None
+    # copy=False: kolom numerik tetap menunjuk ke array memory-mapped
+    df = pd.DataFrame({
+        column: _load_column(os.path.join(path, 'columns', column), kind, mmap_mode)
+        for column, kind in manifest['columns'].items()
+    }, copy=False)
+    arrays = {
+        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+        for name in manifest['arrays']
+    }
+    return manifest, df, arrays
+
+
+def load_vectorizer(path):
+    return joblib.load(os.path.join(path, 'tfidf_vectorizer.joblib'))
+
+
+def load_tfidf_matrix(path):
+    matrix_path = os.path.join(path, 'tfidf_matrix.npz')
+    return sparse.load_npz(matrix_path) if os.path.exists(matrix_path) else None
+
+
+def _save_column(series, base_path):
+    """
+    Menyimpan satu kolom dan mengembalikan jenisnya ('numeric', 'string', atau 'json')
+    """
+    if series.dtype.kind in 'biuf':
+        np.save(f'{base_path}.npy', series.to_numpy())
+        return 'numeric'
+
+    values = series.tolist()
+    kind = 'json' if any(isinstance(v, (list, dict)) for v in values) else 'string'
+    encoded = []
+    nulls = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            nulls[i] = True
+            encoded.append(b'')
+        elif kind == 'json':
+            encoded.append(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        else:
+            encoded.append(str(value).encode('utf-8'))
+
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(f'{base_path}.data.npy', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(f'{base_path}.offsets.npy', offsets)
+    np.save(f'{base_path}.nulls.npy', nulls)
+    return kind
+
+
+def _load_column(base_path, kind, mmap_mode):
+    if kind == 'numeric':
+        return np.load(f'{base_path}.npy', mmap_mode=mmap_mode)
+
+    data = np.load(f'{base_path}.data.npy', mmap_mode=mmap_mode)
+    offsets = np.load(f'{base_path}.offsets.npy')
+    nulls = np.load(f'{base_path}.nulls.npy')
+    raw = data.tobytes()
+
+    values = []
+    for i, is_null in enumerate(nulls):
+        if is_null:
+            values.append(np.nan)
+            continue
+        text = raw[offsets[i]:offsets[i + 1]].decode('utf-8')
+        values.append(json.loads(text) if kind == 'json' else text)
+    return values
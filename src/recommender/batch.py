@@ -0,0 +1,122 @@
+import numpy as np
+
+QUERY_TYPES = ('content', 'popularity', 'location', 'hybrid')
+# Parameter query yang harus berupa teks
+TEXT_FIELDS = ('name', 'category', 'province')
+
+
+class SharedLookups:
+    """
+    Memo lookup indeks yang dipakai bersama oleh seluruh query dalam satu batch:
+    satu lookup facet per kombinasi (kategori, provinsi) dan satu query radius
+    per titik koordinat.
+    """
+
+    def __init__(self, recommender):
+        self.recommender = recommender
+        self._facets = {}
+        self._geo = {}
+        self._geo_radius = {}
+
+    def reserve_radius(self, lat, lon, max_distance):
+        """
+        Mencatat radius terbesar yang dibutuhkan untuk satu titik sebelum eksekusi,
+        sehingga titik tersebut cukup di-query sekali
+        """
+        key = (lat, lon)
+        self._geo_radius[key] = max(self._geo_radius.get(key, 0), max_distance)
+
+    def facet_rows(self, category=None, province=None):
+        key = (category.lower() if category else None, province.lower() if province else None)
+        if key not in self._facets:
+            self._facets[key] = self.recommender.facet_index.lookup(category=category, province=province)
+        return self._facets[key]
+
+    def geo_hits(self, lat, lon, max_distance, top_n=None):
+        """
+        Mengembalikan (row_ids, jarak_km) dalam radius max_distance, terurut dari
+        yang terdekat, diiris dari hasil query radius terbesar untuk titik tersebut
+        """
+        key = (lat, lon)
+        cached = self._geo.get(key)
+        if cached is None or cached[0] < max_distance:
+            radius = max(self._geo_radius.get(key, 0), max_distance)
+            self._geo[key] = (radius,) + self.recommender.geo_index.radius_query(lat, lon, radius)
+            cached = self._geo[key]
+
+        _, row_ids, distances = cached
+        end = np.searchsorted(distances, max_distance, side='right')
+        if top_n is not None:
+            end = min(end, top_n)
+        return row_ids[:end], distances[:end]
+
+
+def run_batch(recommender, queries):
+    """
+    Menjalankan daftar query rekomendasi heterogen terhadap satu model.
+
+    Setiap query berupa dict dengan kunci 'type' (content, popularity, location,
+    hybrid) dan parameter yang sama dengan endpoint tunggalnya (name, category,
+    province, lat, lon, max_distance, limit). Hasil per query berupa DataFrame
+    atau string pesan kesalahan, dengan urutan yang sama dengan input.
+    """
+    lookups = SharedLookups(recommender)
+
+    # Catat radius terbesar per titik agar setiap titik cukup di-query sekali
+    for query in queries:
+        if isinstance(query, dict) and query.get('lat') is not None and query.get('lon') is not None:
+            try:
+                lookups.reserve_radius(float(query['lat']), float(query['lon']), float(query.get('max_distance', 50)))
+            except (TypeError, ValueError):
+                pass
+
+    results = []
+    for query in queries:
+        try:
+            results.append(_run_query(recommender, query, lookups))
+        except (TypeError, ValueError) as e:
+            results.append(str(e))
+    return results
+
+
+def _run_query(recommender, query, lookups):
+    if not isinstance(query, dict):
+        raise ValueError("Setiap query harus berupa objek JSON")
+
+    query_type = query.get('type')
+    if query_type not in QUERY_TYPES:
+        raise ValueError(f"Tipe query tidak dikenal: {query_type}. Gunakan salah satu dari {', '.join(QUERY_TYPES)}")
+
+    for field in TEXT_FIELDS:
+        if query.get(field) is not None and not isinstance(query[field], str):
+            raise ValueError(f"Parameter '{field}' harus berupa teks")
+
+    top_n = int(query.get('limit', 10))
+    lat = float(query['lat']) if query.get('lat') is not None else None
+    lon = float(query['lon']) if query.get('lon') is not None else None
+    max_distance = float(query.get('max_distance', 50))
+
+    if query_type == 'content':
+        if not query.get('name'):
+            raise ValueError("Parameter 'name' harus diberikan")
+        return recommender.content_based_recommendations(query['name'], top_n=top_n)
+
+    if query_type == 'popularity':
+        return recommender.popularity_based_recommendations(
+            query.get('category'), query.get('province'), top_n=top_n, lookups=lookups)
+
+    if query_type == 'location':
+        if lat is None or lon is None:
+            raise ValueError("Parameter 'lat' dan 'lon' harus diberikan")
+        return recommender.location_based_recommendations(lat, lon, max_distance, top_n=top_n, lookups=lookups)
+
+    return recommender.hybrid_recommendations(
+        name=query.get('name'),
+        lat=lat,
+        lon=lon,
+        category=query.get('category'),
+        province=query.get('province'),
+        max_distance=max_distance,
+        top_n=top_n,
+        lookups=lookups
+    )
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_cache_key(model_version, method, **params):
+    """
+    Kunci cache dari versi model, nama metode, dan parameter yang dinormalisasi:
+    teks di-strip dan di-lowercase (nama juga dicocokkan tanpa membedakan huruf
+    besar/kecil oleh model), koordinat dibulatkan ke 6 desimal (~0.1 m), dan teks
+    kosong dianggap sama dengan None
+    """
+    normalized = []
+    for name in sorted(params):
+        value = params[name]
+        if isinstance(value, str):
+            value = value.strip().lower() or None
+        elif isinstance(value, float):
+            value = round(value, 6)
+        normalized.append((name, value))
+    return (model_version, method, tuple(normalized))
+
+
+class ResponseCache:
+    """
+    Cache LRU in-process dengan batas jumlah entri (max_size) dan umur entri
+    (ttl, detik). Aman dipakai bersama oleh beberapa thread worker.
+
+    Kunci sebaiknya menyertakan versi model (lihat make_cache_key) sehingga hasil
+    dari model lama tidak pernah terpakai; clear() dipanggil saat model diganti
+    untuk membebaskan memorinya.
+    """
+
+    def __init__(self, max_size=1024, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Mengembalikan (True, nilai) jika kunci ada dan belum kedaluwarsa,
+        selain itu (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if self.ttl is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, should_cache=None):
+        """
+        Mengembalikan nilai dari cache, atau menghitungnya dengan compute() lalu
+        menyimpannya. Exception dari compute() tidak disimpan, begitu juga nilai
+        yang ditolak should_cache(nilai) (misalnya hasil error).
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        if should_cache is None or should_cache(value):
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Counter untuk menentukan ukuran cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
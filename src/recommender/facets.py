@@ -0,0 +1,128 @@
+import ast
+
+import numpy as np
+
+
+class FacetIndex:
+    """
+    Indeks facet untuk filter kategori, provinsi, dan rating.
+
+    Kategori, provinsi (lowercase), dan nilai rating masing-masing dipetakan ke
+    array posisi baris (int32, terurut naik); nilai rating yang ada disimpan
+    terurut sehingga filter rentang cukup dengan binary search atas nilai unik.
+    Kombinasi filter menggunakan irisan himpunan. Posisi yang dikembalikan adalah
+    posisi (iloc) pada DataFrame asal.
+    """
+
+    def __init__(self, df):
+        self.n_rows = 0
+        self.categories = {}
+        self.provinces = {}
+        self.ratings = {}
+        self.rating_keys = np.empty(0, dtype=np.float64)
+        # Nilai facet terakhir per baris, agar perubahan hanya menyentuh kunci lama dan baru
+        self.row_categories = {}
+        self.row_provinces = {}
+        self.row_ratings = {}
+        self.update_rows(df, np.arange(len(df)))
+
+    def update_rows(self, df, rows):
+        """
+        Memperbarui indeks untuk posisi baris yang baru ditambahkan atau diubah di df.
+        Hanya array milik kunci facet lama dan baru dari baris tersebut yang diubah.
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int32))
+        self.n_rows = len(df)
+        subset = df.iloc[rows]
+
+        if 'kategori_list' in subset.columns:
+            category_lists = subset['kategori_list']
+        else:
+            category_lists = subset['kategori'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else [])
+
+        categories = []
+        for cats in category_lists:
+            if not isinstance(cats, list):
+                cats = []
+            categories.append(tuple(sorted(set(c.lower() for c in cats if isinstance(c, str)))))
+        provinces = [(p.lower(),) if isinstance(p, str) else () for p in subset['provinsi']]
+        ratings = [() if np.isnan(r) else (float(r),) for r in subset['rating'].to_numpy(dtype=np.float64)]
+
+        self._update_facet(self.categories, self.row_categories, rows, categories)
+        self._update_facet(self.provinces, self.row_provinces, rows, provinces)
+        if self._update_facet(self.ratings, self.row_ratings, rows, ratings):
+            self.rating_keys = np.array(sorted(self.ratings), dtype=np.float64)
+        return self
+
+    @staticmethod
+    def _update_facet(facet, row_keys, rows, new_keys):
+        """
+        Memindahkan baris dari kunci lamanya ke kunci barunya; mengembalikan True
+        jika himpunan kunci facet berubah
+        """
+        removed = {}
+        added = {}
+        for row, keys in zip(rows.tolist(), new_keys):
+            old_keys = row_keys.get(row, ())
+            if old_keys == keys:
+                continue
+            for key in old_keys:
+                removed.setdefault(key, []).append(row)
+            for key in keys:
+                added.setdefault(key, []).append(row)
+            if keys:
+                row_keys[row] = keys
+            else:
+                row_keys.pop(row, None)
+
+        keys_changed = False
+        for key in removed.keys() | added.keys():
+            members = facet.get(key, np.empty(0, dtype=np.int32))
+            if key in removed:
+                members = np.setdiff1d(members, np.asarray(removed[key], dtype=np.int32), assume_unique=True)
+            if key in added:
+                members = np.union1d(members, np.asarray(added[key], dtype=np.int32))
+            if len(members):
+                keys_changed |= key not in facet
+                facet[key] = members.astype(np.int32)
+            elif key in facet:
+                del facet[key]
+                keys_changed = True
+        return keys_changed
+
+    def category(self, category):
+        return self.categories.get(category.lower(), np.empty(0, dtype=np.int32))
+
+    def province(self, province):
+        return self.provinces.get(province.lower(), np.empty(0, dtype=np.int32))
+
+    def rating_range(self, min_rating=None, max_rating=None):
+        start = 0 if min_rating is None else np.searchsorted(self.rating_keys, min_rating, side='left')
+        end = len(self.rating_keys) if max_rating is None else np.searchsorted(self.rating_keys, max_rating, side='right')
+        if start >= end:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate([self.ratings[key] for key in self.rating_keys[start:end].tolist()]))
+
+    def lookup(self, category=None, province=None, min_rating=None, max_rating=None):
+        """
+        Mengembalikan posisi baris (terurut naik) yang memenuhi semua filter
+        """
+        row_sets = []
+        if category:
+            row_sets.append(self.category(category))
+        if province:
+            row_sets.append(self.province(province))
+        if min_rating is not None or max_rating is not None:
+            row_sets.append(self.rating_range(min_rating, max_rating))
+
+        if not row_sets:
+            return np.arange(self.n_rows, dtype=np.int32)
+
+        # Mulai dari himpunan terkecil agar irisan semurah mungkin
+        row_sets.sort(key=len)
+        rows = row_sets[0]
+        for other in row_sets[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
@@ -0,0 +1,210 @@
+import ast
+import json
+import re
+
+import numpy as np
+
+# Pola koordinat pada URL Google Maps (format: !3d{lat}!4d{lon})
+URL_COORDINATES = re.compile(r'!3d([\d.-]+)!4d([\d.-]+)')
+
+
+def _json_default(value):
+    # Skalar numpy (misalnya skor float32) diserialisasi sebagai angka Python
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def compact_json(value):
+    """
+    Serialisasi JSON ringkas (tanpa spasi, UTF-8 apa adanya) yang dipakai bersama
+    oleh fragmen tempat wisata dan semua respons streaming NDJSON
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def _clean(value):
+    """
+    NaN/None menjadi None agar hasil serialisasi tetap JSON yang valid
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value
+
+
+def _parse_rating(rating):
+    if isinstance(rating, str):
+        try:
+            return round(float(rating.replace(",", ".")), 1)
+        except ValueError:
+            return None
+    if isinstance(rating, (int, float)) and not np.isnan(rating):
+        return round(float(rating), 1)
+    return None
+
+
+def _parse_review_count(jumlah_review):
+    if isinstance(jumlah_review, str):
+        try:
+            return int(jumlah_review.replace(".", ""))
+        except ValueError:
+            return None
+    if isinstance(jumlah_review, (int, float)) and not np.isnan(jumlah_review):
+        return int(jumlah_review)
+    return None
+
+
+def _parse_coordinates(koordinat, url):
+    """
+    Koordinat dari kolom 'koordinat' (dict atau string dict), dengan fallback ke URL
+    """
+    if isinstance(koordinat, str):
+        try:
+            koordinat = ast.literal_eval(koordinat)
+        except (ValueError, SyntaxError):
+            koordinat = None
+
+    if isinstance(koordinat, dict):
+        try:
+            return {
+                "latitude": float(koordinat['latitude']) if koordinat.get('latitude') is not None else None,
+                "longitude": float(koordinat['longitude']) if koordinat.get('longitude') is not None else None
+            }
+        except (TypeError, ValueError):
+            pass
+
+    if isinstance(url, str):
+        coords = URL_COORDINATES.findall(url)
+        if coords:
+            lat, lon = coords[0]
+            return {"latitude": float(lat), "longitude": float(lon)}
+    return {"latitude": None, "longitude": None}
+
+
+def _parse_categories(row):
+    """
+    Daftar kategori tanpa tanda kutip, elemen kosong, dan duplikat
+    """
+    kategori = row.get('kategori_list')
+    if not isinstance(kategori, list):
+        kategori = row.get('kategori', [])
+
+    if isinstance(kategori, str):
+        try:
+            kategori = ast.literal_eval(kategori)
+        except (ValueError, SyntaxError):
+            kategori = [k.strip().strip("'").strip('"') for k in kategori.strip('[]').split(',')]
+    if not isinstance(kategori, list):
+        return []
+
+    kategori = [k.strip("'").strip('"') if isinstance(k, str) else str(k) for k in kategori]
+    return list(dict.fromkeys(k for k in kategori if k))
+
+
+def _parse_photo(foto):
+    if isinstance(foto, str):
+        return foto
+    if isinstance(foto, list) and len(foto) > 0:
+        return foto[0]
+    return None
+
+
+# Field yang tersedia untuk proyeksi (parameter fields=)
+ATTRACTION_FIELDS = ('id', 'nama', 'deskripsi', 'provinsi', 'rating', 'jumlah_review', 'foto', 'koordinat', 'kategori')
+
+
+def parse_fields(fields):
+    """
+    Mengubah "nama,koordinat" menjadi tuple field (id selalu disertakan), atau
+    None jika fields kosong. ValueError jika ada field yang tidak dikenal.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in requested if f not in ATTRACTION_FIELDS]
+    if unknown:
+        raise ValueError(f"Field tidak dikenal: {', '.join(unknown)}. Pilihan: {', '.join(ATTRACTION_FIELDS)}")
+    return tuple(dict.fromkeys(['id'] + requested))
+
+
+def format_attraction(row):
+    """
+    Normalisasi satu baris DataFrame menjadi dict untuk respons API
+    (koordinat, kategori, rating, jumlah_review, dan foto sudah dalam bentuk akhir)
+    """
+    deskripsi = _clean(row.get('deskripsi'))
+    if not deskripsi or deskripsi == "N/A":
+        deskripsi = f"{row['nama']} adalah sebuah tempat wisata yang terletak di {row.get('alamat')}. Tempat ini menawarkan berbagai pengalaman menarik bagi pengunjung."
+
+    attraction_id = _clean(row.get('id'))
+    return {
+        "id": int(attraction_id) if attraction_id is not None else None,
+        "nama": row['nama'],
+        "deskripsi": deskripsi,
+        "provinsi": _clean(row.get('provinsi')),
+        "rating": _parse_rating(row.get('rating')),
+        "jumlah_review": _parse_review_count(row.get('jumlah_review')),
+        "foto": _parse_photo(row.get('foto')),
+        "koordinat": _parse_coordinates(row.get('koordinat'), row.get('url')),
+        "kategori": _parse_categories(row)
+    }
+
+
+class AttractionFragments:
+    """
+    Cache fragmen JSON per tempat wisata, dibangun sekali saat model dimuat.
+
+    Setiap baris dinormalisasi (format_attraction) lalu diserialisasi satu kali;
+    respons daftar cukup menyambung fragmen milik id yang cocok tanpa pekerjaan
+    Python per baris. model_version dicatat agar cache dapat dibangun ulang saat
+    model berubah.
+    """
+
+    def __init__(self, df, model_version=None):
+        self.model_version = model_version
+        self.records = {}
+        self.fragments = {}
+        for row in df.to_dict('records'):
+            record = format_attraction(row)
+            self.records[record['id']] = record
+            self.fragments[record['id']] = compact_json(record)
+
+    def __len__(self):
+        return len(self.fragments)
+
+    def get(self, attraction_id):
+        """
+        Fragmen JSON untuk satu id, atau None jika tidak ada
+        """
+        return self.fragments.get(attraction_id)
+
+    def list_json(self, attraction_ids, fields=None):
+        """
+        Array JSON dari fragmen milik attraction_ids (urutan dipertahankan).
+        Jika fields (lihat parse_fields) diberikan, hanya field tersebut yang
+        diserialisasi untuk baris-baris ini.
+        """
+        if fields is not None:
+            records = self.records
+            projected = [{f: records[i][f] for f in fields} for i in attraction_ids if i in records]
+            return compact_json(projected)
+
+        fragments = self.fragments
+        return '[' + ','.join(fragments[i] for i in attraction_ids if i in fragments) + ']'
+
+    def iter_ndjson(self, attraction_ids, fields=None):
+        """
+        Generator NDJSON (satu objek JSON per baris) untuk attraction_ids;
+        baris diserialisasi satu per satu saat dikirim
+        """
+        if fields is not None:
+            records = self.records
+            for i in attraction_ids:
+                if i in records:
+                    yield compact_json({f: records[i][f] for f in fields}) + '\n'
+            return
+
+        fragments = self.fragments
+        for i in attraction_ids:
+            if i in fragments:
+                yield fragments[i] + '\n'
@@ -0,0 +1,48 @@
+import numpy as np
+
+from .scoring import top_n_positions
+
+# Bobot setiap komponen pada skor hybrid
+HYBRID_WEIGHTS = {
+    'similarity': 0.4,
+    'distance': 0.3,
+    'popularity': 0.3,
+}
+
+
+def fuse_scores(components, top_n=10, weights=HYBRID_WEIGHTS):
+    """
+    Menggabungkan skor beberapa komponen rekomendasi menjadi skor hybrid.
+
+    components berisi {nama_komponen: (row_ids, skor)}. Semua kandidat disatukan
+    menjadi satu vektor row_id terurut; skor setiap komponen disebar ke vektor
+    yang sejajar (kandidat yang tidak dimiliki komponen bernilai 0), dinormalisasi
+    min-max, lalu dijumlahkan dengan bobotnya. Satu kandidat yang muncul di
+    beberapa komponen mendapat kontribusi dari semuanya.
+
+    Alokasi per panggilan hanya O(C) dengan C = jumlah kandidat gabungan:
+    vektor row_id gabungan, vektor skor hybrid, satu buffer komponen yang dipakai
+    ulang, dan posisi hasil searchsorted per komponen. Tidak ada DataFrame.
+
+    Mengembalikan (row_ids, skor_hybrid) top_n, terurut menurun.
+    """
+    components = {name: value for name, value in components.items() if len(value[0]) > 0}
+    if not components:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    candidates = np.unique(np.concatenate([row_ids for row_ids, _ in components.values()]))
+    hybrid = np.zeros(len(candidates), dtype=np.float64)
+    buffer = np.empty(len(candidates), dtype=np.float64)
+
+    for name, (row_ids, scores) in components.items():
+        buffer.fill(0)
+        buffer[np.searchsorted(candidates, row_ids)] = np.nan_to_num(scores, nan=0.0)
+
+        lowest, highest = buffer.min(), buffer.max()
+        if highest > lowest:
+            buffer -= lowest
+            buffer *= weights[name] / (highest - lowest)
+            hybrid += buffer
+
+    top = top_n_positions(hybrid, top_n)
+    return candidates[top], hybrid[top]
@@ -2,11 +2,21 @@ import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
+from scipy import sparse
 import joblib
 import os
+import uuid
 
-from .preprocessing import preprocess_data, calculate_popularity_score
+from .preprocessing import preprocess_data, calculate_popularity_score, TextPreprocessor
+from .neighbors import TopKNeighbors
+from .spatial import GeoGridIndex, haversine_km, grid_clusters, zoom_cell_size, CLUSTER_MAX_ZOOM
+from .scoring import popularity_parameters, weighted_rating, top_n_positions
+from .hybrid import fuse_scores
+from .facets import FacetIndex
+from .search import SearchIndex
+from .names import NameIndex
+from .batch import run_batch
+from . import artifact
 
 class TourismRecommender:
     """
@@ -14,14 +24,56 @@ class TourismRecommender:
     popularity-based, dan location-based filtering
     """
     
-    def __init__(self):
+    def __init__(self, similarity_mode='topk', n_neighbors=100, chunk_size=512, refit_threshold=0.2, n_jobs=1,
+                 neighbor_backend='exact', n_clusters=None, n_probe=8):
+        """
+        similarity_mode: 'topk' menyimpan hanya n_neighbors tetangga terdekat per
+        tempat wisata (dihitung per blok sebanyak chunk_size baris), sedangkan
+        'dense' menyimpan matriks cosine similarity N x N secara penuh.
+        neighbor_backend (mode 'topk'): 'exact' membandingkan semua pasangan baris,
+        'ivf' mencari tetangga secara aproksimasi lewat n_clusters cluster k-means
+        dan memeriksa n_probe cluster terdekat (n_probe lebih besar = recall lebih
+        tinggi, fit lebih lambat; lihat benchmarks.bench_ann).
+        refit_threshold: proporsi token di luar vocabulary TF-IDF (sejak fit terakhir)
+        yang membuat add_attractions/update_attractions menjadwalkan fit() ulang.
+        n_jobs: jumlah proses untuk preprocessing teks (-1 = semua CPU).
+        """
+        if similarity_mode not in ('topk', 'dense'):
+            raise ValueError("similarity_mode harus 'topk' atau 'dense'")
+        if neighbor_backend not in ('exact', 'ivf'):
+            raise ValueError("neighbor_backend harus 'exact' atau 'ivf'")
+        
+        self.similarity_mode = similarity_mode
+        self.n_neighbors = n_neighbors
+        self.chunk_size = chunk_size
+        self.neighbor_backend = neighbor_backend
+        self.n_clusters = n_clusters
+        self.n_probe = n_probe
+        self.n_jobs = n_jobs
+        # Preprocessor teks dipakai ulang oleh fit dan add/update (cache stemming bersama),
+        # dibuat saat pertama dibutuhkan agar load_model tidak memuat stopwords
+        self._preprocessor = None
+        self.refit_threshold = refit_threshold
+        
         self.df = None
         self.df_popular = None
         self.cosine_sim = None
+        self.neighbors = None
+        self.geo_index = None
+        self.popularity_scores = None
+        self.facet_index = None
+        self.search_index = None
+        self.name_index = None
         self.indices = None
         self.tfidf_vectorizer = None
+        self.tfidf_matrix = None
         self.C = None
         self.m = None
+        self.oov_tokens = 0
+        self.total_tokens = 0
+        self.refit_scheduled = False
+        self.model_version = None
+        self.artifact_path = None
         self.model_loaded = False
     
     def fit(self, df):
@@ -29,7 +81,7 @@ class TourismRecommender:
         Melatih model rekomendasi dengan dataset tempat wisata
         """
         # Preprocess data
-        self.df = preprocess_data(df)
+        self.df = preprocess_data(df, self.preprocessor, n_jobs=self.n_jobs)
         
         # Hitung popularity score
         self.df_popular = calculate_popularity_score(self.df)
@@ -37,9 +89,25 @@ class TourismRecommender:
         # Buat TF-IDF Vectorizer
         self.tfidf_vectorizer = TfidfVectorizer(stop_words='english')
         tfidf_matrix = self.tfidf_vectorizer.fit_transform(self.df['combined_features'])
+        self.tfidf_matrix = tfidf_matrix
         
-        # Hitung cosine similarity
-        self.cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+        # Vocabulary baru, reset pencatatan drift
+        self.oov_tokens = 0
+        self.total_tokens = 0
+        self.refit_scheduled = False
+        
+        # Hitung cosine similarity (penuh atau hanya top-K tetangga)
+        if self.similarity_mode == 'dense':
+            self.cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+            self.neighbors = None
+        else:
+            if self.neighbor_backend == 'ivf':
+                self.neighbors = TopKNeighbors.build_ivf(
+                    tfidf_matrix, k=self.n_neighbors, n_clusters=self.n_clusters,
+                    n_probe=self.n_probe, chunk_size=self.chunk_size)
+            else:
+                self.neighbors = TopKNeighbors.build(tfidf_matrix, k=self.n_neighbors, chunk_size=self.chunk_size)
+            self.cosine_sim = None
         
         # Buat indeks berdasarkan nama tempat wisata
         self.indices = pd.Series(self.df.index, index=self.df['nama']).drop_duplicates()
@@ -48,17 +116,47 @@ class TourismRecommender:
         self.C = self.df['rating'].mean()
         self.m = self.df['jumlah_review'].quantile(0.90)
         
+        self._build_indexes()
+        self.model_version = uuid.uuid4().hex[:12]
+        self.artifact_path = None
         self.model_loaded = True
         
         return self
     
+    @property
+    def preprocessor(self):
+        if self._preprocessor is None:
+            self._preprocessor = TextPreprocessor()
+        return self._preprocessor
+    
+    def _build_indexes(self):
+        """
+        Membangun indeks pendukung query yang tidak disimpan di file model
+        """
+        self.geo_index = GeoGridIndex(self.df['latitude'].to_numpy(), self.df['longitude'].to_numpy())
+        self.facet_index = FacetIndex(self.df)
+        self.search_index = SearchIndex(self.df)
+        self.name_index = NameIndex(self.df['nama'])
+        
+        # Skor popularitas global (C dan m dari data penuh) untuk semua baris sekaligus
+        ratings = self.df['rating'].to_numpy(dtype=np.float64)
+        reviews = self.df['jumlah_review'].to_numpy(dtype=np.float64)
+        if self.C is None or self.m is None:
+            self.C, self.m = popularity_parameters(ratings, reviews)
+        self.popularity_scores = weighted_rating(ratings, reviews, self.C, self.m)
+    
     def save_model(self, path="../models/recommendation_model.joblib"):
         """
-        Menyimpan model ke file
+        Menyimpan model ke file. Path berakhiran .joblib disimpan sebagai satu file
+        joblib (format lama), selain itu sebagai direktori artefak kolumnar yang bisa
+        di-memory-map (lihat artifact.save_artifact).
         """
         if not self.model_loaded:
             raise ValueError("Model belum dilatih, silakan latih model terlebih dahulu dengan metode fit()")
         
+        if not path.endswith('.joblib'):
+            return artifact.save_artifact(self, path)
+        
         # Buat direktori jika belum ada
         os.makedirs(os.path.dirname(path), exist_ok=True)
         
@@ -67,10 +165,13 @@ class TourismRecommender:
             'df': self.df,
             'df_popular': self.df_popular,
             'cosine_sim': self.cosine_sim,
+            'neighbors': self.neighbors,
             'indices': self.indices,
             'tfidf_vectorizer': self.tfidf_vectorizer,
+            'tfidf_matrix': self.tfidf_matrix,
             'C': self.C,
-            'm': self.m
+            'm': self.m,
+            'model_version': self.model_version
         }
         
         # Simpan model
@@ -78,40 +179,231 @@ class TourismRecommender:
         
         return path
     
-    def load_model(self, path="../models/recommendation_model.joblib"):
+    def load_model(self, path="../models/recommendation_model.joblib", mmap=True):
         """
-        Memuat model dari file
+        Memuat model dari file joblib atau direktori artefak kolumnar.
+        Untuk direktori artefak, array besar dibuka dengan mmap_mode jika mmap=True.
         """
+        if os.path.isdir(path) or not path.endswith('.joblib'):
+            return self._load_artifact(path, mmap=mmap)
+        
         # Load model
         model_data = joblib.load(path)
         
         # Ekstrak komponen model
         self.df = model_data['df']
         self.df_popular = model_data['df_popular']
-        self.cosine_sim = model_data['cosine_sim']
+        # Model lama hanya memiliki cosine_sim, model baru bisa hanya memiliki neighbors
+        self.cosine_sim = model_data.get('cosine_sim')
+        self.neighbors = model_data.get('neighbors')
+        self.similarity_mode = 'dense' if self.neighbors is None else 'topk'
         self.indices = model_data['indices']
         self.tfidf_vectorizer = model_data['tfidf_vectorizer']
+        self.tfidf_matrix = model_data.get('tfidf_matrix')
         self.C = model_data['C']
         self.m = model_data['m']
+        self.model_version = model_data.get('model_version') or uuid.uuid4().hex[:12]
+        self.artifact_path = None
         
+        self._build_indexes()
         self.model_loaded = True
         
         return self
     
+    def _load_artifact(self, path, mmap=True):
+        """
+        Memuat model dari direktori artefak kolumnar
+        """
+        manifest, df, arrays = artifact.load_artifact(path, mmap=mmap)
+        
+        self.df = df
+        self.similarity_mode = manifest['similarity_mode']
+        if 'neighbors_indptr' in arrays:
+            self.neighbors = TopKNeighbors(
+                arrays['neighbors_indptr'], arrays['neighbors_indices'], arrays['neighbors_scores'],
+                k=manifest['n_neighbors'])
+            self.n_neighbors = manifest['n_neighbors']
+        else:
+            self.neighbors = None
+        self.cosine_sim = arrays.get('cosine_sim')
+        self.indices = pd.Series(self.df.index, index=self.df['nama']).drop_duplicates()
+        self.tfidf_vectorizer = artifact.load_vectorizer(path)
+        # Matriks TF-IDF hanya dibutuhkan untuk add/update, dimuat saat diperlukan
+        self.tfidf_matrix = None
+        self.C = manifest['C']
+        self.m = manifest['m']
+        self.oov_tokens = manifest.get('oov_tokens', 0)
+        self.total_tokens = manifest.get('total_tokens', 0)
+        self.refit_scheduled = self.vocabulary_drift > self.refit_threshold
+        self.model_version = manifest['model_version']
+        self.artifact_path = path
+        
+        self._build_indexes()
+        # df_popular adalah df beserta skor popularitasnya, tidak disimpan terpisah;
+        # salinan dangkal agar kolom memory-mapped tidak disalin ke heap
+        self.df_popular = self.df.copy(deep=False)
+        self.df_popular['popularity_score'] = self.popularity_scores
+        self.model_loaded = True
+        
+        return self
+    
+    @property
+    def vocabulary_drift(self):
+        """
+        Proporsi token data yang ditambahkan/diubah sejak fit terakhir yang tidak
+        dikenal oleh TF-IDF vectorizer
+        """
+        return self.oov_tokens / self.total_tokens if self.total_tokens else 0.0
+    
+    def add_attractions(self, new_df):
+        """
+        Menambahkan tempat wisata baru tanpa melatih ulang seluruh model.
+        
+        Baris baru diproses dengan vectorizer yang sudah ada, lalu daftar tetangga,
+        skor popularitas (C dan m), lookup nama, dan indeks facet/lokasi diperbarui.
+        Similarity hanya dihitung untuk baris baru terhadap katalog.
+        """
+        if not self.model_loaded:
+            raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
+        
+        n_old = len(self.df)
+        processed = preprocess_data(new_df, self.preprocessor, n_jobs=self.n_jobs)
+        processed.index = pd.RangeIndex(n_old, n_old + len(processed))
+        
+        self.df = pd.concat([self.df, processed])
+        self.indices = pd.concat([self.indices, pd.Series(processed.index, index=processed['nama'])])
+        self.indices = self.indices[~self.indices.index.duplicated(keep='first')]
+        
+        new_matrix = self._transform_new_rows(processed)
+        self.tfidf_matrix = sparse.vstack([self._current_tfidf_matrix(n_old), new_matrix]).tocsr()
+        
+        changed_rows = np.arange(n_old, len(self.df))
+        self._apply_row_changes(changed_rows, popular_rows=processed)
+        return self._ingest_summary(added=len(processed))
+    
+    def update_attractions(self, updated_df):
+        """
+        Memperbarui tempat wisata yang sudah ada (dicocokkan lewat kolom 'id')
+        tanpa melatih ulang seluruh model
+        """
+        if not self.model_loaded:
+            raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
+        
+        positions = pd.Index(self.df['id']).get_indexer(updated_df['id'])
+        if (positions < 0).any():
+            missing = updated_df['id'][positions < 0].tolist()
+            raise ValueError(f"Tempat wisata dengan id {missing} tidak ditemukan, gunakan add_attractions()")
+        
+        n_rows = len(self.df)
+        processed = preprocess_data(updated_df, self.preprocessor, n_jobs=self.n_jobs)
+        processed.index = self.df.index[positions]
+        
+        # Ganti baris lama dengan baris baru tanpa mengubah urutan posisi
+        order = np.arange(n_rows)
+        order[positions] = n_rows + np.arange(len(positions))
+        self.df = pd.concat([self.df, processed]).iloc[order]
+        self.indices = pd.Series(self.df.index, index=self.df['nama']).drop_duplicates()
+        
+        new_matrix = self._transform_new_rows(processed)
+        self.tfidf_matrix = sparse.vstack([self._current_tfidf_matrix(n_rows), new_matrix]).tocsr()[order]
+        
+        self._apply_row_changes(positions, popular_rows=processed, popular_positions=positions)
+        return self._ingest_summary(updated=len(processed))
+    
+    def refit(self):
+        """
+        Melatih ulang model secara penuh dari katalog saat ini (misalnya setelah
+        refit_scheduled bernilai True)
+        """
+        return self.fit(self.df.reset_index(drop=True))
+    
+    def _current_tfidf_matrix(self, n_rows):
+        """
+        Matriks TF-IDF katalog lama; model lama yang belum menyimpannya dihitung ulang sekali
+        """
+        if self.tfidf_matrix is None and self.artifact_path is not None:
+            self.tfidf_matrix = artifact.load_tfidf_matrix(self.artifact_path)
+        if self.tfidf_matrix is None:
+            self.tfidf_matrix = self.tfidf_vectorizer.transform(self.df['combined_features'].iloc[:n_rows])
+        return self.tfidf_matrix
+    
+    def _transform_new_rows(self, processed):
+        """
+        Transformasi baris baru dengan vectorizer yang ada sambil mencatat drift vocabulary
+        """
+        analyzer = self.tfidf_vectorizer.build_analyzer()
+        vocabulary = self.tfidf_vectorizer.vocabulary_
+        for text in processed['combined_features']:
+            tokens = analyzer(text)
+            self.total_tokens += len(tokens)
+            self.oov_tokens += sum(1 for token in tokens if token not in vocabulary)
+        
+        if self.vocabulary_drift > self.refit_threshold:
+            self.refit_scheduled = True
+        
+        return self.tfidf_vectorizer.transform(processed['combined_features'])
+    
+    def _apply_row_changes(self, changed_rows, popular_rows, popular_positions=None):
+        """
+        Memperbarui similarity, skor popularitas, dan indeks untuk baris yang berubah
+        """
+        if self.neighbors is not None:
+            self.neighbors.update(self.tfidf_matrix, changed_rows, chunk_size=self.chunk_size)
+        else:
+            # Mode dense: perbesar matriks lalu isi ulang baris/kolom yang berubah
+            n_rows = len(self.df)
+            n_old = self.cosine_sim.shape[0]
+            cosine_sim = np.zeros((n_rows, n_rows), dtype=self.cosine_sim.dtype)
+            cosine_sim[:n_old, :n_old] = self.cosine_sim
+            block = cosine_similarity(self.tfidf_matrix[changed_rows], self.tfidf_matrix)
+            cosine_sim[changed_rows, :] = block
+            cosine_sim[:, changed_rows] = block.T
+            self.cosine_sim = cosine_sim
+        
+        # C (rata-rata) dan m (kuantil 90%) bergantung pada seluruh data, sehingga
+        # skor popularitas semua baris dihitung ulang (O(N), operasi array), seperti
+        # halnya penyambungan df/df_popular
+        ratings = self.df['rating'].to_numpy(dtype=np.float64)
+        reviews = self.df['jumlah_review'].to_numpy(dtype=np.float64)
+        self.C, self.m = popularity_parameters(ratings, reviews)
+        self.popularity_scores = weighted_rating(ratings, reviews, self.C, self.m)
+        
+        # Jaga df_popular tetap sejajar dengan df
+        popular_rows = popular_rows.copy()
+        if popular_positions is None:
+            self.df_popular = pd.concat([self.df_popular, popular_rows])
+        else:
+            popular_rows.index = self.df_popular.index[popular_positions]
+            n_rows = len(self.df_popular)
+            order = np.arange(n_rows)
+            order[popular_positions] = n_rows + np.arange(len(popular_positions))
+            self.df_popular = pd.concat([self.df_popular, popular_rows]).iloc[order]
+        self.df_popular['popularity_score'] = self.popularity_scores
+        
+        # Indeks pendukung hanya diperbarui untuk baris yang berubah
+        changed = self.df.iloc[changed_rows]
+        self.facet_index.update_rows(self.df, changed_rows)
+        self.geo_index.update_rows(changed_rows, changed['latitude'].to_numpy(), changed['longitude'].to_numpy())
+        self.search_index.update_rows(self.df, changed_rows)
+        self.name_index.update_rows(changed_rows, changed['nama'].tolist())
+        
+        # Isi model berubah, tandai dengan versi baru
+        self.model_version = uuid.uuid4().hex[:12]
+    
+    def _ingest_summary(self, added=0, updated=0):
+        return {
+            'added': added,
+            'updated': updated,
+            'total': len(self.df),
+            'vocabulary_drift': round(self.vocabulary_drift, 4),
+            'refit_scheduled': self.refit_scheduled
+        }
+    
     def haversine_distance(self, lat1, lon1, lat2, lon2):
         """
         Menghitung jarak antara dua titik koordinat menggunakan formula Haversine
         """
-        # Konversi dari derajat ke radian
-        lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
-        
-        # Formula Haversine
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
-        r = 6371  # Radius bumi dalam kilometer
-        return c * r
+        return haversine_km(lat1, lon1, lat2, lon2)
     
     def content_based_recommendations(self, name, top_n=10):
         """
@@ -120,96 +412,73 @@ class TourismRecommender:
         if not self.model_loaded:
             raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
         
-        # Dapatkan indeks tempat wisata dari namanya
-        try:
-            idx = self.indices[name]
-        except KeyError:
+        # Dapatkan indeks tempat wisata dari namanya (ternormalisasi, dengan fallback fuzzy)
+        idx = self.name_index.resolve(name)
+        if idx is None:
             return "Tempat wisata tidak ditemukan. Coba nama lain."
         
-        # Dapatkan skor kesamaan untuk semua tempat wisata
-        sim_scores = list(enumerate(self.cosine_sim[idx]))
-        
-        # Urutkan tempat wisata berdasarkan skor kesamaan
-        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-        
-        # Dapatkan skor top_n tempat wisata yang paling mirip (kecuali dirinya sendiri)
-        sim_scores = sim_scores[1:top_n+1]
-        
-        # Dapatkan indeks tempat wisata
-        attraction_indices = [i[0] for i in sim_scores]
+        attraction_indices, scores = self._content_candidates(idx, top_n)
         
         # Kembalikan top_n tempat wisata yang paling mirip
         recommended_places = self.df.iloc[attraction_indices][['nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list']]
-        recommended_places['similarity_score'] = [i[1] for i in sim_scores]
+        recommended_places['similarity_score'] = scores
         
         # Tambahkan kolom id
         recommended_places['id'] = self.df.iloc[attraction_indices]['id']
         
         return recommended_places
     
-    def popularity_based_recommendations(self, category=None, province=None, top_n=10):
+    def _content_candidates(self, idx, top_n):
         """
-        Memberikan rekomendasi berdasarkan popularitas
+        Mengembalikan (row_ids, skor) top_n tempat wisata paling mirip dengan baris idx
+        (kecuali dirinya sendiri), terurut menurun
         """
-        if not self.model_loaded or self.df_popular is None:
-            raise ValueError("Model atau data popularitas belum dimuat. Silakan latih atau muat model terlebih dahulu.")
+        if self.neighbors is not None:
+            # Ambil langsung dari daftar tetangga yang sudah terurut
+            return self.neighbors.neighbors(idx, top_n)
         
-        filtered_df = self.df_popular.copy()
+        # Dapatkan skor kesamaan untuk semua tempat wisata dan urutkan
+        sim_scores = list(enumerate(self.cosine_sim[idx]))
+        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
         
-        # Filter berdasarkan kategori jika diberikan (case-insensitive)
-        if category:
-            category_lower = category.lower()
-            filtered_df = filtered_df[filtered_df['kategori_list'].apply(lambda x: any(cat.lower() == category_lower for cat in x) if isinstance(x, list) else False)]
+        # Dapatkan skor top_n tempat wisata yang paling mirip (kecuali dirinya sendiri)
+        sim_scores = sim_scores[1:top_n+1]
+        return np.array([i[0] for i in sim_scores], dtype=np.int64), np.array([i[1] for i in sim_scores])
+    
+    def popularity_based_recommendations(self, category=None, province=None, top_n=10, lookups=None):
+        """
+        Memberikan rekomendasi berdasarkan popularitas.
+        lookups (SharedLookups) dipakai batch_recommendations untuk berbagi lookup facet.
+        """
+        if not self.model_loaded or self.df_popular is None:
+            raise ValueError("Model atau data popularitas belum dimuat. Silakan latih atau muat model terlebih dahulu.")
         
-        # Filter berdasarkan provinsi jika diberikan (case-insensitive)
-        if province:
-            province_lower = province.lower()
-            filtered_df = filtered_df[filtered_df['provinsi'].str.lower() == province_lower]
-        
-        # --- Hitung ulang popularity_score untuk data yang difilter ---
-        # Ini memastikan kolom ada dan skor relevan untuk subset data
-        if filtered_df.empty:
-             # Jika sudah kosong setelah filtering, tidak perlu hitung skor
-             print("Info: filtered_df is empty after initial filtering, skipping popularity score calculation.")
-             return "Tidak ada tempat wisata yang cocok dengan kriteria tersebut."
-
-        # Pastikan kolom 'rating' dan 'jumlah_review' ada untuk perhitungan
-        if 'rating' not in filtered_df.columns or 'jumlah_review' not in filtered_df.columns:
-             print("Critical Error: Rating or review columns missing in filtered data, cannot calculate popularity_score.")
-             return "Error internal: Data rating atau review hilang setelah filtering."
-
-        # Gunakan parameter C dan m dari model yang sudah dilatih dari data penuh
-        # Ini penting agar skor konsisten dengan definisi popularitas global
-        C = self.C
-        m = self.m
-        
-        # Jika m (jumlah review minimum) tidak ada di data yang difilter (kasus ekstrim data sedikit),
-        # gunakan m dari model penuh atau fallback ke 0 jika model penuh juga tidak ada m-nya.
-        if m is None:
-            m = self.df_popular['jumlah_review'].quantile(0.90) if self.df_popular is not None and 'jumlah_review' in self.df_popular.columns else 0
-
-        def weighted_rating_filtered(x, m=m, C=C):
-            v = x['jumlah_review']
-            R = x['rating']
-            # Hindari pembagian oleh nol jika m=0 dan v=0
-            if (v + m) == 0:
-                return C # Atau nilai default lain yang masuk akal
-            return (v/(v+m) * R) + (m/(v+m) * C)
-
-        # Hitung popularity score untuk data yang difilter
-        filtered_df['popularity_score'] = filtered_df.apply(weighted_rating_filtered, axis=1)
-        # --------------------------------------------------------------
-
-        # Debugging: Log info DataFrame sebelum sorting (setelah hitung ulang skor)
-        # print(f"Debug (after recalculate): DataFrame columns before sorting: {filtered_df.columns.tolist()}")
-        # print(f"Debug (after recalculate): DataFrame shape before sorting: {filtered_df.shape}")
-
-        # Sekarang kolom popularity_score pasti ada, lakukan sorting
-        filtered_df = filtered_df.sort_values('popularity_score', ascending=False)
+        candidates, candidate_scores = self._popularity_candidates(category, province, top_n, lookups)
+        if len(candidates) == 0:
+            return "Tidak ada tempat wisata yang cocok dengan kriteria tersebut."
         
         # Kembalikan top_n tempat wisata yang paling populer
         # Pastikan menyertakan kolom 'id'
-        return filtered_df[['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list', 'popularity_score']].head(top_n)
+        recommended_places = self.df_popular.iloc[candidates][['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list']]
+        recommended_places['popularity_score'] = candidate_scores
+        return recommended_places
+    
+    def _popularity_candidates(self, category, province, top_n, lookups=None):
+        """
+        Mengembalikan (row_ids, skor) top_n tempat wisata terpopuler, terurut menurun
+        """
+        # Filter kategori dan provinsi (case-insensitive) lewat indeks facet,
+        # tanpa menyalin DataFrame
+        if lookups is not None:
+            candidates = lookups.facet_rows(category, province)
+        else:
+            candidates = self.facet_index.lookup(category=category, province=province)
+        
+        # Skor popularitas sudah dihitung sekali untuk seluruh data dengan C dan m global,
+        # sehingga cukup ambil top_n dari kandidat tanpa menghitung ulang
+        candidate_scores = self.popularity_scores[candidates]
+        top = top_n_positions(candidate_scores, top_n)
+        return candidates[top], candidate_scores[top]
     
     def _validate_coordinates(self, lat, lon):
         """
@@ -221,9 +490,10 @@ class TourismRecommender:
             raise ValueError("Longitude harus berada dalam range -180 sampai 180 derajat")
         return True
 
-    def location_based_recommendations(self, lat, lon, max_distance=50, top_n=10):
+    def location_based_recommendations(self, lat, lon, max_distance=50, top_n=10, lookups=None):
         """
-        Memberikan rekomendasi berdasarkan lokasi geografis
+        Memberikan rekomendasi berdasarkan lokasi geografis.
+        lookups (SharedLookups) dipakai batch_recommendations untuk berbagi query radius.
         """
         if not self.model_loaded:
             raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
@@ -231,30 +501,101 @@ class TourismRecommender:
         # Validasi koordinat
         self._validate_coordinates(lat, lon)
         
-        # Hapus baris dengan koordinat nan
-        filtered_df = self.df.dropna(subset=['latitude', 'longitude']).copy()
-        
-        # Hitung jarak untuk setiap tempat wisata
-        filtered_df['distance'] = filtered_df.apply(
-            lambda row: self.haversine_distance(lat, lon, row['latitude'], row['longitude']), axis=1)
-        
-        # Filter tempat wisata dalam radius max_distance
-        filtered_df = filtered_df[filtered_df['distance'] <= max_distance]
+        # Cari tempat wisata dalam radius max_distance lewat indeks grid,
+        # hasil sudah terurut berdasarkan jarak dan dibatasi top_n
+        row_ids, distances = self._location_candidates(lat, lon, max_distance, top_n, lookups)
         
         # Jika tidak ada hasil yang ditemukan
-        if filtered_df.empty:
+        if len(row_ids) == 0:
             return f"Tidak ada tempat wisata dalam radius {max_distance} km dari lokasi tersebut."
         
-        # Urutkan berdasarkan jarak
-        filtered_df = filtered_df.sort_values('distance')
-        
-        # Kembalikan top_n tempat wisata terdekat
         # Pastikan menyertakan kolom 'id'
-        return filtered_df[['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list', 'distance']].head(top_n)
+        filtered_df = self.df.iloc[row_ids][['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list']]
+        filtered_df['distance'] = distances
+        return filtered_df
     
-    def hybrid_recommendations(self, name=None, lat=None, lon=None, category=None, province=None, max_distance=50, top_n=10):
+    def _location_candidates(self, lat, lon, max_distance, top_n, lookups=None):
         """
-        Memberikan rekomendasi hybrid yang menggabungkan content-based, popularity-based, dan location-based
+        Mengembalikan (row_ids, jarak_km) top_n tempat wisata terdekat dalam radius max_distance
+        """
+        if lookups is not None:
+            return lookups.geo_hits(lat, lon, max_distance, top_n)
+        return self.geo_index.radius_query(lat, lon, max_distance, top_n=top_n)
+
+    def viewport_markers(self, lat_min, lat_max, lon_min, lon_max, zoom=None, limit=500):
+        """
+        Marker peta untuk tempat wisata di dalam viewport (bounding box).
+        Di bawah CLUSTER_MAX_ZOOM titik dikelompokkan per sel grid (jumlah,
+        centroid, dan anggota dengan skor popularitas tertinggi); cluster berisi
+        satu titik dikembalikan sebagai titik biasa. lon_min > lon_max berarti
+        viewport melewati garis bujur 180. Cluster/titik dibatasi limit, diambil
+        yang terbesar/terpopuler.
+        """
+        if not self.model_loaded:
+            raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
+
+        self._validate_coordinates(lat_min, lon_min)
+        self._validate_coordinates(lat_max, lon_max)
+        if lat_min > lat_max:
+            raise ValueError("Latitude minimum tidak boleh lebih besar dari latitude maksimum")
+        if limit is not None and limit < 1:
+            raise ValueError("limit harus lebih besar dari 0")
+
+        row_ids, latitudes, longitudes = self.geo_index.bbox_query(lat_min, lat_max, lon_min, lon_max)
+        scores = self.popularity_scores[row_ids]
+        clustered = zoom is not None and zoom < CLUSTER_MAX_ZOOM
+
+        clusters = []
+        truncated = False
+        point_positions = np.arange(len(row_ids))
+        if clustered and len(row_ids) > 0:
+            labels, counts, centroid_lat, centroid_lon, representatives = grid_clusters(
+                latitudes, longitudes, zoom_cell_size(zoom), scores
+            )
+            # Cluster terbesar dulu
+            order = np.argsort(-counts, kind='stable')
+            multi = order[counts[order] > 1]
+            if limit is not None and len(multi) > limit:
+                multi, truncated = multi[:limit], True
+            top_rows = self.df.iloc[row_ids[representatives[multi]]]
+            for label, (_, top) in zip(multi, top_rows.iterrows()):
+                clusters.append({
+                    "count": int(counts[label]),
+                    "latitude": round(float(centroid_lat[label]), 6),
+                    "longitude": round(float(centroid_lon[label]), 6),
+                    "top": {"id": int(top["id"]), "nama": top["nama"], "rating": round(float(top["rating"]), 1)},
+                })
+            point_positions = np.flatnonzero(counts[labels] == 1)
+
+        # Titik terpopuler dulu
+        point_positions = point_positions[np.argsort(-scores[point_positions], kind='stable')]
+        if limit is not None and len(point_positions) > limit:
+            point_positions, truncated = point_positions[:limit], True
+        points = [
+            {
+                "id": int(row["id"]),
+                "nama": row["nama"],
+                "rating": round(float(row["rating"]), 1),
+                "latitude": float(row["latitude"]),
+                "longitude": float(row["longitude"]),
+                "kategori": row["kategori_list"],
+            }
+            for _, row in self.df.iloc[row_ids[point_positions]].iterrows()
+        ]
+
+        return {
+            "zoom": zoom,
+            "clustered": clustered,
+            "total": int(len(row_ids)),
+            "clusters": clusters,
+            "points": points,
+            "truncated": truncated,
+        }
+    
+    def hybrid_recommendations(self, name=None, lat=None, lon=None, category=None, province=None, max_distance=50, top_n=10, lookups=None):
+        """
+        Memberikan rekomendasi hybrid yang menggabungkan content-based, popularity-based, dan location-based.
+        lookups (SharedLookups) dipakai batch_recommendations untuk berbagi lookup facet dan radius.
         """
         if not self.model_loaded:
             raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
@@ -263,105 +604,58 @@ class TourismRecommender:
         if lat is not None or lon is not None:
             self._validate_coordinates(lat, lon)
         
-        results = pd.DataFrame()
+        components = {}
         
         # Content-based jika nama tempat wisata diberikan
         if name:
-            content_recs = self.content_based_recommendations(name, top_n=top_n*2)
-            if isinstance(content_recs, str):
-                print(f"Warning: Content-based recommendation failed for '{name}': {content_recs}")
-                pass  # Jika tempat wisata tidak ditemukan
+            idx = self.name_index.resolve(name)
+            if idx is not None:
+                components['similarity'] = self._content_candidates(idx, top_n*2)
             else:
-                # Pastikan kolom yang diperlukan ada sebelum digabungkan
-                required_cols = ['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list', 'similarity_score']
-                if all(col in content_recs.columns for col in required_cols):
-                    results = pd.concat([results, content_recs])
-                else:
-                    print(f"Warning: Missing required columns in content_recs: {', '.join([col for col in required_cols if col not in content_recs.columns])}")
-
+                print(f"Warning: Content-based recommendation failed for '{name}': Tempat wisata tidak ditemukan.")
         
         # Location-based jika koordinat diberikan
         if lat is not None and lon is not None:
-            location_recs = self.location_based_recommendations(lat, lon, max_distance, top_n*2)
-            if isinstance(location_recs, str):
-                 print(f"Warning: Location-based recommendation failed for ({lat}, {lon}): {location_recs}")
-                 pass  # Jika tidak ada tempat wisata dalam radius
-            else:
-                # Tambahkan skor jarak yang dinormalisasi (semakin dekat semakin tinggi skor)
-                if 'distance' in location_recs.columns:
-                    max_dist = location_recs['distance'].max() if not location_recs.empty else 1
-                    location_recs['distance_score'] = 1 - (location_recs['distance'] / max_dist)
-                    # Pastikan kolom yang diperlukan ada sebelum digabungkan
-                    required_cols = ['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list', 'distance', 'distance_score']
-                    if all(col in location_recs.columns for col in required_cols):
-                         results = pd.concat([results, location_recs])
-                    else:
-                         print(f"Warning: Missing required columns in location_recs: {', '.join([col for col in required_cols if col not in location_recs.columns])}")
-                else:
-                     print("Warning: 'distance' column missing in location_recs.")
-
-        # Popularity-based berdasarkan kategori dan/atau provinsi
-        # Panggil popularity_based_recommendations, yang sekarang sudah lebih defensif
-        popularity_recs = self.popularity_based_recommendations(category=category, province=province, top_n=top_n*2) # Kirim parameter explicitly
-        
-        # popularity_based_recommendations sekarang mengembalikan string error atau DataFrame
-        if isinstance(popularity_recs, str):
-             print(f"Warning: Popularity-based recommendation failed for (cat={category}, prov={province}): {popularity_recs}")
-             # Jika ada error dari popularity_based_recommendations (misal: tidak ada data atau error internal saat hitung skor)
-             # Kita bisa memilih untuk mengabaikan komponen popularitas atau mengembalikan error keseluruhan
-             # Untuk hybrid, mari kita coba abaikan komponen ini jika gagal, tetapi log peringatan.
-             # Jangan tambahkan ke `results` jika berupa string error
-             pass 
-        else:
-            # Pastikan kolom yang diperlukan ada sebelum digabungkan (termasuk popularity_score)
-            required_cols = ['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list', 'popularity_score']
-            if all(col in popularity_recs.columns for col in required_cols):
-                results = pd.concat([results, popularity_recs])
+            row_ids, distances = self._location_candidates(lat, lon, max_distance, top_n*2, lookups)
+            if len(row_ids) == 0:
+                print(f"Warning: Location-based recommendation failed for ({lat}, {lon}): tidak ada tempat wisata dalam radius {max_distance} km.")
             else:
-                print(f"Warning: Missing required columns in popularity_recs after getting results: {', '.join([col for col in required_cols if col not in popularity_recs.columns])}")
-
-        # Jika tidak ada hasil
-        if results.empty:
-            return "Tidak ada rekomendasi yang sesuai dengan kriteria tersebut."
+                # Skor jarak (semakin dekat semakin tinggi skor)
+                max_dist = distances.max()
+                distance_scores = 1 - distances / max_dist if max_dist > 0 else np.zeros(len(distances))
+                components['distance'] = (row_ids, distance_scores)
         
-        # Normalkan semua skor ke range 0-1
-        scaler = MinMaxScaler()
-        if 'similarity_score' in results.columns:
-            results['similarity_score'] = results['similarity_score'].fillna(0)
-            results['similarity_score_normalized'] = scaler.fit_transform(results[['similarity_score']])
-        else:
-            results['similarity_score_normalized'] = 0
-            
-        if 'distance_score' in results.columns:
-            results['distance_score'] = results['distance_score'].fillna(0)
-            results['distance_score_normalized'] = scaler.fit_transform(results[['distance_score']])
-        else:
-            results['distance_score_normalized'] = 0
-            
-        if 'popularity_score' in results.columns:
-            results['popularity_score'] = results['popularity_score'].fillna(0)
-            results['popularity_score_normalized'] = scaler.fit_transform(results[['popularity_score']])
+        # Popularity-based berdasarkan kategori dan/atau provinsi
+        row_ids, popularity_scores = self._popularity_candidates(category, province, top_n*2, lookups)
+        if len(row_ids) == 0:
+            print(f"Warning: Popularity-based recommendation failed for (cat={category}, prov={province}): tidak ada tempat wisata yang cocok.")
         else:
-            results['popularity_score_normalized'] = 0
-        
-        # Hitung hybrid score dengan bobot berbeda untuk setiap komponen
-        results['hybrid_score'] = (
-            0.4 * results['similarity_score_normalized'] + 
-            0.3 * results['distance_score_normalized'] + 
-            0.3 * results['popularity_score_normalized']
-        )
+            components['popularity'] = (row_ids, popularity_scores)
         
-        # Hapus duplikat berdasarkan nama
-        results = results.drop_duplicates(subset=['nama'])
+        # Normalisasi dan gabungkan skor semua komponen di atas vektor array
+        row_ids, hybrid_scores = fuse_scores(components, top_n=top_n)
         
-        # Urutkan berdasarkan hybrid score
-        results = results.sort_values('hybrid_score', ascending=False)
+        # Jika tidak ada hasil
+        if len(row_ids) == 0:
+            return "Tidak ada rekomendasi yang sesuai dengan kriteria tersebut."
         
-        # Pilih kolom-kolom yang ingin ditampilkan
         # Pastikan menyertakan 'id' dalam daftar kolom yang ditampilkan
-        display_columns = ['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list', 'hybrid_score']
-        if 'distance' in results.columns:
-            display_columns.insert(6, 'distance') # Sisipkan jarak setelah kategori_list
+        results = self.df.iloc[row_ids][['id', 'nama', 'provinsi', 'rating', 'jumlah_review', 'kategori_list']]
+        if 'distance' in components:
+            # Sisipkan jarak setelah kategori_list
+            results['distance'] = haversine_km(
+                lat, lon, self.df['latitude'].to_numpy()[row_ids], self.df['longitude'].to_numpy()[row_ids])
+        results['hybrid_score'] = hybrid_scores
         
         # Kembalikan top_n rekomendasi
-        return results[display_columns].head(top_n) 
\ No newline at end of file
+        return results
+    
+    def batch_recommendations(self, queries):
+        """
+        Menjalankan beberapa query rekomendasi sekaligus dengan lookup facet dan
+        lokasi yang dipakai bersama. Mengembalikan list DataFrame/string sesuai urutan query.
+        """
+        if not self.model_loaded:
+            raise ValueError("Model belum dimuat, silakan muat model terlebih dahulu dengan metode load_model()")
+        
+        return run_batch(self, queries)
@@ -0,0 +1,163 @@
+import numpy as np
+
+# Batas kemiripan trigram (koefisien Dice) untuk menerima hasil fuzzy
+MIN_SIMILARITY = 0.5
+# Panjang minimal query (ternormalisasi) agar pencocokan substring berlaku
+MIN_CONTAINS_LENGTH = 5
+# Batas kemiripan jika query termuat di lebih dari satu nama (kata umum seperti
+# "pantai" mirip dengan banyak nama pendek, salah ketik nama lengkap tetap lolos)
+AMBIGUOUS_MIN_SIMILARITY = 0.8
+
+
+def normalize_name(name):
+    """
+    Normalisasi nama untuk pencocokan: lowercase dan hanya karakter alfanumerik
+    """
+    if not isinstance(name, str):
+        return ''
+    return ''.join(c for c in name.lower() if c.isalnum())
+
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Indeks nama tempat wisata: dict dari nama ternormalisasi ke posisi baris
+    (pencocokan persis O(1)), ditambah indeks trigram untuk fallback fuzzy
+    sehingga variasi ejaan tetap ditemukan dengan biaya sebanding jumlah
+    kandidat yang berbagi trigram, bukan jumlah baris.
+    """
+
+    def __init__(self, names):
+        self.exact = {}
+        # Nama ternormalisasi per posisi baris dan posisi baris per nama
+        self.row_keys = []
+        self.members = {}
+        # Nama unik yang pernah diindeks (key_id tetap; rows bernilai -1 jika tidak dipakai lagi)
+        self.keys = []
+        self.key_ids = {}
+        self.rows = np.empty(0, dtype=np.int64)
+        self.n_trigrams = np.empty(0, dtype=np.int32)
+        self.postings = {}
+        self.update_rows(np.arange(len(names)), names)
+
+    def update_rows(self, rows, names):
+        """
+        Memperbarui nama untuk posisi baris yang baru ditambahkan atau diubah;
+        trigram hanya dihitung untuk nama yang belum pernah diindeks
+        """
+        affected = set()
+        for row, name in zip(np.asarray(rows, dtype=np.int64).tolist(), names):
+            if row >= len(self.row_keys):
+                self.row_keys.extend([''] * (row + 1 - len(self.row_keys)))
+            old = self.row_keys[row]
+            if old:
+                self.members[old].discard(row)
+                affected.add(old)
+            key = normalize_name(name)
+            self.row_keys[row] = key
+            if key:
+                self.members.setdefault(key, set()).add(row)
+                affected.add(key)
+
+        # Nama duplikat: pertahankan baris pertama
+        new_keys = []
+        for key in affected:
+            members = self.members.get(key)
+            if members:
+                self.exact[key] = min(members)
+                if key not in self.key_ids:
+                    new_keys.append(key)
+            else:
+                self.exact.pop(key, None)
+                self.members.pop(key, None)
+
+        # Trigram per nama ternormalisasi yang baru, urut sesuai baris pertamanya
+        new_keys.sort(key=self.exact.get)
+        first_id = len(self.keys)
+        postings = {}
+        n_trigrams = np.empty(len(new_keys), dtype=np.int32)
+        for offset, key in enumerate(new_keys):
+            self.key_ids[key] = first_id + offset
+            grams = _trigrams(key)
+            n_trigrams[offset] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(first_id + offset)
+        self.keys.extend(new_keys)
+        self.n_trigrams = np.concatenate([self.n_trigrams, n_trigrams])
+        for gram, ids in postings.items():
+            ids = np.asarray(ids, dtype=np.int32)
+            self.postings[gram] = np.concatenate([self.postings[gram], ids]) if gram in self.postings else ids
+
+        self.rows = np.concatenate([self.rows, np.full(len(new_keys), -1, dtype=np.int64)])
+        for key in affected:
+            key_id = self.key_ids.get(key)
+            if key_id is not None:
+                self.rows[key_id] = self.exact.get(key, -1)
+        return self
+
+    def __len__(self):
+        return len(self.exact)
+
+    def resolve(self, name, fuzzy=True):
+        """
+        Mengembalikan posisi baris untuk nama, atau None jika tidak ditemukan.
+        Pencocokan persis pada nama ternormalisasi dulu, lalu (jika fuzzy) nama
+        dengan kemiripan trigram tertinggi di atas MIN_SIMILARITY, atau satu-satunya
+        nama yang memuat seluruh trigram query (mendekati pencarian substring).
+        Query yang termuat di banyak nama (kata umum seperti "pantai") hanya
+        diterima lewat kemiripan di atas AMBIGUOUS_MIN_SIMILARITY.
+        """
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+        row = self.exact.get(normalized)
+        if row is not None or not fuzzy:
+            return row
+
+        match = self.fuzzy_matches(normalized, top_n=1)
+        return int(self.rows[match[0][0]]) if match else None
+
+    def fuzzy_matches(self, normalized, top_n=5):
+        """
+        Mengembalikan daftar (key_id, kemiripan) kandidat fuzzy terbaik
+        """
+        grams = _trigrams(normalized)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return []
+
+        key_ids, shared = np.unique(np.concatenate(hits), return_counts=True)
+        # Nama yang tidak lagi dipakai baris mana pun
+        alive = self.rows[key_ids] >= 0
+        key_ids, shared = key_ids[alive], shared[alive]
+        if len(key_ids) == 0:
+            return []
+        similarity = 2 * shared / (len(grams) + self.n_trigrams[key_ids])
+
+        # Trigram di dalam query (tanpa padding awal/akhir) yang semuanya ada di
+        # kandidat berarti query adalah substring dari nama kandidat. Jika hanya
+        # satu nama memuat query, nama itu diterima selama query cukup panjang.
+        # Jika lebih dari satu (kata umum seperti "pantai"), query ambigu: tidak
+        # ada yang diterima lewat substring dan batas kemiripan dinaikkan
+        inner = {g for g in grams if ' ' not in g}
+        contains = np.zeros(len(key_ids), dtype=bool)
+        min_similarity = MIN_SIMILARITY
+        if inner:
+            inner_hits = [self.postings[g] for g in inner if g in self.postings]
+            if len(inner_hits) == len(inner):
+                inner_ids, inner_counts = np.unique(np.concatenate(inner_hits), return_counts=True)
+                full = inner_ids[inner_counts == len(inner)]
+                contains = np.isin(key_ids, full)
+                if contains.sum() > 1:
+                    min_similarity = AMBIGUOUS_MIN_SIMILARITY
+                if contains.sum() > 1 or len(normalized) < MIN_CONTAINS_LENGTH:
+                    contains[:] = False
+
+        accepted = (similarity >= min_similarity) | contains
+        key_ids, similarity = key_ids[accepted], similarity[accepted]
+        order = np.argsort(-similarity, kind='stable')[:top_n]
+        return [(int(key_ids[i]), float(similarity[i])) for i in order]
@@ -0,0 +1,322 @@
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+# Jumlah sampel per cluster dan iterasi untuk melatih centroid IVF
+IVF_SAMPLES_PER_CLUSTER = 20
+IVF_KMEANS_ITERATIONS = 5
+
+
+def _spherical_kmeans(vectors, n_clusters, n_iter, rng):
+    """
+    K-means dengan similarity cosine untuk vektor yang sudah dinormalisasi L2
+    (sparse). Mengembalikan centroid (dense, ternormalisasi).
+    """
+    centroids = vectors[rng.choice(vectors.shape[0], size=n_clusters, replace=False)].toarray()
+    for _ in range(n_iter):
+        labels = np.asarray(vectors @ centroids.T).argmax(axis=1)
+        assignment = sparse.csr_matrix(
+            (np.ones(len(labels)), (labels, np.arange(len(labels)))), shape=(n_clusters, vectors.shape[0]))
+        updated = np.asarray((assignment @ vectors).todense())
+        # Cluster kosong mempertahankan centroid lamanya
+        empty = np.asarray(assignment.sum(axis=1)).ravel() == 0
+        updated[empty] = centroids[empty]
+        centroids = normalize(updated)
+    return centroids
+
+
+def _top_k_rows(scores, k):
+    """
+    Mengambil k kolom dengan skor tertinggi per baris, terurut menurun
+    """
+    top = np.argpartition(scores, -k, axis=1)[:, -k:]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class TopKNeighbors:
+    """
+    Indeks tetangga terdekat (top-K) per tempat wisata dalam format CSR.
+
+    Menggantikan matriks cosine similarity N x N yang padat. Untuk setiap baris
+    hanya disimpan K tetangga dengan skor tertinggi (tanpa dirinya sendiri),
+    terurut menurun: `indices` (int32) dan `scores` (float32), dengan `indptr`
+    sebagai penanda awal/akhir baris.
+    """
+
+    def __init__(self, indptr, indices, scores, k=None):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        # K yang diminta saat build (bisa lebih besar dari panjang baris jika data masih sedikit)
+        self.k = k if k is not None else int(np.diff(self.indptr).max(initial=0))
+
+    @classmethod
+    def build(cls, tfidf_matrix, k=100, chunk_size=512):
+        """
+        Membangun indeks dari matriks TF-IDF secara bertahap per blok baris,
+        sehingga memori puncak hanya sebesar chunk_size x N (bukan N x N)
+        """
+        n_rows = tfidf_matrix.shape[0]
+        k_eff = max(0, min(k, n_rows - 1))
+
+        indptr = np.arange(n_rows + 1, dtype=np.int64) * k_eff
+        indices = np.empty(n_rows * k_eff, dtype=np.int32)
+        scores = np.empty(n_rows * k_eff, dtype=np.float32)
+
+        if k_eff == 0:
+            return cls(indptr, indices, scores, k=k)
+
+        for start in range(0, n_rows, chunk_size):
+            end = min(start + chunk_size, n_rows)
+            block = cosine_similarity(tfidf_matrix[start:end], tfidf_matrix).astype(np.float32, copy=False)
+
+            # Keluarkan dirinya sendiri dari kandidat tetangga
+            rows = np.arange(end - start)
+            block[rows, rows + start] = -np.inf
+
+            # Ambil K kandidat terbaik tanpa mengurutkan seluruh baris
+            top, top_scores = _top_k_rows(block, k_eff)
+
+            indices[start * k_eff:end * k_eff] = top.ravel()
+            scores[start * k_eff:end * k_eff] = top_scores.ravel()
+
+        return cls(indptr, indices, scores, k=k)
+
+    @classmethod
+    def build_ivf(cls, tfidf_matrix, k=100, n_clusters=None, n_probe=8, chunk_size=512, random_state=42):
+        """
+        Membangun indeks top-K secara aproksimasi (IVF): vektor TF-IDF yang sudah
+        dinormalisasi L2 dikelompokkan dengan k-means (cosine), lalu setiap baris hanya
+        dibandingkan dengan anggota n_probe cluster yang centroid-nya paling mirip.
+
+        Biaya ~ N x (N / n_clusters) x n_probe, bukan N x N. Default n_clusters
+        = 4 * sqrt(N) sehingga fit tumbuh ~N^1.5. n_probe lebih besar menaikkan
+        recall dengan biaya waktu build (lihat benchmarks.bench_ann).
+        """
+        n_rows = tfidf_matrix.shape[0]
+        if n_clusters is None:
+            n_clusters = int(4 * np.sqrt(n_rows))
+        n_clusters = max(1, min(n_clusters, n_rows))
+        n_probe = max(1, min(n_probe, n_clusters))
+        k_eff = max(0, min(k, n_rows - 1))
+
+        ids = np.full((n_rows, k_eff), -1, dtype=np.int32)
+        scores = np.full((n_rows, k_eff), -np.inf, dtype=np.float32)
+        if k_eff == 0:
+            return cls._from_padded(ids, scores, k=k)
+
+        vectors = normalize(tfidf_matrix, norm='l2', copy=True).tocsr()
+
+        # Centroid dilatih pada sampel baris saja agar biaya k-means tidak ikut mendominasi
+        rng = np.random.default_rng(random_state)
+        sample_size = min(n_rows, max(IVF_SAMPLES_PER_CLUSTER * n_clusters, 10000))
+        sample = np.sort(rng.choice(n_rows, size=sample_size, replace=False))
+        centroids = _spherical_kmeans(vectors[sample], n_clusters, IVF_KMEANS_ITERATIONS, rng)
+
+        # Cluster yang diperiksa oleh setiap baris: n_probe centroid paling mirip,
+        # dengan yang pertama sekaligus menjadi cluster milik baris tersebut
+        probes = np.empty((n_rows, n_probe), dtype=np.int32)
+        for start in range(0, n_rows, chunk_size):
+            block = np.asarray(vectors[start:start + chunk_size] @ centroids.T)
+            probes[start:start + chunk_size] = _top_k_rows(block, n_probe)[0]
+        labels = probes[:, 0]
+
+        # Kerjakan per cluster: baris yang memeriksa cluster c dibandingkan dengan
+        # anggota c, lalu hasilnya digabung ke daftar top-K sementara
+        members_of = np.split(np.argsort(labels, kind='stable'), np.cumsum(np.bincount(labels, minlength=n_clusters))[:-1])
+        probe_rows = np.repeat(np.arange(n_rows), n_probe)
+        probe_order = np.argsort(probes.ravel(), kind='stable')
+        probing = np.split(probe_rows[probe_order], np.cumsum(np.bincount(probes.ravel(), minlength=n_clusters))[:-1])
+
+        for cluster in range(n_clusters):
+            members = members_of[cluster]
+            if len(members) == 0:
+                continue
+            member_vectors = vectors[members].T.tocsc()
+            for start in range(0, len(probing[cluster]), chunk_size):
+                queries = probing[cluster][start:start + chunk_size]
+                block = (vectors[queries] @ member_vectors).toarray().astype(np.float32, copy=False)
+                # Keluarkan dirinya sendiri dari kandidat tetangga
+                block[queries[:, None] == members[None, :]] = -np.inf
+
+                local_k = min(k_eff, len(members))
+                top, top_scores = _top_k_rows(block, local_k)
+                merged_ids = np.hstack([ids[queries], members[top].astype(np.int32)])
+                merged_scores = np.hstack([scores[queries], top_scores])
+                best, best_scores = _top_k_rows(merged_scores, k_eff)
+                ids[queries] = np.take_along_axis(merged_ids, best, axis=1)
+                scores[queries] = best_scores
+
+        # Entri -inf (dirinya sendiri atau cluster terlalu kecil) bukan tetangga
+        ids[np.isneginf(scores)] = -1
+        return cls._from_padded(ids, scores, k=k)
+
+    @classmethod
+    def _from_padded(cls, ids, scores, k):
+        """
+        Membuat indeks CSR dari array (n_rows x k) dengan padding id -1 di akhir baris
+        """
+        valid = ids >= 0
+        indptr = np.concatenate([[0], np.cumsum(valid.sum(axis=1))]).astype(np.int64)
+        return cls(indptr, ids[valid], scores[valid], k=k)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nbytes(self):
+        """
+        Ukuran memori indeks dalam byte
+        """
+        return self.indptr.nbytes + self.indices.nbytes + self.scores.nbytes
+
+    def neighbors(self, idx, top_n=10):
+        """
+        Mengembalikan (indeks, skor) top_n tetangga terdekat untuk baris idx
+        """
+        start = self.indptr[idx]
+        end = min(self.indptr[idx + 1], start + top_n)
+        return self.indices[start:end], self.scores[start:end]
+
+    def _entry_positions(self, rows, indptr=None):
+        """
+        Posisi entri (pada indices/scores) milik baris-baris rows, digabung sesuai urutan rows
+        """
+        indptr = self.indptr if indptr is None else indptr
+        starts = indptr[rows]
+        lengths = indptr[np.asarray(rows) + 1] - starts
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return np.arange(lengths.sum(), dtype=np.int64) + offsets
+
+    def update(self, tfidf_matrix, changed_rows, chunk_size=512):
+        """
+        Memperbarui daftar tetangga setelah sebagian baris ditambah atau diubah.
+
+        tfidf_matrix adalah matriks lengkap terbaru (baris baru berada di akhir) dan
+        changed_rows berisi posisi baris yang baru/berubah. Hasilnya sama dengan
+        build() pada matriks terbaru:
+        - baris yang berubah, dan baris lama yang daftarnya memuat baris yang
+          berubah (skornya tidak berlaku lagi), dihitung ulang sepenuhnya,
+        - baris lain menerima baris yang berubah jika skornya masuk top-K.
+        Similarity hanya dihitung untuk baris yang dihitung ulang terhadap katalog,
+        dan hanya baris CSR yang isinya berubah yang ditulis ulang (di tempat jika
+        panjangnya tetap), sehingga biayanya mengikuti jumlah perubahan.
+        """
+        n_rows = tfidf_matrix.shape[0]
+        n_old = len(self)
+        changed_rows = np.unique(np.asarray(changed_rows, dtype=np.int64))
+        if len(changed_rows) == 0 and n_rows == n_old:
+            return self
+
+        k_eff = max(0, min(self.k, n_rows - 1))
+        if k_eff == 0:
+            self.indptr = np.zeros(n_rows + 1, dtype=np.int64)
+            self.indices = np.empty(0, dtype=np.int32)
+            self.scores = np.empty(0, dtype=np.float32)
+            return self
+
+        # Baris lama yang menunjuk ke baris yang diubah (baris baru belum ditunjuk siapa pun)
+        old_changed = changed_rows[changed_rows < n_old]
+        stale_rows = np.empty(0, dtype=np.int64)
+        if len(old_changed) > 0:
+            stale = np.flatnonzero(np.isin(self.indices, old_changed))
+            stale_rows = np.unique(np.searchsorted(self.indptr, stale, side='right') - 1)
+        recompute = np.union1d(changed_rows, stale_rows)
+
+        is_recomputed = np.zeros(n_rows, dtype=bool)
+        is_recomputed[recompute] = True
+        is_changed = np.zeros(n_rows, dtype=bool)
+        is_changed[changed_rows] = True
+
+        # Skor tetangga ke-K setiap baris lama; baris yang belum penuh menerima semua kandidat
+        lengths = np.diff(self.indptr)
+        threshold = np.full(n_rows, -np.inf, dtype=np.float32)
+        full = np.flatnonzero(lengths >= k_eff)
+        threshold[full] = self.scores[self.indptr[full + 1] - 1]
+
+        # Entri baru dikumpulkan sebagai (baris, id tetangga, skor)
+        new_rows, new_ids, new_scores = [], [], []
+        gained_rows, gained_ids, gained_scores = [], [], []
+        for start in range(0, len(recompute), chunk_size):
+            chunk = recompute[start:start + chunk_size]
+            block = cosine_similarity(tfidf_matrix[chunk], tfidf_matrix).astype(np.float32, copy=False)
+            block[np.arange(len(chunk)), chunk] = -np.inf
+
+            top, top_scores = _top_k_rows(block, k_eff)
+            new_rows.append(np.repeat(chunk, k_eff))
+            new_ids.append(top.ravel())
+            new_scores.append(top_scores.ravel())
+
+            # Baris lain yang daftar tetangganya kemasukan baris berubah dari blok ini
+            sources = np.flatnonzero(is_changed[chunk])
+            if len(sources) == 0:
+                continue
+            candidates = block[sources].T
+            candidates[is_recomputed] = -np.inf
+            rows, cols = np.nonzero(candidates > threshold[:, None])
+            gained_rows.append(rows)
+            gained_ids.append(chunk[sources][cols])
+            gained_scores.append(candidates[rows, cols])
+
+        rows = np.concatenate(new_rows)
+        ids = np.concatenate(new_ids)
+        scores = np.concatenate(new_scores)
+        if gained_rows and sum(len(r) for r in gained_rows) > 0:
+            gained = np.unique(np.concatenate(gained_rows))
+            # Daftar lama baris penerima digabung dengan kandidat barunya, lalu diambil K teratas
+            old_positions = self._entry_positions(gained)
+            merged_rows = np.concatenate([np.repeat(gained, lengths[gained])] + gained_rows)
+            merged_ids = np.concatenate([self.indices[old_positions]] + gained_ids)
+            merged_scores = np.concatenate([self.scores[old_positions]] + gained_scores)
+            order = np.lexsort((-merged_scores, merged_rows))
+            merged_rows, merged_ids, merged_scores = merged_rows[order], merged_ids[order], merged_scores[order]
+            group_start = np.searchsorted(merged_rows, merged_rows, side='left')
+            keep = np.arange(len(merged_rows)) - group_start < k_eff
+            rows = np.concatenate([rows, merged_rows[keep]])
+            ids = np.concatenate([ids, merged_ids[keep]])
+            scores = np.concatenate([scores, merged_scores[keep]])
+
+        order = np.lexsort((-scores, rows))
+        self._replace_rows(n_rows, rows[order], ids[order].astype(np.int32), scores[order].astype(np.float32))
+        return self
+
+    def _replace_rows(self, n_rows, rows, ids, scores):
+        """
+        Mengganti isi baris-baris (rows terurut naik, entri per baris terurut
+        menurun) dan memperpanjang indeks sampai n_rows baris
+        """
+        n_old = len(self)
+        replaced, counts = np.unique(rows, return_counts=True)
+        lengths = np.zeros(n_rows, dtype=np.int64)
+        lengths[:n_old] = np.diff(self.indptr)
+
+        if n_rows == n_old and (lengths[replaced] == counts).all():
+            # Panjang baris tetap: tulis langsung di tempat (array mmap read-only disalin sekali)
+            if not self.indices.flags.writeable:
+                self.indices = np.array(self.indices)
+            if not self.scores.flags.writeable:
+                self.scores = np.array(self.scores)
+            positions = self._entry_positions(replaced)
+            self.indices[positions] = ids
+            self.scores[positions] = scores
+            return
+
+        lengths[replaced] = counts
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        new_scores = np.empty(indptr[-1], dtype=np.float32)
+
+        # Baris lama yang tidak berubah disalin apa adanya
+        kept = np.setdiff1d(np.arange(n_old), replaced, assume_unique=True)
+        source = self._entry_positions(kept)
+        target = self._entry_positions(kept, indptr)
+        indices[target] = self.indices[source]
+        new_scores[target] = self.scores[source]
+
+        target = self._entry_positions(replaced, indptr)
+        indices[target] = ids
+        new_scores[target] = scores
+        self.indptr, self.indices, self.scores = indptr, indices, new_scores
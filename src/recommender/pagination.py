@@ -0,0 +1,71 @@
+import base64
+import json
+
+import numpy as np
+
+
+def encode_cursor(sort, value, attraction_id):
+    """
+    Cursor opaque (base64 URL-safe) berisi nama urutan, nilai kolom urutan, dan id
+    baris terakhir pada halaman
+    """
+    payload = json.dumps({'s': sort, 'v': value, 'id': attraction_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    """
+    Mengembalikan (nilai, id) dari cursor; ValueError jika cursor rusak atau
+    dibuat untuk urutan lain
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, attraction_id = float(data['v']), int(data['id'])
+        cursor_sort = data['s']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Cursor tidak valid")
+    if cursor_sort != sort:
+        raise ValueError("Cursor tidak cocok dengan urutan hasil, ulangi dari halaman pertama")
+    return value, attraction_id
+
+
+def listing_order(df, sort='rating'):
+    """
+    Mengembalikan (ids, keys) dalam urutan listing. 'rating': rating menurun
+    (tanpa rating di akhir) lalu id menaik; 'relevance': urutan df dipertahankan
+    (hasil pencarian sudah terurut relevansi) dengan peringkat sebagai kunci.
+    """
+    ids = df['id'].to_numpy()
+    if sort == 'relevance':
+        return ids, -np.arange(len(ids), dtype=np.float64)
+
+    keys = df['rating'].to_numpy(dtype=np.float64)
+    keys = np.where(np.isnan(keys), -np.inf, keys)
+    order = np.lexsort((ids, -keys))
+    return ids[order], keys[order]
+
+
+def paginate(ids, keys, limit=None, cursor=None, sort='rating'):
+    """
+    Keyset pagination atas hasil yang sudah terurut (keys menurun, id menaik untuk
+    nilai keys yang sama). Halaman berikutnya dimulai tepat setelah (nilai, id)
+    di cursor, sehingga tetap stabil walaupun ada baris yang ditambah atau dihapus.
+    Mengembalikan (ids halaman ini, cursor berikutnya atau None).
+    """
+    ids = np.asarray(ids)
+    keys = np.asarray(keys, dtype=np.float64)
+    if limit is not None and limit < 1:
+        raise ValueError("limit harus lebih besar dari 0")
+
+    start = 0
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        after = (keys < value) | ((keys == value) & (ids > last_id))
+        start = int(np.argmax(after)) if after.any() else len(ids)
+
+    end = len(ids) if limit is None else min(start + limit, len(ids))
+    next_cursor = None
+    if end < len(ids) and end > start:
+        next_cursor = encode_cursor(sort, float(keys[end - 1]), int(ids[end - 1]))
+    return ids[start:end], next_cursor
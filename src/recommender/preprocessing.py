@@ -2,53 +2,178 @@ import pandas as pd
 import numpy as np
 import re
 import ast
-from nltk.tokenize import word_tokenize
+import os
+import time
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from nltk.stem import PorterStemmer
 from nltk.corpus import stopwords
 import nltk
 
-# Download NLTK resources jika belum ada
+from .scoring import popularity_parameters, weighted_rating
+
+# Download stopwords NLTK jika belum ada (tokenisasi memakai split(), tanpa punkt)
 try:
-    nltk.data.find('tokenizers/punkt')
     nltk.data.find('corpora/stopwords')
 except LookupError:
-    nltk.download('punkt')
     nltk.download('stopwords')
 
-def preprocess_text(text):
+# Stopwords kustom yang ditambahkan ke daftar NLTK
+CUSTOM_STOPWORDS = ['yang', 'ini', 'dan', 'di', 'dengan', 'untuk', 'dari', 'pada', 'ke', 'adalah']
+
+# Tahapan preprocessing teks yang diukur waktunya
+TEXT_STAGES = ('clean', 'tokenize', 'stopwords', 'stem')
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_DIGITS = re.compile(r'\d+')
+
+
+def load_stopwords():
     """
-    Melakukan preprocessing pada teks deskripsi
+    Daftar stopwords bahasa Indonesia (fallback bahasa Inggris) ditambah stopwords kustom
     """
-    if pd.isna(text):
-        return ""
-    
-    # Konversi ke lowercase
-    text = text.lower()
-    
-    # Hapus karakter khusus dan angka
-    text = re.sub(r'[^\w\s]', ' ', text)
-    text = re.sub(r'\d+', ' ', text)
-    
-    # Tokenisasi
-    tokens = word_tokenize(text)
-    
-    # Hapus stopwords
     try:
         stop_words = set(stopwords.words('indonesian'))
     except:
         stop_words = set(stopwords.words('english'))
-        
-    # Tambahkan stopwords kustom
-    custom_stopwords = ['yang', 'ini', 'dan', 'di', 'dengan', 'untuk', 'dari', 'pada', 'ke', 'adalah']
-    stop_words.update(custom_stopwords)
-    
-    tokens = [word for word in tokens if word not in stop_words]
-    
-    # Stemming
-    stemmer = PorterStemmer()
-    tokens = [stemmer.stem(word) for word in tokens]
-    
-    return " ".join(tokens)
+    stop_words.update(CUSTOM_STOPWORDS)
+    return stop_words
+
+
+class TextPreprocessor:
+    """
+    Mesin preprocessing teks deskripsi: stopwords dan stemmer dibangun sekali,
+    hasil stemming per token dimemo dalam cache LRU berukuran terbatas, dan
+    baris dapat dibagi ke beberapa proses (n_jobs). Waktu per tahap
+    (TEXT_STAGES ditambah tahap preprocess_data) diakumulasi di `timings`.
+    """
+
+    def __init__(self, stem_cache_size=100000):
+        self.stop_words = load_stopwords()
+        self.stemmer = PorterStemmer()
+        self.stem_cache_size = stem_cache_size
+        self._stem = lru_cache(maxsize=stem_cache_size)(self.stemmer.stem)
+        self.timings = {}
+        # Statistik cache dari proses worker (cache milik worker tidak terlihat di sini)
+        self._worker_hits = 0
+        self._worker_misses = 0
+
+    def record(self, stage, seconds):
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def process(self, text):
+        return self.process_many([text])[0]
+
+    def process_many(self, texts):
+        """
+        Memproses daftar teks tahap demi tahap (hasil sama dengan preprocess_text)
+        """
+        start = time.perf_counter()
+        cleaned = [
+            None if pd.isna(text) else _DIGITS.sub(' ', _NON_WORD.sub(' ', text.lower()))
+            for text in texts
+        ]
+        self.record('clean', time.perf_counter() - start)
+
+        # Setelah tanda baca dihapus, word_tokenize menghasilkan token yang sama
+        # dengan split() pada whitespace, tanpa biaya tokenizer punkt/Treebank
+        start = time.perf_counter()
+        tokenized = [text.split() if text is not None else None for text in cleaned]
+        self.record('tokenize', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stop_words = self.stop_words
+        filtered = [
+            [word for word in tokens if word not in stop_words] if tokens is not None else None
+            for tokens in tokenized
+        ]
+        self.record('stopwords', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stem = self._stem
+        results = [" ".join(stem(word) for word in tokens) if tokens is not None else "" for tokens in filtered]
+        self.record('stem', time.perf_counter() - start)
+        return results
+
+    def process_series(self, texts, n_jobs=1, shard_size=2000):
+        """
+        Memproses teks, dibagi ke n_jobs proses jika jumlahnya lebih dari satu shard.
+        n_jobs=-1 memakai semua CPU.
+        """
+        texts = list(texts)
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs <= 1 or len(texts) <= shard_size:
+            return self.process_many(texts)
+
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(self.stem_cache_size,)) as executor:
+            for shard_results, timings, hits, misses in executor.map(_process_shard, shards):
+                results.extend(shard_results)
+                for stage, seconds in timings.items():
+                    self.record(stage, seconds)
+                self._worker_hits += hits
+                self._worker_misses += misses
+        return results
+
+    def stats(self):
+        """
+        Waktu per tahap (detik) dan statistik cache stemming
+        """
+        info = self._stem.cache_info()
+        hits = info.hits + self._worker_hits
+        misses = info.misses + self._worker_misses
+        return {
+            'timings': dict(self.timings),
+            'stem_cache_size': info.currsize,
+            'stem_cache_hits': hits,
+            'stem_cache_misses': misses,
+            'stem_cache_hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0
+        }
+
+
+# Preprocessor di dalam proses worker, dibuat sekali oleh initializer pool
+_worker_preprocessor = None
+
+
+def _init_worker(stem_cache_size):
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(stem_cache_size)
+
+
+def _process_shard(texts):
+    """
+    Dijalankan di proses worker. Cache worker bersifat kumulatif antar shard,
+    sehingga yang dikirim balik hanya selisih statistik untuk shard ini.
+    """
+    preprocessor = _worker_preprocessor
+    before = preprocessor._stem.cache_info()
+    preprocessor.timings = {}
+    results = preprocessor.process_many(texts)
+    after = preprocessor._stem.cache_info()
+    return results, preprocessor.timings, after.hits - before.hits, after.misses - before.misses
+
+
+_default_preprocessor = None
+
+
+def get_default_preprocessor():
+    """
+    TextPreprocessor bersama untuk pemanggilan tanpa preprocessor eksplisit
+    """
+    global _default_preprocessor
+    if _default_preprocessor is None:
+        _default_preprocessor = TextPreprocessor()
+    return _default_preprocessor
+
+
+def preprocess_text(text):
+    """
+    Melakukan preprocessing pada teks deskripsi
+    """
+    return get_default_preprocessor().process(text)
 
 def extract_coordinates(coord_str):
     """
@@ -62,24 +187,34 @@ def extract_coordinates(coord_str):
     except:
         return np.nan, np.nan
 
-def preprocess_data(df):
+def preprocess_data(df, preprocessor=None, n_jobs=1):
     """
-    Melakukan preprocessing pada dataset tempat wisata
+    Melakukan preprocessing pada dataset tempat wisata.
+    preprocessor (TextPreprocessor) dipakai ulang antar pemanggilan agar cache
+    stemming dan catatan waktu per tahap terkumpul di satu tempat; n_jobs > 1
+    membagi deskripsi ke beberapa proses.
     """
+    if preprocessor is None:
+        preprocessor = get_default_preprocessor()
+    
     # Buat salinan dataframe
     processed_df = df.copy()
     
     # Preprocessing deskripsi
-    processed_df['deskripsi_processed'] = processed_df['deskripsi'].apply(preprocess_text)
+    processed_df['deskripsi_processed'] = preprocessor.process_series(processed_df['deskripsi'], n_jobs=n_jobs)
     
     # Konversi kategori dari string ke list
+    start = time.perf_counter()
     processed_df['kategori_list'] = processed_df['kategori'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else [])
     
     # Gabungkan kategori menjadi string untuk TF-IDF
     processed_df['kategori_str'] = processed_df['kategori_list'].apply(lambda x: ' '.join(x))
+    preprocessor.record('kategori', time.perf_counter() - start)
     
     # Ekstrak koordinat
+    start = time.perf_counter()
     processed_df['latitude'], processed_df['longitude'] = zip(*processed_df['koordinat'].apply(extract_coordinates))
+    preprocessor.record('koordinat', time.perf_counter() - start)
     
     # Buat fitur kombinasi
     processed_df['combined_features'] = (
@@ -98,17 +233,12 @@ def calculate_popularity_score(df, percentile=90):
     # Buat salinan dataframe
     df_popular = df.copy()
     
-    # Hitung parameter
-    C = df_popular['rating'].mean()  # rating rata-rata seluruh dataset
-    m = df_popular['jumlah_review'].quantile(percentile/100)  # jumlah review minimum
-    
-    # Fungsi untuk menghitung weighted rating
-    def weighted_rating(x, m=m, C=C):
-        v = x['jumlah_review']
-        R = x['rating']
-        return (v/(v+m) * R) + (m/(v+m) * C)
+    # Hitung parameter: rating rata-rata (C) dan jumlah review minimum (m)
+    ratings = df_popular['rating'].to_numpy(dtype=np.float64)
+    reviews = df_popular['jumlah_review'].to_numpy(dtype=np.float64)
+    C, m = popularity_parameters(ratings, reviews, percentile)
     
-    # Hitung weighted rating
-    df_popular['popularity_score'] = df_popular.apply(weighted_rating, axis=1)
+    # Hitung weighted rating untuk semua baris dalam satu operasi array
+    df_popular['popularity_score'] = weighted_rating(ratings, reviews, C, m)
     
     return df_popular 
\ No newline at end of file
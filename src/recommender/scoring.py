@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def popularity_parameters(ratings, reviews, percentile=90):
+    """
+    Menghitung parameter weighted rating: C (rating rata-rata) dan
+    m (jumlah review minimum pada persentil tertentu)
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    reviews = np.asarray(reviews, dtype=np.float64)
+    C = np.nanmean(ratings)
+    m = np.nanquantile(reviews, percentile/100)
+    return C, m
+
+
+def weighted_rating(ratings, reviews, C, m):
+    """
+    Menghitung weighted rating untuk semua baris sekaligus:
+    WR = (v/(v+m)) * R + (m/(v+m)) * C
+
+    Baris dengan v + m = 0 diberi nilai C.
+    """
+    R = np.asarray(ratings, dtype=np.float64)
+    v = np.asarray(reviews, dtype=np.float64)
+    denominator = v + m
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = (v / denominator) * R + (m / denominator) * C
+    return np.where(denominator == 0, C, scores)
+
+
+def top_n_positions(scores, top_n):
+    """
+    Posisi top_n skor tertinggi, terurut menurun (NaN di urutan terakhir).
+    Menggunakan argpartition sehingga hanya top_n elemen yang diurutkan.
+    """
+    scores = np.asarray(scores)
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64)
+    if top_n < len(scores):
+        # NaN diperlakukan sebagai skor terendah
+        keys = np.where(np.isnan(scores), -np.inf, scores)
+        positions = np.argpartition(-keys, top_n - 1)[:top_n]
+    else:
+        positions = np.arange(len(scores))
+    return positions[np.argsort(-scores[positions], kind='stable')]
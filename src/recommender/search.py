@@ -0,0 +1,264 @@
+import re
+from bisect import bisect_left, insort
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+# Token: rangkaian huruf/angka (unicode), termasuk token satu karakter
+TOKEN_PATTERN = r'(?u)\b\w+\b'
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+# Bobot kemunculan di nama relatif terhadap deskripsi
+NAME_BOOST = 3.0
+# Pengali skor untuk term yang hanya cocok sebagai prefiks (bukan kata utuh)
+PREFIX_WEIGHT = 0.5
+# Batas jumlah term hasil ekspansi prefiks (diambil yang paling sering muncul)
+MAX_PREFIX_EXPANSIONS = 64
+# Delta update_rows digabung ke indeks utama jika melebihi proporsi ini dari jumlah posting
+COMPACT_RATIO = 0.25
+# Parameter BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower()) if isinstance(text, str) else []
+
+
+class SearchIndex:
+    """
+    Inverted index full-text atas kolom nama dan deskripsi.
+
+    Setiap term memiliki posting list (posisi baris terurut naik + jumlah
+    kemunculan di nama dan di deskripsi); bobot BM25 (kemunculan di nama diberi
+    bobot NAME_BOOST) dihitung saat query dari statistik katalog terkini. Daftar
+    term disimpan terurut sehingga ekspansi prefiks cukup dengan binary search.
+    Query multi-term dijawab dengan irisan posting list (semua term harus cocok,
+    term terakhir maupun lainnya boleh berupa prefiks), sehingga biayanya
+    sebanding dengan panjang posting list, bukan jumlah baris katalog.
+
+    Baris yang ditambah/diubah lewat update_rows masuk ke posting list delta
+    kecil (posting lama baris yang berubah diabaikan), lalu digabung ke indeks
+    utama saat delta melebihi COMPACT_RATIO dari ukuran indeks utama.
+    """
+
+    def __init__(self, df):
+        self._build(df)
+
+    def _build(self, df):
+        names = df['nama'].fillna('').astype(str).tolist()
+        descriptions = df['deskripsi'].fillna('').astype(str).tolist()
+        self.n_rows = len(df)
+
+        # Posting list tambahan dari update_rows: term -> {baris: (tf nama, tf deskripsi)}
+        self.delta = {}
+        self.delta_terms = []
+        self.delta_row_terms = {}
+        self.delta_size = 0
+        # Baris indeks utama yang posting lamanya tidak berlaku lagi
+        self.stale = np.zeros(self.n_rows, dtype=bool)
+
+        vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, dtype=np.float32)
+        try:
+            vectorizer.fit([f"{n} {d}" for n, d in zip(names, descriptions)])
+        except ValueError:
+            # Katalog kosong atau tanpa token sama sekali
+            self.terms = []
+            self.indptr = np.zeros(1, dtype=np.int64)
+            self.rows = np.empty(0, dtype=np.int32)
+            self.name_tf = np.empty(0, dtype=np.float32)
+            self.desc_tf = np.empty(0, dtype=np.float32)
+            self.doc_len = np.zeros(self.n_rows, dtype=np.float64)
+            return
+
+        name_counts = vectorizer.transform(names)
+        desc_counts = vectorizer.transform(descriptions)
+        self.doc_len = (np.asarray(name_counts.sum(axis=1)).ravel() * NAME_BOOST
+                        + np.asarray(desc_counts.sum(axis=1)).ravel()).astype(np.float64)
+
+        # Posting per term (term, lalu baris terurut naik) dengan tf nama dan deskripsi terpisah
+        name_counts, desc_counts = name_counts.tocoo(), desc_counts.tocoo()
+        terms = np.concatenate([name_counts.col, desc_counts.col]).astype(np.int64)
+        rows = np.concatenate([name_counts.row, desc_counts.row]).astype(np.int64)
+        keys, inverse = np.unique(terms * self.n_rows + rows, return_inverse=True)
+        n_name = len(name_counts.data)
+        self.name_tf = np.bincount(inverse[:n_name], weights=name_counts.data, minlength=len(keys)).astype(np.float32)
+        self.desc_tf = np.bincount(inverse[n_name:], weights=desc_counts.data, minlength=len(keys)).astype(np.float32)
+        self.rows = (keys % self.n_rows).astype(np.int32)
+        n_terms = len(vectorizer.vocabulary_)
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(keys // self.n_rows, minlength=n_terms))]).astype(np.int64)
+
+        # Fitur CountVectorizer sudah terurut alfabetis
+        self.terms = vectorizer.get_feature_names_out().tolist()
+
+    def update_rows(self, df, rows):
+        """
+        Mengindeks ulang posisi baris yang baru ditambahkan atau diubah di df,
+        tanpa membangun ulang posting list baris lain
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        n_base = len(self.stale)
+        self.n_rows = len(df)
+        if len(self.doc_len) < self.n_rows:
+            self.doc_len = np.concatenate([self.doc_len, np.zeros(self.n_rows - len(self.doc_len))])
+
+        subset = df.iloc[rows]
+        names = subset['nama'].fillna('').astype(str).tolist()
+        descriptions = subset['deskripsi'].fillna('').astype(str).tolist()
+        for row, name, description in zip(rows.tolist(), names, descriptions):
+            # Posting lama baris ini (indeks utama maupun delta) tidak berlaku lagi
+            if row < n_base:
+                self.stale[row] = True
+            for term in self.delta_row_terms.pop(row, ()):
+                del self.delta[term][row]
+                self.delta_size -= 1
+
+            # tf (nama, deskripsi) per term, sama dengan CountVectorizer saat build
+            counts = {}
+            for token in tokenize(name):
+                n, d = counts.get(token, (0, 0))
+                counts[token] = (n + 1, d)
+            for token in tokenize(description):
+                n, d = counts.get(token, (0, 0))
+                counts[token] = (n, d + 1)
+            for term, tf in counts.items():
+                if term not in self.delta:
+                    self.delta[term] = {}
+                    insort(self.delta_terms, term)
+                self.delta[term][row] = tf
+            self.delta_row_terms[row] = list(counts)
+            self.delta_size += len(counts)
+            self.doc_len[row] = sum(n * NAME_BOOST + d for n, d in counts.values())
+
+        # Delta terlalu besar: gabungkan ke indeks utama
+        if self.delta_size > COMPACT_RATIO * max(len(self.rows), 1):
+            self._build(df)
+        return self
+
+    def _idf(self, doc_freq):
+        return np.log(1 + (self.n_rows - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def __len__(self):
+        return len(self.terms) + len(self.delta_terms)
+
+    def _postings(self, term):
+        """
+        (rows, tf nama, tf deskripsi) yang berlaku untuk satu term, terurut per baris
+        """
+        rows, name_tf, desc_tf = [], [], []
+        term_id = bisect_left(self.terms, term)
+        if term_id < len(self.terms) and self.terms[term_id] == term:
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            live = ~self.stale[self.rows[start:end]]
+            rows.append(self.rows[start:end][live])
+            name_tf.append(self.name_tf[start:end][live])
+            desc_tf.append(self.desc_tf[start:end][live])
+        delta = self.delta.get(term)
+        if delta:
+            rows.append(np.fromiter(delta.keys(), dtype=np.int32, count=len(delta)))
+            tf = np.asarray(list(delta.values()), dtype=np.float32)
+            name_tf.append(tf[:, 0])
+            desc_tf.append(tf[:, 1])
+        if not rows:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+        rows, name_tf, desc_tf = np.concatenate(rows), np.concatenate(name_tf), np.concatenate(desc_tf)
+        order = np.argsort(rows, kind='stable')
+        return rows[order], name_tf[order], desc_tf[order]
+
+    def _expansions(self, term):
+        """Term di indeks (utama maupun delta) yang diawali term, beserta doc freq-nya"""
+        upper = term + '\U0010ffff'
+        lo, hi = bisect_left(self.terms, term), bisect_left(self.terms, upper)
+        doc_freq = self.indptr[lo + 1:hi + 1] - self.indptr[lo:hi]
+        if lo < hi and self.stale.any():
+            # Posting baris yang sudah diubah tidak ikut dihitung
+            stale = self.stale[self.rows[self.indptr[lo]:self.indptr[hi]]]
+            stale_counts = np.add.reduceat(np.r_[stale, False], self.indptr[lo:hi] - self.indptr[lo])
+            doc_freq = doc_freq - np.where(doc_freq > 0, stale_counts, 0)
+        expansions = dict(zip(self.terms[lo:hi], doc_freq.tolist()))
+        lo, hi = bisect_left(self.delta_terms, term), bisect_left(self.delta_terms, upper)
+        for delta_term in self.delta_terms[lo:hi]:
+            expansions[delta_term] = expansions.get(delta_term, 0) + len(self.delta[delta_term])
+        return expansions
+
+    def _term_matches(self, term):
+        """
+        Mengembalikan (rows, skor) untuk satu term query: kata utuh dengan bobot
+        penuh ditambah ekspansi prefiks dengan bobot PREFIX_WEIGHT (skor per baris
+        diambil yang terbesar). Ekspansi prefiks memakai idf gabungan prefiks agar
+        kata yang jarang tidak mengalahkan kata umum yang cocok di nama, dan
+        kecocokan di nama selalu diberi skor di atas kecocokan deskripsi saja.
+        """
+        expansions = self._expansions(term)
+        if len(expansions) > MAX_PREFIX_EXPANSIONS:
+            frequent = sorted(expansions, key=lambda t: (-expansions[t], t))[:MAX_PREFIX_EXPANSIONS]
+            if term in expansions and term not in frequent:
+                frequent.append(term)
+            expansions = frequent
+        expansions = sorted(expansions)
+
+        avg_len = self.doc_len.mean() if self.n_rows and self.doc_len.mean() > 0 else 1.0
+        rows, scores, exact, in_name = [], [], [], []
+        for expansion in expansions:
+            term_rows, name_tf, desc_tf = self._postings(expansion)
+            if len(term_rows) == 0:
+                continue
+            # Bagian tf BM25; idf term diterapkan untuk kata utuh, idf prefiks untuk ekspansi
+            tf = name_tf * NAME_BOOST + desc_tf
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[term_rows] / avg_len)
+            term_scores = (tf * (BM25_K1 + 1) / (tf + norm)).astype(np.float32)
+            is_exact = expansion == term
+            rows.append(term_rows)
+            scores.append(term_scores * np.float32(self._idf(len(term_rows))) if is_exact else term_scores)
+            exact.append(np.full(len(term_rows), is_exact))
+            in_name.append(name_tf > 0)
+        if not rows:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores)
+        exact = np.concatenate(exact)
+        in_name = np.concatenate(in_name)
+
+        order = np.argsort(rows, kind='stable')
+        rows, scores, exact, in_name = rows[order], scores[order], exact[order], in_name[order]
+        first = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+
+        prefix_idf = self._idf(len(first)) * PREFIX_WEIGHT
+        scores = np.where(exact, scores, scores * prefix_idf).astype(np.float32)
+
+        # Skor terbesar per baris; baris yang namanya memuat term (utuh atau
+        # prefiks) selalu di atas baris yang hanya cocok di deskripsi, karena
+        # saturasi BM25 membuat NAME_BOOST saja tidak cukup melawan kata langka
+        scores = np.maximum.reduceat(scores, first)
+        name_match = np.logical_or.reduceat(in_name, first)
+        if name_match.any() and not name_match.all():
+            scores[name_match] += scores[~name_match].max()
+        return rows[first], scores
+
+    def search(self, query, rows=None, limit=None):
+        """
+        Mengembalikan posisi baris yang cocok dengan semua term di query, terurut
+        berdasarkan relevansi (skor tertinggi dulu). rows (opsional) membatasi
+        hasil ke posisi baris tertentu, misalnya hasil filter facet.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or len(self) == 0:
+            return np.empty(0, dtype=np.int32)
+
+        # Mulai dari term dengan kandidat paling sedikit agar irisan tetap kecil
+        matches = sorted((self._term_matches(term) for term in terms), key=lambda m: len(m[0]))
+        result_rows, result_scores = matches[0]
+        for term_rows, term_scores in matches[1:]:
+            if len(result_rows) == 0:
+                break
+            result_rows, left, right = np.intersect1d(result_rows, term_rows, assume_unique=True, return_indices=True)
+            result_scores = result_scores[left] + term_scores[right]
+
+        if rows is not None:
+            keep = np.isin(result_rows, rows)
+            result_rows, result_scores = result_rows[keep], result_scores[keep]
+
+        order = np.argsort(-result_scores, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return result_rows[order]
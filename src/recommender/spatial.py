@@ -0,0 +1,230 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+# Clustering marker peta: jumlah sel cluster per lebar tile (256 px -> sel ~64 px)
+CLUSTER_CELLS_PER_TILE = 4
+# Mulai zoom ini marker tidak lagi dikelompokkan
+CLUSTER_MAX_ZOOM = 14
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Formula Haversine yang tervektorisasi (input dalam derajat, output dalam km)
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    return 2 * np.arcsin(np.sqrt(a)) * EARTH_RADIUS_KM
+
+
+class GeoGridIndex:
+    """
+    Indeks spasial berbasis grid lintang/bujur.
+
+    Setiap koordinat dimasukkan ke sel berukuran cell_size derajat. Isi satu sel
+    disimpan sebagai array (baris, lintang, bujur) yang terurut menurut baris,
+    sehingga perubahan data hanya menyentuh sel lama dan sel baru dari baris yang
+    berubah. Query radius hanya memeriksa sel yang beririsan dengan kotak
+    pembatas radius. Indeks baris yang dikembalikan adalah posisi (iloc) pada
+    DataFrame asal.
+    """
+
+    def __init__(self, latitudes, longitudes, cell_size=0.5):
+        self.cell_size = cell_size
+        self.n_lon_cells = int(np.ceil(360 / cell_size))
+
+        # key sel -> (row_ids, latitudes, longitudes)
+        self.cells = {}
+        # key sel per baris yang memiliki koordinat
+        self.row_cells = {}
+        self._cell_keys = np.empty(0, dtype=np.int64)
+        self.update_rows(np.arange(len(latitudes)), latitudes, longitudes)
+
+    def update_rows(self, rows, latitudes, longitudes):
+        """
+        Memasukkan ulang titik untuk posisi baris yang baru ditambahkan atau diubah
+        (latitudes/longitudes sejajar dengan rows). Hanya sel lama dan sel baru
+        dari baris tersebut yang dibangun ulang.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        # Buang titik lama dari baris yang berubah
+        removed = {}
+        for row in rows.tolist():
+            key = self.row_cells.pop(row, None)
+            if key is not None:
+                removed.setdefault(key, []).append(row)
+
+        # Abaikan baris tanpa koordinat
+        valid = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        rows, latitudes, longitudes = rows[valid], latitudes[valid], longitudes[valid]
+        keys = self._cell_key(self._lat_cell(latitudes), self._lon_cell(longitudes))
+        added = {}
+        for i, (row, key) in enumerate(zip(rows.tolist(), keys.tolist())):
+            self.row_cells[row] = key
+            added.setdefault(key, []).append(i)
+
+        cells_changed = False
+        for key in removed.keys() | added.keys():
+            cell_rows, cell_lats, cell_lons = self.cells.get(key, (
+                np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)))
+            if key in removed:
+                keep = ~np.isin(cell_rows, removed[key])
+                cell_rows, cell_lats, cell_lons = cell_rows[keep], cell_lats[keep], cell_lons[keep]
+            if key in added:
+                new = added[key]
+                cell_rows = np.concatenate([cell_rows, rows[new]])
+                cell_lats = np.concatenate([cell_lats, latitudes[new]])
+                cell_lons = np.concatenate([cell_lons, longitudes[new]])
+                order = np.argsort(cell_rows, kind='stable')
+                cell_rows, cell_lats, cell_lons = cell_rows[order], cell_lats[order], cell_lons[order]
+            if len(cell_rows):
+                cells_changed |= key not in self.cells
+                self.cells[key] = (cell_rows.astype(np.int32), cell_lats, cell_lons)
+            elif key in self.cells:
+                del self.cells[key]
+                cells_changed = True
+
+        # Daftar sel terurut hanya dibangun ulang jika himpunan sel berubah
+        if cells_changed:
+            self._cell_keys = np.array(sorted(self.cells), dtype=np.int64)
+        return self
+
+    @property
+    def cell_keys(self):
+        return self._cell_keys
+
+    def __len__(self):
+        return len(self.row_cells)
+
+    def _lat_cell(self, lat):
+        return np.floor((np.asarray(lat) + 90) / self.cell_size).astype(np.int64)
+
+    def _lon_cell(self, lon, wrap=True):
+        cell = np.floor((np.asarray(lon) + 180) / self.cell_size).astype(np.int64)
+        return cell % self.n_lon_cells if wrap else cell
+
+    def _cell_key(self, lat_cell, lon_cell):
+        return lat_cell * self.n_lon_cells + lon_cell
+
+    def _candidates(self, lat_min, lat_max, lon_min, lon_max):
+        """
+        (row_ids, latitudes, longitudes) semua titik di sel yang beririsan dengan kotak
+        """
+        lat_cells = np.arange(self._lat_cell(max(lat_min, -90)), self._lat_cell(min(lat_max, 90)) + 1)
+        if lon_max - lon_min >= 360:
+            lon_cells = np.arange(self.n_lon_cells)
+        else:
+            # Tangani kotak yang melewati garis bujur 180
+            lon_cells = np.unique(np.arange(
+                self._lon_cell(lon_min, wrap=False), self._lon_cell(lon_max, wrap=False) + 1
+            ) % self.n_lon_cells)
+
+        n_cells = len(lat_cells) * len(lon_cells)
+        if n_cells > len(self.cell_keys):
+            # Kotak sangat besar: lebih murah menyaring sel yang terisi saja
+            cell_lat = self.cell_keys // self.n_lon_cells
+            cell_lon = self.cell_keys % self.n_lon_cells
+            hit = np.isin(cell_lat, lat_cells) & np.isin(cell_lon, lon_cells)
+            cells = [self.cells[key] for key in self.cell_keys[hit].tolist()]
+        else:
+            keys = self._cell_key(lat_cells[:, None], lon_cells[None, :]).ravel()
+            cells = [self.cells[key] for key in keys.tolist() if key in self.cells]
+
+        if not cells:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+        return tuple(np.concatenate(parts) for parts in zip(*cells))
+
+    def radius_query(self, lat, lon, max_distance, top_n=None):
+        """
+        Mengembalikan (row_ids, jarak_km) untuk titik dalam radius max_distance km,
+        terurut dari yang terdekat dan dibatasi top_n jika diberikan
+        """
+        lat_delta = max_distance / KM_PER_DEGREE
+        cos_lat = np.cos(np.radians(min(abs(lat) + lat_delta, 90)))
+        lon_delta = 360 if cos_lat < 1e-6 else max_distance / (KM_PER_DEGREE * cos_lat)
+
+        row_ids, latitudes, longitudes = self._candidates(lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta)
+        distances = haversine_km(lat, lon, latitudes, longitudes)
+
+        inside = distances <= max_distance
+        row_ids = row_ids[inside]
+        distances = distances[inside]
+
+        if top_n is not None and top_n < len(distances):
+            nearest = np.argpartition(distances, top_n - 1)[:top_n]
+            row_ids = row_ids[nearest]
+            distances = distances[nearest]
+
+        order = np.argsort(distances, kind='stable')
+        return row_ids[order], distances[order]
+
+    def bbox_query(self, lat_min, lat_max, lon_min, lon_max):
+        """
+        Mengembalikan (row_ids, latitudes, longitudes) untuk titik di dalam kotak.
+        lon_min > lon_max berarti kotak melewati garis bujur 180.
+        """
+        crosses = lon_min > lon_max
+        row_ids, latitudes, longitudes = self._candidates(lat_min, lat_max, lon_min, lon_max + 360 if crosses else lon_max)
+
+        inside = (latitudes >= lat_min) & (latitudes <= lat_max)
+        if crosses:
+            inside &= (longitudes >= lon_min) | (longitudes <= lon_max)
+        else:
+            inside &= (longitudes >= lon_min) & (longitudes <= lon_max)
+        return row_ids[inside], latitudes[inside], longitudes[inside]
+
+    def nearest(self, lat, lon, top_n=10):
+        """
+        Mengembalikan (row_ids, jarak_km) top_n titik terdekat tanpa batas radius
+        """
+        radius = self.cell_size * KM_PER_DEGREE
+        max_radius = np.pi * EARTH_RADIUS_KM
+        while True:
+            row_ids, distances = self.radius_query(lat, lon, radius, top_n)
+            # Semua titik di luar radius pasti lebih jauh dari yang sudah ditemukan
+            if len(row_ids) >= min(top_n, len(self)) or radius >= max_radius:
+                return row_ids, distances
+            radius *= 2
+
+
+def zoom_cell_size(zoom):
+    """
+    Ukuran sel cluster (derajat) untuk level zoom peta web (tile 360 / 2^zoom derajat)
+    """
+    return 360 / 2 ** zoom / CLUSTER_CELLS_PER_TILE
+
+
+def grid_clusters(latitudes, longitudes, cell_size, scores=None):
+    """
+    Mengelompokkan titik ke sel grid berukuran cell_size derajat.
+
+    Mengembalikan (labels, counts, centroid_lat, centroid_lon, representatives):
+    labels adalah nomor cluster per titik, dan representatives berisi posisi
+    titik dengan scores tertinggi di setiap cluster (titik pertama jika scores
+    tidak diberikan).
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    n_lon_cells = int(np.ceil(360 / cell_size)) + 1
+    keys = (np.floor((latitudes + 90) / cell_size).astype(np.int64) * n_lon_cells
+            + np.floor((longitudes + 180) / cell_size).astype(np.int64))
+    _, labels = np.unique(keys, return_inverse=True)
+
+    counts = np.bincount(labels)
+    centroid_lat = np.bincount(labels, weights=latitudes) / counts
+    centroid_lon = np.bincount(labels, weights=longitudes) / counts
+
+    # Urutkan per (cluster, skor menurun); elemen pertama tiap cluster adalah wakilnya
+    if scores is None:
+        order = np.argsort(labels, kind='stable')
+    else:
+        scores = np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=-np.inf)
+        order = np.lexsort((-scores, labels))
+    first = np.flatnonzero(np.r_[True, labels[order][1:] != labels[order][:-1]])
+    return labels, counts, centroid_lat, centroid_lon, order[first]
@@ -3,6 +3,8 @@ import numpy as np
 import ast
 import json
 
+from .names import normalize_name
+
 def load_csv_data(file_path):
     """
     Memuat data dari file CSV
@@ -70,7 +72,24 @@ def format_recommendation_results(recommendations):
     if isinstance(recommendations, str):
         return {"error": recommendations}
     
-    results = []
+    return list(iter_recommendation_results(recommendations))
+
+def is_error_result(results):
+    """
+    True jika hasil format_recommendation_results berupa pesan error
+    (misalnya nama tidak ditemukan), yang tidak perlu disimpan di cache
+    """
+    return isinstance(results, dict) and "error" in results
+
+def iter_recommendation_results(recommendations):
+    """
+    Versi generator dari format_recommendation_results: satu dict per baris,
+    dibentuk saat dibutuhkan (dipakai untuk respons streaming)
+    """
+    if isinstance(recommendations, str):
+        yield {"error": recommendations}
+        return
+    
     for _, row in recommendations.iterrows():
         item = {
             "nama": row["nama"],
@@ -96,38 +115,35 @@ def format_recommendation_results(recommendations):
         elif "popularity_score" in row:
             item["skor"] = round(row["popularity_score"], 3)
             
-        results.append(item)
-        
-    return results
+        yield item
 
-def get_attraction_details(df, name):
+def get_attraction_details(df, name, name_index=None):
     """
-    Mendapatkan detail tempat wisata berdasarkan nama (pencarian fleksibel)
+    Mendapatkan detail tempat wisata berdasarkan nama (pencarian fleksibel).
+    Jika name_index (NameIndex dari df yang sama) diberikan, nama dicari lewat
+    dict nama ternormalisasi dengan fallback fuzzy; df tidak pernah diubah.
     """
     try:
-        # Lakukan preprocessing pada nama input untuk pencarian fleksibel
-        processed_name = name.lower() # Konversi ke lowercase
-        processed_name = ''.join(e for e in processed_name if e.isalnum()) # Hapus non-alfanumerik
-
-        # Lakukan preprocessing pada kolom nama di DataFrame
-        # Tambahkan kolom sementara untuk pencarian
-        df['_processed_nama'] = df['nama'].str.lower()
-        df['_processed_nama'] = df['_processed_nama'].apply(lambda x: ''.join(e for e in x if e.isalnum()) if isinstance(x, str) else '')
-
-        # Cari tempat wisata dengan nama yang diproses yang sama
-        attraction = df[df["_processed_nama"] == processed_name]
-
-        # Hapus kolom sementara
-        df = df.drop(columns=['_processed_nama'])
-
-        if attraction.empty:
-            # Coba cari berdasarkan substring jika pencarian persis gagal
-            substring_match = df[df['nama'].str.lower().str.contains(processed_name, na=False)]
-            if not substring_match.empty:
-                 attraction = substring_match.iloc[0]
-                 print(f"Menggunakan pencarian substring untuk '{name}', ditemukan '{attraction['nama']}'")
-            else:
-                 return {"error": f"Tempat wisata dengan nama '{name}' tidak ditemukan."}
+        if name_index is not None:
+            row = name_index.resolve(name)
+            if row is None:
+                return {"error": f"Tempat wisata dengan nama '{name}' tidak ditemukan."}
+            attraction = df.iloc[[row]]
+        else:
+            # Lakukan preprocessing pada nama input untuk pencarian fleksibel
+            processed_name = normalize_name(name)
+
+            # Cari tempat wisata dengan nama yang diproses yang sama (tanpa mengubah df)
+            processed_names = df['nama'].map(normalize_name)
+            attraction = df[processed_names == processed_name]
+
+            if attraction.empty:
+                # Coba cari berdasarkan substring jika pencarian persis gagal
+                attraction = df[processed_names.str.contains(processed_name, regex=False)] if processed_name else attraction
+                if not attraction.empty:
+                     print(f"Menggunakan pencarian substring untuk '{name}', ditemukan '{attraction['nama'].iloc[0]}'")
+                else:
+                     return {"error": f"Tempat wisata dengan nama '{name}' tidak ditemukan."}
 
         # Ambil data pertama jika ada lebih dari satu (setelah pencarian fleksibel)
         attraction = attraction.iloc[0]
@@ -142,7 +158,8 @@ def get_attraction_details(df, name):
             "jumlah_review": int(attraction["jumlah_review"]) if not pd.isna(attraction["jumlah_review"]) else None,
             "deskripsi": attraction["deskripsi"] if not pd.isna(attraction["deskripsi"]) else None,
             "url": attraction["url"] if "url" in attraction and not pd.isna(attraction["url"]) else None,
-            "foto": ast.literal_eval(attraction["foto"]) if "foto" in attraction and isinstance(attraction["foto"], str) else None,
+            # Foto bisa berupa path tunggal atau string list
+            "foto": (ast.literal_eval(attraction["foto"]) if attraction["foto"].startswith('[') else attraction["foto"]) if "foto" in attraction and isinstance(attraction["foto"], str) else None,
             "kategori": attraction["kategori_list"] if "kategori_list" in attraction and isinstance(attraction["kategori_list"], list) else 
                         (ast.literal_eval(attraction["kategori"]) if "kategori" in attraction and isinstance(attraction["kategori"], str) else None)
         }
@@ -160,10 +177,28 @@ def get_attraction_details(df, name):
     except Exception as e:
         return {"error": f"Error saat mendapatkan detail tempat wisata: {str(e)}"}
 
-def filter_attractions(df, category=None, province=None, min_rating=None, max_rating=None, search_query=None):
+def filter_attractions(df, category=None, province=None, min_rating=None, max_rating=None, search_query=None, facet_index=None, search_index=None, search_mode='index'):
     """
-    Memfilter tempat wisata berdasarkan kriteria
+    Memfilter tempat wisata berdasarkan kriteria.
+    Jika facet_index (FacetIndex yang dibangun dari df yang sama) diberikan,
+    filter kategori, provinsi, dan rating dijawab langsung dari indeks.
+    Jika search_index (SearchIndex dari df yang sama) diberikan, search_query dicari
+    lewat inverted index (prefiks, multi-term) dan hasilnya terurut berdasarkan
+    relevansi; search_mode='substring' memakai pencarian substring lama.
     """
+    use_index = search_index is not None and search_query and search_mode != 'substring'
+    # Tanpa filter facet, pencarian tidak perlu dibatasi ke seluruh baris (np.isin O(N))
+    has_facets = bool(category or province) or min_rating is not None or max_rating is not None
+
+    if facet_index is not None:
+        if use_index and not has_facets:
+            return df.iloc[search_index.search(search_query)]
+        rows = facet_index.lookup(category, province, min_rating, max_rating)
+        if use_index:
+            return df.iloc[search_index.search(search_query, rows=rows)]
+        filtered_df = df.iloc[rows]
+        return _filter_search_query(filtered_df, search_query)
+    
     filtered_df = df.copy()
     
     # Filter berdasarkan kategori (case-insensitive)
@@ -190,7 +225,15 @@ def filter_attractions(df, category=None, province=None, min_rating=None, max_ra
     if max_rating is not None:
         filtered_df = filtered_df[filtered_df['rating'] <= max_rating]
     
-    # Filter berdasarkan kueri pencarian pada nama atau deskripsi
+    if use_index:
+        rows = df.index.get_indexer(filtered_df.index) if has_facets else None
+        return df.iloc[search_index.search(search_query, rows=rows)]
+    return _filter_search_query(filtered_df, search_query)
+
+def _filter_search_query(filtered_df, search_query):
+    """
+    Filter berdasarkan kueri pencarian pada nama atau deskripsi
+    """
     if search_query:
         search_query = search_query.lower()
         name_match = filtered_df['nama'].str.lower().str.contains(search_query, na=False)
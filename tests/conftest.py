@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tambahkan root repo ke path agar modul src bisa diimpor dari tests/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
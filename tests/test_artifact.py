@@ -0,0 +1,28 @@
+import numpy as np
+
+from benchmarks.synthetic import generate_catalogue
+from src.recommender.model import TourismRecommender
+
+
+def _is_memmap(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_numeric_columns_stay_memory_mapped_after_load(tmp_path):
+    recommender = TourismRecommender()
+    recommender.fit(generate_catalogue(200, seed=3))
+    recommender.save_model(str(tmp_path / 'model'))
+
+    loaded = TourismRecommender().load_model(str(tmp_path / 'model'))
+    for column in ('rating', 'jumlah_review', 'latitude', 'longitude'):
+        assert _is_memmap(loaded.df[column].to_numpy())
+        assert _is_memmap(loaded.df_popular[column].to_numpy())
+    assert _is_memmap(loaded.neighbors.indices)
+
+    # Data baru tetap bisa ditambahkan (kolom memory-mapped bersifat read-only)
+    summary = loaded.add_attractions(generate_catalogue(3, seed=4).assign(id=lambda d: d['id'] + 1000))
+    assert summary['total'] == 203
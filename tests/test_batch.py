@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks.synthetic import generate_catalogue
+from src.recommender import TourismRecommender
+from src.recommender.batch import run_batch
+
+
+@pytest.fixture(scope='module')
+def recommender():
+    return TourismRecommender(n_neighbors=10).fit(generate_catalogue(100, seed=5))
+
+
+@pytest.mark.parametrize('query', [
+    {'type': 'popularity', 'category': 5},
+    {'type': 'popularity', 'province': ['Bali']},
+    {'type': 'hybrid', 'category': {'nama': 'alam'}, 'lat': -6.2, 'lon': 106.8},
+    {'type': 'content', 'name': 12},
+])
+def test_malformed_query_does_not_fail_the_batch(recommender, query):
+    results = run_batch(recommender, [query, {'type': 'popularity', 'limit': 3}])
+    assert isinstance(results[0], str) and 'harus berupa teks' in results[0]
+    assert len(results[1]) == 3
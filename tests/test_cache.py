@@ -0,0 +1,38 @@
+from src.recommender.cache import ResponseCache, make_cache_key
+from src.recommender.utils import format_recommendation_results, is_error_result
+
+
+def test_error_results_are_not_cached():
+    cache = ResponseCache(max_size=4, ttl=None)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return format_recommendation_results("Tempat wisata tidak ditemukan. Coba nama lain.")
+
+    key = make_cache_key('v1', 'content', name='tidak ada', limit=10)
+    for _ in range(3):
+        result = cache.get_or_compute(key, compute, should_cache=lambda r: not is_error_result(r))
+        assert is_error_result(result)
+    assert len(calls) == 3
+    assert len(cache) == 0
+
+
+def test_successful_results_are_cached():
+    cache = ResponseCache(max_size=4, ttl=None)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{"nama": "Pantai Kuta", "id": 1}]
+
+    key = make_cache_key('v1', 'content', name='Pantai Kuta', limit=10)
+    for _ in range(3):
+        assert cache.get_or_compute(key, compute, should_cache=lambda r: not is_error_result(r))[0]["id"] == 1
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_empty_result_is_not_an_error():
+    assert not is_error_result([])
+    assert is_error_result({"error": "Tidak ada tempat wisata yang sesuai."})
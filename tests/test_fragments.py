@@ -0,0 +1,15 @@
+import json
+
+import numpy as np
+
+from src.recommender import compact_json
+
+
+def test_compact_json_is_compact_and_keeps_unicode():
+    line = compact_json({'nama': 'Curug Çibeureum', 'kategori': ['alam', 'air terjun']})
+    assert line == '{"nama":"Curug Çibeureum","kategori":["alam","air terjun"]}'
+
+
+def test_compact_json_serialises_numpy_scalars():
+    line = compact_json({'skor': np.float32(0.5), 'id': np.int64(7)})
+    assert json.loads(line) == {'skor': 0.5, 'id': 7}
@@ -0,0 +1,100 @@
+"""
+add_attractions/update_attractions memperbarui tetangga dan indeks pendukung
+secara inkremental; hasilnya harus sama dengan membangun ulang dari data terbaru.
+"""
+import numpy as np
+import pytest
+from scipy import sparse
+
+from benchmarks.synthetic import generate_catalogue
+from src.recommender import TourismRecommender
+from src.recommender.facets import FacetIndex
+from src.recommender.names import NameIndex
+from src.recommender.neighbors import TopKNeighbors
+from src.recommender.search import SearchIndex
+from src.recommender.spatial import GeoGridIndex
+
+
+def random_rows(rng, n_rows, n_features=200):
+    return sparse.random(n_rows, n_features, density=0.05, random_state=rng, format='csr')
+
+
+def assert_same_neighbors(actual, expected):
+    np.testing.assert_array_equal(actual.indptr, expected.indptr)
+    np.testing.assert_allclose(actual.scores, expected.scores, rtol=1e-6)
+    # Id boleh berbeda hanya pada skor yang sama persis (urutan tie)
+    differ = actual.indices != expected.indices
+    np.testing.assert_allclose(actual.scores[differ], expected.scores[differ], rtol=1e-6)
+
+
+@pytest.mark.parametrize('n_rows, k', [(300, 10), (40, 50), (3, 5)])
+def test_topk_update_matches_build(n_rows, k):
+    rng = np.random.default_rng(0)
+    matrix = random_rows(rng, n_rows)
+    index = TopKNeighbors.build(matrix, k=k, chunk_size=64)
+
+    # Ubah sebagian baris lama lalu tambahkan baris baru
+    changed = rng.choice(n_rows, size=max(1, n_rows // 10), replace=False)
+    updated = matrix.tolil()
+    for row in changed:
+        updated[row] = random_rows(rng, 1)
+    updated = sparse.vstack([updated.tocsr(), random_rows(rng, 6)]).tocsr()
+    index.update(updated, np.r_[changed, np.arange(n_rows, n_rows + 6)], chunk_size=16)
+
+    assert_same_neighbors(index, TopKNeighbors.build(updated, k=k))
+
+
+def test_topk_update_refills_rows_that_lost_a_neighbor():
+    rng = np.random.default_rng(1)
+    matrix = random_rows(rng, 200)
+    index = TopKNeighbors.build(matrix, k=5)
+    target = 0
+    neighbor = index.neighbors(target)[0][0]
+
+    # Tetangga teratas baris 0 menjadi tidak mirip sama sekali dengan katalog
+    updated = matrix.tolil()
+    updated[neighbor] = 0
+    updated = updated.tocsr()
+    index.update(updated, [neighbor])
+
+    expected = TopKNeighbors.build(updated, k=5)
+    assert len(index.neighbors(target)[0]) == 5
+    np.testing.assert_allclose(index.neighbors(target)[1], expected.neighbors(target)[1], rtol=1e-6)
+
+
+def test_model_ingest_matches_rebuilt_indexes():
+    catalogue = generate_catalogue(300, seed=3)
+    model = TourismRecommender(n_neighbors=20).fit(catalogue.iloc[:280])
+
+    model.add_attractions(catalogue.iloc[280:])
+    changed = catalogue.iloc[:10].copy()
+    changed['nama'] = changed['nama'] + ' Baru'
+    changed['deskripsi'] = 'pantai pasir putih dengan ombak tenang ' + changed['deskripsi']
+    changed['koordinat'] = "{'latitude': -6.2, 'longitude': 106.8}"
+    model.update_attractions(changed)
+
+    assert_same_neighbors(model.neighbors, TopKNeighbors.build(model.tfidf_matrix, k=20))
+
+    rebuilt = GeoGridIndex(model.df['latitude'].to_numpy(), model.df['longitude'].to_numpy())
+    np.testing.assert_array_equal(model.geo_index.cell_keys, rebuilt.cell_keys)
+    assert model.geo_index.row_cells == rebuilt.row_cells
+    for key, arrays in rebuilt.cells.items():
+        for incremental, expected in zip(model.geo_index.cells[key], arrays):
+            np.testing.assert_array_equal(incremental, expected)
+
+    rebuilt = FacetIndex(model.df)
+    for facet in ('categories', 'provinces', 'ratings'):
+        incremental = getattr(model.facet_index, facet)
+        assert incremental.keys() == getattr(rebuilt, facet).keys()
+        for key, rows in getattr(rebuilt, facet).items():
+            np.testing.assert_array_equal(incremental[key], rows)
+    np.testing.assert_array_equal(model.facet_index.rating_keys, rebuilt.rating_keys)
+
+    rebuilt = SearchIndex(model.df)
+    for query in ('pantai', 'pantai pas', 'baru', changed['nama'].iloc[0], 'gun'):
+        np.testing.assert_array_equal(model.search_index.search(query), rebuilt.search(query))
+
+    rebuilt = NameIndex(model.df['nama'])
+    assert model.name_index.exact == rebuilt.exact
+    for name in list(changed['nama']) + list(catalogue['nama'].iloc[:10]) + list(catalogue['nama'].iloc[280:]):
+        assert model.name_index.resolve(name, fuzzy=False) == rebuilt.resolve(name, fuzzy=False)
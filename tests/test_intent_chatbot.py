@@ -0,0 +1,33 @@
+import json
+import os
+import threading
+
+from src.chatbot.inference.intent_chatbot import IntentChatbot
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_match_counts_are_exact_under_concurrent_calls():
+    bot = IntentChatbot(
+        model_dir=os.path.join(ROOT, 'models', 'chatbot_intent'),
+        intents_file=os.path.join(ROOT, 'data', 'intents_wisata.json'),
+        backend='numpy'
+    )
+    with open(os.path.join(ROOT, 'data', 'intents_wisata.json'), 'r', encoding='utf-8') as f:
+        pattern = json.load(f)['intents'][0]['patterns'][0]
+    messages = [pattern, 'kalimat yang tidak ada di data training sama sekali']
+    n_threads, n_calls = 8, 200
+
+    def worker():
+        for _ in range(n_calls):
+            bot.predict_intents(messages)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = bot.fast_path_stats()
+    assert stats['exact'] + stats['stemmed'] == n_threads * n_calls
+    assert stats['model'] == n_threads * n_calls
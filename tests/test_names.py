@@ -0,0 +1,36 @@
+from src.recommender.names import NameIndex
+
+NAMES = [
+    'Pantai Kuta',
+    'Pantai Kuta Baru',
+    'Pantai Parangtritis',
+    'Pantai Ulee Lheue',
+    'Pulau Kelayang',
+    'Taman Mini Indonesia Indah',
+]
+
+
+def test_generic_word_is_ambiguous():
+    index = NameIndex(NAMES)
+    assert index.resolve('pantai') is None
+    assert index.resolve('Pantai') is None
+
+
+def test_fuzzy_typo_and_unique_substring_resolve():
+    index = NameIndex(NAMES)
+    assert index.resolve('pantai kuta') == 0
+    assert index.resolve('Pantai Parangtritsi') == 2
+    assert index.resolve('ulee lheue') == 3
+    assert index.resolve('pulau kelyang') == 4
+
+
+def test_short_substring_is_not_accepted():
+    index = NameIndex(NAMES)
+    assert index.resolve('mini') is None
+
+
+def test_typo_contained_in_several_names_keeps_best_match():
+    index = NameIndex(NAMES)
+    # "pantaikut" termuat di "Pantai Kuta" dan "Pantai Kuta Baru"
+    assert index.resolve('pantaikut') == 0
+    assert index.resolve('pantai kuta bar') == 1
@@ -0,0 +1,65 @@
+"""
+Runtime NumPy chatbot (chatbot_model.npz) dibandingkan dengan model Keras yang
+disimpan (chatbot_model.h5). Tes Keras dilewati jika TensorFlow tidak terinstal
+(serving tidak memerlukannya, lihat requirements-training.txt).
+"""
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src.chatbot.encoder import BagOfWordsEncoder
+from src.chatbot.inference.numpy_model import NumpyIntentModel
+from src.chatbot.stemming import stem
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODEL_DIR = os.path.join(ROOT, 'models', 'chatbot_intent')
+INTENTS_FILE = os.path.join(ROOT, 'data', 'intents_wisata.json')
+
+
+@pytest.fixture(scope='module')
+def patterns_matrix():
+    with open(INTENTS_FILE, 'r', encoding='utf-8') as f:
+        patterns = [p for intent in json.load(f)['intents'] for p in intent['patterns']]
+    encoder = BagOfWordsEncoder.from_file(os.path.join(MODEL_DIR, 'words.pkl'), stem=stem)
+    return encoder.encode_batch(patterns)
+
+
+def test_numpy_model_shape_matches_vocabulary(patterns_matrix):
+    model = NumpyIntentModel.load(os.path.join(MODEL_DIR, 'chatbot_model.npz'))
+    with open(os.path.join(MODEL_DIR, 'classes.pkl'), 'rb') as f:
+        n_classes = len(pickle.load(f))
+
+    probabilities = model.predict(patterns_matrix)
+    assert model.input_size == patterns_matrix.shape[1]
+    assert probabilities.shape == (patterns_matrix.shape[0], n_classes)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, rtol=1e-5)
+
+
+def test_numpy_matches_keras(patterns_matrix):
+    tf = pytest.importorskip('tensorflow')
+    keras_model = tf.keras.models.load_model(os.path.join(MODEL_DIR, 'chatbot_model.h5'))
+    numpy_model = NumpyIntentModel.load(os.path.join(MODEL_DIR, 'chatbot_model.npz'))
+
+    expected = keras_model.predict(patterns_matrix, verbose=0)
+    actual = numpy_model.predict(patterns_matrix)
+    np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+    assert (actual.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+
+def test_auto_backend_does_not_import_tensorflow():
+    # Proses terpisah agar modul yang sudah diimpor tes lain tidak ikut terhitung
+    code = (
+        "import sys\n"
+        "from src.chatbot.inference.intent_chatbot import IntentChatbot\n"
+        "bot = IntentChatbot()\n"
+        "assert bot.backend == 'numpy', bot.backend\n"
+        "assert 'tensorflow' not in sys.modules\n"
+        "print(bot.get_response('halo'))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
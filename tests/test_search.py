@@ -0,0 +1,59 @@
+import pandas as pd
+
+from src.recommender.search import SearchIndex
+
+
+def _index():
+    df = pd.DataFrame({
+        'nama': ['Rindu Alam', 'Pantai Kuta', 'Pantai Pandawa', 'Museum Angkut', 'Curug Cimahi'],
+        'deskripsi': [
+            'Restoran dengan panorama kota, pan bakar, dan pemandangan pantai.',
+            'Pantai berpasir putih di Bali.',
+            'Pantai dengan tebing kapur.',
+            'Museum kendaraan di Batu.',
+            'Air terjun dengan panorama hutan pinus.',
+        ],
+    })
+    return SearchIndex(df)
+
+
+def test_name_prefix_outranks_description_matches():
+    rows = _index().search('pan').tolist()
+    assert set(rows[:2]) == {1, 2}
+    assert set(rows[2:]) == {0, 4}
+
+
+def test_full_word_in_name_ranks_first():
+    rows = _index().search('museum').tolist()
+    assert rows == [3]
+
+
+def test_plain_text_search_does_not_restrict_rows(monkeypatch):
+    from src.recommender.facets import FacetIndex
+    from src.recommender.utils import filter_attractions
+
+    df = pd.DataFrame({
+        'nama': ['Pantai Kuta', 'Museum Angkut'],
+        'deskripsi': ['Pantai di Bali.', 'Museum kendaraan.'],
+        'provinsi': ['Bali', 'Jawa Timur'],
+        'rating': [4.5, 4.7],
+        'kategori_list': [['pantai'], ['museum']],
+    })
+    search_index = SearchIndex(df)
+    calls = []
+    search = search_index.search
+
+    def recording_search(query, rows=None, limit=None):
+        calls.append(rows)
+        return search(query, rows=rows, limit=limit)
+
+    monkeypatch.setattr(search_index, 'search', recording_search)
+
+    result = filter_attractions(df, search_query='pantai', facet_index=FacetIndex(df), search_index=search_index)
+    assert result['nama'].tolist() == ['Pantai Kuta']
+    assert calls == [None]
+
+    result = filter_attractions(df, province='jawa timur', search_query='museum',
+                                facet_index=FacetIndex(df), search_index=search_index)
+    assert result['nama'].tolist() == ['Museum Angkut']
+    assert calls[1].tolist() == [1]